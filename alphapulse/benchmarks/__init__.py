@@ -0,0 +1,7 @@
+"""
+AlphaPulse Benchmarks
+
+Standalone performance benchmarks. Run from the repository root, e.g.:
+
+    python -m alphapulse.benchmarks.event_loop_lag
+"""
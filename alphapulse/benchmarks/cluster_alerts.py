@@ -0,0 +1,96 @@
+"""
+Cluster alert benchmark
+
+Replays a burst of buys concentrated on a few hot tokens through
+HeliusWebhookHandler, with and without cluster hysteresis, and reports
+database writes and outbound alert messages per 1,000 buys.
+
+    python -m alphapulse.benchmarks.cluster_alerts [--buys 2000] [--tokens 5] [--wallets 40]
+"""
+
+import argparse
+import os
+import random
+from collections import Counter
+
+from sqlalchemy import event
+
+from alphapulse.benchmarks.fixtures import (
+    random_address,
+    seed_wallets,
+    swap_payloads,
+    temp_database,
+)
+from alphapulse.db.identity_cache import get_identity_cache
+from alphapulse.db.models import get_session
+from alphapulse.processors.cluster_state import ClusterStateMachine
+from alphapulse.processors.helius_handler import HeliusWebhookHandler
+from alphapulse.processors.signal_windows import SignalWindows
+
+TXS_PER_PAYLOAD = 20
+
+
+def _run(hysteresis: bool, buys: int, token_count: int, wallet_count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    engine, path = temp_database()
+    get_identity_cache().clear()
+    try:
+        wallets = seed_wallets(engine, wallet_count, rng)
+        mints = [random_address(rng) for _ in range(token_count)]
+        payloads = swap_payloads(rng, wallets, mints, buys // TXS_PER_PAYLOAD, TXS_PER_PAYLOAD)
+
+        writes = Counter()
+
+        def count_writes(conn, cursor, statement, parameters, context, executemany):
+            words = statement.split()
+            if words[0] == 'INSERT':
+                writes[words[2]] += 1
+            elif words[0] == 'UPDATE':
+                writes[words[1]] += 1
+
+        session = get_session(engine)
+        handler = HeliusWebhookHandler(session)
+        # Fresh in-memory state so runs don't see each other's buys
+        handler.signal_processor.windows = SignalWindows()
+        handler.signal_processor.cluster_states = ClusterStateMachine() if hysteresis else None
+
+        event.listen(engine, 'before_cursor_execute', count_writes)
+        messages = 0
+        for payload in payloads:
+            messages += len(handler.handle_webhook(payload))
+        event.remove(engine, 'before_cursor_execute', count_writes)
+
+        session.close()
+        replayed = len(payloads) * TXS_PER_PAYLOAD
+        scale = 1000 / replayed
+        return {
+            'writes': sum(writes.values()) * scale,
+            'cluster_writes': writes['cluster_events'] * scale,
+            'alert_writes': writes['alerts'] * scale,
+            'messages': messages * scale,
+        }
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--buys', type=int, default=2000)
+    parser.add_argument('--tokens', type=int, default=5, help='hot tokens the buys are spread over')
+    parser.add_argument('--wallets', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{args.buys} buys over {args.tokens} tokens by {args.wallets} wallets (per 1,000 buys)")
+    print(f"{'mode':<12} {'writes':>8} {'clusters':>9} {'alerts':>8} {'messages':>9}")
+    for label, hysteresis in (('every-buy', False), ('hysteresis', True)):
+        r = _run(hysteresis, args.buys, args.tokens, args.wallets, args.seed)
+        print(
+            f"{label:<12} {r['writes']:>8.0f} {r['cluster_writes']:>9.0f} "
+            f"{r['alert_writes']:>8.0f} {r['messages']:>9.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
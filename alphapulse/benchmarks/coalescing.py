@@ -0,0 +1,87 @@
+"""
+Request coalescing benchmark
+
+Fires a synthetic burst of concurrent lookups - metadata, holder
+distribution and rug checks for a handful of hot mints, as when one
+token triggers several signals at once - against a fake provider client
+with fixed latency, and compares upstream request counts with
+single-flight coalescing off and on.
+
+    python -m alphapulse.benchmarks.coalescing [--callers 200] [--mints 5] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import alphapulse.services.goplus as goplus_module
+import alphapulse.services.token_metadata as token_metadata_module
+from alphapulse.benchmarks.fixtures import FakeProvider, random_address
+from alphapulse.services.goplus import GoPlusSecurity
+from alphapulse.services.rug_detector import RugDetector
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.token_metadata import TokenMetadataService
+from alphapulse.utils.single_flight import get_single_flight
+
+
+async def _burst(callers: int, mints: list[str], latency: float, coalescing: bool) -> tuple:
+    provider = FakeProvider(latency)
+    token_metadata_module.get_http_client = lambda name: provider
+    goplus_module.get_http_client = lambda name: provider
+
+    single_flight = get_single_flight()
+    single_flight.enabled = coalescing
+    single_flight.reset_stats()
+
+    # No caches, so every lookup reaches the (coalesced) fetchers
+    service = TokenMetadataService(helius_api_key='bench', use_cache=False)
+    detector = RugDetector(token_service=service, use_cache=False, security=GoPlusSecurity())
+    rng = random.Random(7)
+
+    def lookup(mint: str):
+        kind = rng.choice(('metadata', 'holders', 'rug_check'))
+        if kind == 'metadata':
+            return service.get_token_metadata(mint)
+        if kind == 'holders':
+            return service.get_holder_distribution(mint)
+        return detector.check_token(mint)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(rng.choice(mints)) for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    return provider.requests, single_flight.stats(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--callers', type=int, default=200)
+    parser.add_argument('--mints', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    mints = [random_address(rng) for _ in range(args.mints)]
+    ticker = get_sol_price_ticker()
+    ticker.updated_at = time.monotonic() + 3600  # keep the SOL price out of the count
+
+    print(f"{args.callers} concurrent lookups over {args.mints} mints, "
+          f"{args.latency_ms:.0f} ms provider latency")
+    results = {}
+    for label, coalescing in (('off', False), ('on', True)):
+        results[label] = asyncio.run(_burst(args.callers, mints, args.latency_ms / 1000, coalescing))
+
+    methods = sorted(set(results['off'][0]) | set(results['on'][0]))
+    print(f"{'method':<32} {'off':>6} {'on':>6}")
+    for method in methods:
+        print(f"{method:<32} {results['off'][0][method]:>6} {results['on'][0][method]:>6}")
+    for label, (requests, stats, elapsed) in results.items():
+        print(
+            f"coalescing {label:<3}: {sum(requests.values()):>5} upstream requests, "
+            f"{stats['calls']} calls, dedup ratio {stats['dedup_ratio']:.1%}, "
+            f"{elapsed * 1000:.0f} ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Conviction score benchmark
+
+Seeds a temporary database with active wallets and their trades, then
+times ConvictionCalculator.update_all_scores three ways:
+
+1. loop  - the original per-wallet loop, which loaded each wallet's
+   trades (twice), lazy-loaded their tokens and ran a rug count per
+   wallet; timed on a sample of wallets and extrapolated
+2. sql   - two grouped aggregate queries over all trades
+3. stats - reading the WalletStats rows kept current on each trade
+   (built once here by WalletStatsTracker.backfill)
+
+and a single calculate_score with a trades query versus a WalletStats
+read. Scores are compared across paths: the stats and sql aggregates
+are taken at the same instant, their 7d / 30d trade counts must match
+exactly and scores must agree within WalletStatsTracker.SCORE_TOLERANCE
+(the benchmark exits non-zero otherwise).
+
+The loop here counts rugged tokens the wallet bought, as the other
+paths do; the old code counted every trade (by any wallet) in those
+tokens.
+
+    python -m alphapulse.benchmarks.conviction_scores [--wallets 50000] [--sample 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from alphapulse.benchmarks.fixtures import random_address, temp_database
+from alphapulse.config import settings
+from alphapulse.db.models import SmartWallet, Token, Trade, get_session
+from alphapulse.services.conviction_calculator import ConvictionCalculator, TradeAggregates
+from alphapulse.services.wallet_stats import WalletStatsTracker
+
+
+def _seed(engine, rng: random.Random, wallets: int, trades_per_wallet: int):
+    session = get_session(engine)
+    try:
+        now = datetime.utcnow()
+        tokens = [
+            Token(
+                contract_address=random_address(rng), platform='pump_fun',
+                launched_at=now - timedelta(days=rng.uniform(0, 40)),
+                is_rugged=rng.random() < 0.2
+            )
+            for _ in range(2000)
+        ]
+        session.add_all(tokens)
+        session.flush()
+        launches = [(t.id, t.launched_at) for t in tokens]
+
+        session.bulk_insert_mappings(SmartWallet, [
+            {
+                'address': random_address(rng), 'source': 'bench', 'is_active': True,
+                'win_rate': rng.uniform(30, 90), 'total_trades': trades_per_wallet,
+                'pnl_total_sol': rng.uniform(-50, 200), 'pnl_7d_sol': rng.uniform(-10, 40),
+            }
+            for _ in range(wallets)
+        ])
+        wallet_ids = [row[0] for row in session.query(SmartWallet.id)]
+
+        rows, signature = [], 0
+        for wallet_id in wallet_ids:
+            for _ in range(trades_per_wallet // 2):
+                token_id, launched = rng.choice(launches)
+                bought = launched + timedelta(minutes=rng.expovariate(1 / 60))
+                for trade_type, at in (('BUY', bought), ('SELL', bought + timedelta(hours=rng.uniform(0, 6)))):
+                    signature += 1
+                    rows.append({
+                        'wallet_id': wallet_id, 'token_id': token_id, 'tx_signature': str(signature),
+                        'trade_type': trade_type, 'sol_amount': rng.uniform(0.1, 5),
+                        'token_amount': 1e6, 'mcap_at_trade': rng.uniform(5e3, 5e5),
+                        'block_time': at,
+                    })
+            if len(rows) >= 50000:
+                session.bulk_insert_mappings(Trade, rows)
+                rows = []
+        session.bulk_insert_mappings(Trade, rows)
+        session.commit()
+        return wallet_ids
+    finally:
+        session.close()
+
+
+def _legacy_aggregates(calculator: ConvictionCalculator, wallet: SmartWallet) -> TradeAggregates:
+    """What the per-wallet loop computed for one wallet, from ORM objects"""
+    session = calculator.session
+    now = datetime.utcnow()
+    trades = session.query(Trade).filter(Trade.wallet_id == wallet.id).all()
+    buys = [t for t in trades if t.trade_type == 'BUY']
+    early = sum(
+        1 for t in buys
+        if t.token and t.token.launched_at
+        and (t.block_time - t.token.launched_at).total_seconds() / 60 <= calculator.EARLY_ENTRY_MINS
+    )
+    bought = set(t.token_id for t in buys)
+    rugged = session.query(Token).filter(Token.id.in_(bought), Token.is_rugged == True).count()
+    mcaps = [t.mcap_at_trade for t in buys if t.mcap_at_trade]
+
+    pnls = {}
+    for t in session.query(Trade).filter(Trade.wallet_id == wallet.id).all():
+        pnls[t.token_id] = pnls.get(t.token_id, 0.0) + (-t.sol_amount if t.trade_type == 'BUY' else t.sol_amount)
+    return TradeAggregates(
+        trades_7d=sum(1 for t in trades if t.block_time >= now - timedelta(days=7)),
+        trades_30d=sum(1 for t in trades if t.block_time >= now - timedelta(days=30)),
+        buys=len(buys), early_buys=early,
+        avg_entry_mcap=sum(mcaps) / len(mcaps) if mcaps else 0.0,
+        tokens_bought=len(bought), rugged_tokens=rugged,
+        pnl_tokens=len(pnls), pnl_sum=sum(pnls.values()),
+        pnl_sum_sq=sum(p * p for p in pnls.values())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wallets', type=int, default=50000)
+    parser.add_argument('--trades', type=int, default=20, help="Trades per wallet")
+    parser.add_argument('--sample', type=int, default=1000, help="Wallets run through the old loop")
+    args = parser.parse_args()
+
+    engine, path = temp_database()
+    try:
+        rng = random.Random(42)
+        wallet_ids = _seed(engine, rng, args.wallets, args.trades)
+        queries = []
+        event.listen(engine, 'before_cursor_execute', lambda *a: queries.append(1))
+
+        # Per-wallet loop on a sample
+        session = get_session(engine)
+        try:
+            calculator = ConvictionCalculator(session)
+            sample = rng.sample(wallet_ids, min(args.sample, len(wallet_ids)))
+            start = time.perf_counter()
+            legacy = {}
+            for wallet_id in sample:
+                wallet = session.get(SmartWallet, wallet_id)
+                legacy[wallet_id] = calculator.calculate_score(wallet, _legacy_aggregates(calculator, wallet))
+            loop_s = time.perf_counter() - start
+            loop_queries = len(queries)
+        finally:
+            session.close()
+
+        # Grouped SQL, then wallet stats, over every wallet
+        results = {}
+        for label, enabled in (('sql', False), ('stats', True)):
+            settings.wallet_stats_enabled = enabled
+            session = get_session(engine)
+            try:
+                if enabled:
+                    start = time.perf_counter()
+                    WalletStatsTracker(session).backfill()
+                    backfill_s = time.perf_counter() - start
+                queries.clear()
+                start = time.perf_counter()
+                updated = ConvictionCalculator(session).update_all_scores()
+                elapsed, count = time.perf_counter() - start, len(queries)
+                scores = dict(session.query(SmartWallet.id, SmartWallet.conviction_score))
+
+                # One wallet at a time (what a live rescore needs)
+                calculator = ConvictionCalculator(session)
+                wallets = [session.get(SmartWallet, w) for w in sample[:200]]
+                start = time.perf_counter()
+                for wallet in wallets:
+                    calculator.calculate_score(wallet)
+                single_ms = (time.perf_counter() - start) * 1000 / len(wallets)
+                results[label] = (elapsed, count, updated, scores, single_ms)
+            finally:
+                session.close()
+
+        # Stats against sql at one instant (wallet stats still enabled)
+        session = get_session(engine)
+        try:
+            now = datetime.utcnow()
+            calculator = ConvictionCalculator(session)
+            sql_aggregates = calculator.aggregate_trades(now=now)
+            stats_aggregates = WalletStatsTracker(session).load_aggregates(now=now)
+            empty = TradeAggregates()
+            window_mismatches = sum(
+                1 for w, agg in sql_aggregates.items()
+                if (agg.trades_7d, agg.trades_30d) != (stats_aggregates[w].trades_7d, stats_aggregates[w].trades_30d)
+            )
+            drift = [
+                abs(calculator.calculate_score(w, stats_aggregates.get(w.id, empty))
+                    - calculator.calculate_score(w, sql_aggregates.get(w.id, empty)))
+                for w in session.query(
+                    SmartWallet.id, SmartWallet.address, SmartWallet.win_rate,
+                    SmartWallet.total_trades, SmartWallet.pnl_total_sol,
+                    SmartWallet.pnl_7d_sol, SmartWallet.avg_hold_time_mins
+                )
+            ]
+        finally:
+            session.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+    per_wallet = loop_s / len(sample)
+    sql_scores = results['sql'][3]
+    mismatched = sum(1 for w, score in legacy.items() if abs(score - sql_scores[w]) > 1e-6)
+    tolerance = WalletStatsTracker.SCORE_TOLERANCE
+    passed = window_mismatches == 0 and max(drift) <= tolerance
+    print(f"{args.wallets} wallets x {args.trades} trades")
+    print(f"{'path':<8} {'all s':>8} {'queries':>9} {'one wallet ms':>14}")
+    print(f"{'loop':<8} {per_wallet * args.wallets:>8.1f} {loop_queries / len(sample) * args.wallets:>9,.0f} "
+          f"{per_wallet * 1000:>14.2f}  (extrapolated from {len(sample)} wallets)")
+    for label, (elapsed, count, updated, _, single_ms) in results.items():
+        print(f"{label:<8} {elapsed:>8.1f} {count:>9,} {single_ms:>14.2f}  ({updated} wallets updated)")
+    print(f"stats backfill (once, at startup): {backfill_s:.1f} s")
+    print(f"loop vs sql scores differing on the sample: {mismatched}/{len(sample)}")
+    print(f"stats vs sql: {window_mismatches} wallets with different 7d / 30d counts, "
+          f"score drift max {max(drift):.2g} pts (tolerance {tolerance}): {'ok' if passed else 'FAILED'}")
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
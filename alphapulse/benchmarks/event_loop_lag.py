@@ -0,0 +1,99 @@
+"""
+Event-loop lag benchmark for webhook processing
+
+Processes the same synthetic webhook burst in 'inline' and 'thread'
+execution modes while a probe coroutine measures how late the event loop
+wakes it up. Inline mode blocks the loop for every SQLAlchemy call;
+thread mode should keep lag close to zero. Trades persisted are counted
+too, so swaps dropped by concurrent payloads (e.g. "database is locked")
+show up.
+
+    python -m alphapulse.benchmarks.event_loop_lag [--payloads 50] [--txs 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from alphapulse.benchmarks.fixtures import (
+    random_address,
+    seed_wallets,
+    swap_payloads,
+    temp_database,
+)
+from alphapulse.db.models import Trade, get_session
+from alphapulse.processors.webhook_executor import WebhookExecutor
+
+PROBE_INTERVAL = 0.005  # 5 ms
+
+
+async def _probe(samples: list[float], stop: asyncio.Event):
+    """Record how late each PROBE_INTERVAL sleep wakes up (ms)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def _run_mode(mode: str, payload_count: int, txs: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    engine, path = temp_database()
+    try:
+        wallets = seed_wallets(engine, 50, rng)
+        mints = [random_address(rng) for _ in range(20)]
+        payloads = swap_payloads(rng, wallets, mints, payload_count, txs)
+
+        executor = WebhookExecutor(engine, mode=mode, max_workers=2)
+        samples: list[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(samples, stop))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(executor.handle(p) for p in payloads))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await probe
+        executor.shutdown()
+
+        session = get_session(engine)
+        trades = session.query(Trade).count()
+        session.close()
+
+        samples.sort()
+        return {
+            'mode': mode,
+            'elapsed_s': elapsed,
+            'trades': trades,
+            'probes': len(samples),
+            'lag_p50_ms': statistics.median(samples) if samples else 0.0,
+            'lag_p99_ms': samples[int(len(samples) * 0.99) - 1] if samples else 0.0,
+            'lag_max_ms': samples[-1] if samples else 0.0,
+        }
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=50)
+    parser.add_argument('--txs', type=int, default=20, help='transactions per payload')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{args.payloads} payloads x {args.txs} swaps")
+    print(f"{'mode':<8} {'elapsed':>9} {'trades':>7} {'probes':>7} {'p50 lag':>9} {'p99 lag':>9} {'max lag':>9}")
+    for mode in ('inline', 'thread'):
+        r = asyncio.run(_run_mode(mode, args.payloads, args.txs, args.seed))
+        print(
+            f"{r['mode']:<8} {r['elapsed_s']:>8.2f}s {r['trades']:>7} {r['probes']:>7} "
+            f"{r['lag_p50_ms']:>7.1f}ms {r['lag_p99_ms']:>7.1f}ms {r['lag_max_ms']:>7.1f}ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
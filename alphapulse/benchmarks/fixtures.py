@@ -0,0 +1,154 @@
+"""
+AlphaPulse Benchmark Fixtures
+Temporary databases, synthetic Helius payloads and a fake provider
+client shared by the benchmarks
+"""
+
+import asyncio
+import os
+import random
+import string
+import tempfile
+import time
+from collections import Counter
+
+from alphapulse.db.models import SmartWallet, get_session, init_db
+
+PUMP_FUN_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+
+_ALPHABET = string.ascii_letters + string.digits
+
+
+def random_address(rng: random.Random, length: int = 44) -> str:
+    """Random base58-looking address"""
+    return ''.join(rng.choice(_ALPHABET) for _ in range(length))
+
+
+def temp_database() -> tuple:
+    """
+    Create a fresh file-backed SQLite database
+
+    Returns:
+        (engine, path) - caller removes path when done
+    """
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="alphapulse-bench-")
+    os.close(fd)
+    engine = init_db(f"sqlite:///{path}")
+    return engine, path
+
+
+def seed_wallets(engine, count: int, rng: random.Random) -> list[str]:
+    """Insert active smart wallets and return their addresses"""
+    session = get_session(engine)
+    try:
+        addresses = [random_address(rng) for _ in range(count)]
+        session.add_all([
+            SmartWallet(
+                address=a, source='bench', win_rate=70.0,
+                trades_7d=20, conviction_score=60.0, is_active=True
+            )
+            for a in addresses
+        ])
+        session.commit()
+        return addresses
+    finally:
+        session.close()
+
+
+def swap_tx(rng: random.Random, wallet: str, mint: str, sol: float = None,
+            timestamp: int = None) -> dict:
+    """Build one Helius enhanced SWAP transaction (a buy)"""
+    sol = sol if sol is not None else rng.uniform(0.5, 3.0)
+    return {
+        'type': 'SWAP',
+        'signature': random_address(rng, 88),
+        'timestamp': timestamp or int(time.time()),
+        'feePayer': wallet,
+        'nativeTransfers': [
+            {'fromUserAccount': wallet, 'toUserAccount': mint, 'amount': int(sol * 1e9)}
+        ],
+        'tokenTransfers': [
+            {'fromUserAccount': mint, 'toUserAccount': wallet, 'mint': mint,
+             'tokenAmount': rng.uniform(1e5, 1e7)}
+        ],
+        'instructions': [{'programId': PUMP_FUN_PROGRAM}],
+    }
+
+
+def swap_payloads(rng: random.Random, wallets: list[str], mints: list[str],
+                  payload_count: int, txs_per_payload: int) -> list[list[dict]]:
+    """Build webhook payloads made of random buys over the given wallets/mints"""
+    return [
+        [swap_tx(rng, rng.choice(wallets), rng.choice(mints)) for _ in range(txs_per_payload)]
+        for _ in range(payload_count)
+    ]
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class FakeProvider:
+    """
+    Stands in for every provider HTTP client; counts requests by method
+
+    Mints in `risky` come back mutable with a freeze authority, so rug
+    checks fail them on metadata alone.
+    """
+
+    def __init__(self, latency: float, risky: set = None):
+        self.latency = latency
+        self.risky = risky or set()
+        self.requests = Counter()
+
+    async def get(self, url, params=None, **kwargs):
+        params = params or {}
+        if 'gopluslabs' in url:
+            self.requests['goplus.token_security'] += 1
+            mints = params['contract_addresses'].split(',')
+            payload = {'result': {m: {'lp_holders': [], 'is_honeypot': 0} for m in mints}}
+        else:
+            self.requests['jupiter.price'] += 1
+            mints = params['ids'].split(',')
+            payload = {'data': {m: {'price': 0.001} for m in mints}}
+        await asyncio.sleep(self.latency)
+        return _Response(payload)
+
+    async def post(self, url, json=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        if isinstance(json, list):
+            # JSON-RPC batch: one response per request, matched by id
+            self.requests[f"helius.{json[0]['method']}[batch]"] += 1
+            return _Response([
+                {'id': call['id'], 'result': self._result(call['method'], call['params'][0])}
+                for call in json
+            ])
+
+        method = json['method']
+        self.requests[f"helius.{method}"] += 1
+        if method == 'getAssetBatch':
+            return _Response({'result': [self._asset(m) for m in json['params']['ids']]})
+        mint = json['params']['id'] if method == 'getAsset' else json['params'][0]
+        return _Response({'result': self._result(method, mint)})
+
+    def _result(self, method: str, mint: str) -> dict:
+        if method == 'getAsset':
+            return self._asset(mint)
+        if method == 'getTokenSupply':
+            return {'value': {'amount': '1000000000000000', 'decimals': 6}}
+        return {'value': [{'amount': '1000'} for _ in range(20)]}
+
+    def _asset(self, mint: str) -> dict:
+        risky = mint in self.risky
+        return {
+            'id': mint,
+            'mutable': risky,
+            'content': {'metadata': {'name': 'Bench', 'symbol': 'BNCH'}},
+            'token_info': {'decimals': 6, 'freeze_authority': 'x' if risky else None},
+        }
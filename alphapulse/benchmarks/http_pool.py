@@ -0,0 +1,135 @@
+"""
+HTTP client pooling benchmark
+
+Serves a small JSON endpoint from a local stub server (HTTPS with a
+throwaway self-signed certificate when openssl is available, so the TLS
+handshake cost is included) and compares per-request latency of a fresh
+httpx.AsyncClient per call against a shared HttpClientRegistry client.
+
+    python -m alphapulse.benchmarks.http_pool [--requests 300] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import ssl
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from alphapulse.utils.http_clients import HttpClientRegistry
+
+_BODY = json.dumps({'data': {'So11111111111111111111111111111111111111112': {'price': 150.0}}}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _self_signed_context(workdir: str):
+    """TLS context with a fresh self-signed cert, or None if openssl is missing"""
+    if not shutil.which("openssl"):
+        return None
+    cert, key = os.path.join(workdir, "cert.pem"), os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def _start_stub(workdir: str) -> tuple:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    context = _self_signed_context(workdir)
+    scheme = "http"
+    if context is not None:
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/price"
+
+
+async def _timed(coro_factory, count: int, concurrency: int) -> list[float]:
+    """Run count requests with bounded concurrency; returns latencies in ms"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await coro_factory()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def _run(url: str, count: int, concurrency: int) -> dict:
+    async def fresh_client():
+        async with httpx.AsyncClient(verify=False) as client:
+            (await client.get(url)).raise_for_status()
+
+    registry = HttpClientRegistry(verify=False)
+
+    async def shared_client():
+        (await registry.get('jupiter').get(url)).raise_for_status()
+
+    results = {}
+    for label, factory in (('fresh', fresh_client), ('shared', shared_client)):
+        await _timed(factory, concurrency, concurrency)  # warm-up
+        results[label] = await _timed(factory, count, concurrency)
+    await registry.aclose()
+    return results
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server, url = _start_stub(workdir)
+        try:
+            results = asyncio.run(_run(url, args.requests, args.concurrency))
+        finally:
+            server.shutdown()
+
+    print(f"{args.requests} GETs to {url.split('://')[0]} stub, concurrency {args.concurrency}")
+    print(f"{'client':<8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for label, latencies in results.items():
+        print(
+            f"{label:<8} {_pct(latencies, 0.5):>8.2f} {_pct(latencies, 0.99):>8.2f} "
+            f"{statistics.mean(latencies):>8.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
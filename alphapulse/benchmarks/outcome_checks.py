@@ -0,0 +1,132 @@
+"""
+Outcome check benchmark
+
+Seeds a temporary database with a backlog of due alerts (several per
+token, each with a triggering trade) and drains it against a fake
+provider with fixed latency: first the previous way - 50 alerts per
+pass, one at a time, one metadata lookup and commit per alert - then
+with check_pending_alerts (grouped by token, concurrent, one commit per
+pass, adaptive batch size).
+
+    python -m alphapulse.benchmarks.outcome_checks [--alerts 1000] [--tokens 100] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import alphapulse.services.token_metadata as token_metadata_module
+from alphapulse.benchmarks.fixtures import FakeProvider, random_address, temp_database
+from alphapulse.db.models import Alert, SmartWallet, Token, Trade, get_session
+from alphapulse.services.metadata_cache import MetadataCache
+from alphapulse.services.outcome_tracker import OutcomeBatchLimit, OutcomeTracker
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.token_metadata import TokenMetadataService
+
+LEGACY_BATCH = 50
+
+
+def _seed(engine, rng: random.Random, alert_count: int, token_count: int):
+    session = get_session(engine)
+    try:
+        wallet = SmartWallet(address=random_address(rng), source='bench')
+        tokens = [
+            Token(contract_address=random_address(rng), platform='pump_fun')
+            for _ in range(token_count)
+        ]
+        session.add(wallet)
+        session.add_all(tokens)
+        session.flush()
+
+        now = datetime.utcnow()
+        for _ in range(alert_count):
+            token = rng.choice(tokens)
+            created = now - timedelta(hours=rng.uniform(1, 48))
+            session.add(Alert(token_id=token.id, alert_type='cluster_buy', created_at=created))
+            session.add(Trade(
+                wallet_id=wallet.id, token_id=token.id, tx_signature=random_address(rng, 88),
+                trade_type='BUY', sol_amount=1.0, token_amount=1e6,
+                mcap_at_trade=rng.uniform(2e5, 2e6), block_time=created
+            ))
+        session.commit()
+    finally:
+        session.close()
+
+
+async def _legacy_pass(tracker: OutcomeTracker) -> int:
+    """One pre-grouping pass: LEGACY_BATCH alerts, each looked up and committed alone"""
+    alerts = tracker.session.query(Alert).filter(*tracker._due_filter()).limit(LEGACY_BATCH).all()
+    for alert in alerts:
+        await tracker.check_alert_outcome(alert)
+    return len(alerts)
+
+
+async def _drain(engine, latency: float, legacy: bool) -> tuple:
+    """Run passes until nothing is due; returns (passes, seconds, upstream requests, sizes)"""
+    provider = FakeProvider(latency)
+    token_metadata_module.get_http_client = lambda name: provider
+    service = TokenMetadataService(helius_api_key='bench', cache=MetadataCache())
+    limit = OutcomeBatchLimit(target_seconds=3600)
+    passes, sizes = 0, []
+
+    start = time.perf_counter()
+    while True:
+        session = get_session(engine)
+        try:
+            tracker = OutcomeTracker(session, token_service=service, batch_limit=limit)
+            if legacy:
+                checked = await _legacy_pass(tracker)
+            else:
+                checked = len(await tracker.check_pending_alerts())
+        finally:
+            session.close()
+        if not checked:
+            break
+        passes += 1
+        sizes.append(checked)
+    return passes, time.perf_counter() - start, sum(provider.requests.values()), sizes
+
+
+def _reset(engine):
+    session = get_session(engine)
+    try:
+        session.query(Alert).update({Alert.outcome_checked_at: None, Alert.outcome_pnl: None})
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--alerts', type=int, default=1000)
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ticker = get_sol_price_ticker()
+    ticker.updated_at = time.monotonic() + 3600  # keep the SOL price out of the count
+    engine, path = temp_database()
+    try:
+        _seed(engine, rng, args.alerts, args.tokens)
+        results = {}
+        for label, legacy in (('legacy', True), ('grouped', False)):
+            _reset(engine)
+            results[label] = asyncio.run(_drain(engine, args.latency_ms / 1000, legacy))
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+    print(f"{args.alerts} due alerts over {args.tokens} tokens, "
+          f"{args.latency_ms:.0f} ms provider latency")
+    print(f"{'mode':<8} {'passes':>7} {'drain ms':>9} {'requests':>9}  batch sizes")
+    for label, (passes, elapsed, requests, sizes) in results.items():
+        shown = ", ".join(map(str, sizes[:8])) + (", ..." if len(sizes) > 8 else "")
+        print(f"{label:<8} {passes:>7} {elapsed * 1000:>9.0f} {requests:>9}  {shown}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Performance stats benchmark
+
+Seeds a temporary database with alerts spread over 90 days (most with an
+outcome) and times OutcomeTracker.get_performance_stats - one grouped
+query over the covering (created_at, alert_type, outcome_pnl) index -
+against the previous implementation, which loaded every alert with an
+outcome into Python and filtered the list repeatedly. Checks both give
+the same numbers and prints the query plan.
+
+    python -m alphapulse.benchmarks.performance_stats [--alerts 500000] [--days 7 30]
+"""
+
+import argparse
+import os
+import random
+import time
+from dataclasses import astuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from alphapulse.benchmarks.fixtures import random_address, temp_database
+from alphapulse.db.models import Alert, Token, get_session
+from alphapulse.services.outcome_tracker import OutcomeTracker, PerformanceStats
+
+TYPES = ['high_conviction', 'cluster_buy', 'volume_spike']
+
+
+def _seed(engine, rng: random.Random, count: int):
+    session = get_session(engine)
+    try:
+        tokens = [Token(contract_address=random_address(rng), platform='pump_fun') for _ in range(100)]
+        session.add_all(tokens)
+        session.flush()
+        now = datetime.utcnow()
+        for start in range(0, count, 50000):
+            session.bulk_insert_mappings(Alert, [
+                {
+                    'token_id': rng.choice(tokens).id,
+                    'alert_type': rng.choice(TYPES),
+                    'created_at': now - timedelta(days=rng.uniform(0, 90)),
+                    'outcome_pnl': rng.uniform(-95, 300) if rng.random() < 0.9 else None,
+                }
+                for _ in range(min(50000, count - start))
+            ])
+        session.commit()
+    finally:
+        session.close()
+
+
+def _legacy_stats(tracker: OutcomeTracker, days: int) -> PerformanceStats:
+    """get_performance_stats before it moved into SQL"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    alerts = tracker.session.query(Alert).filter(
+        Alert.created_at >= cutoff, Alert.outcome_pnl.isnot(None)
+    ).all()
+    winners = [a for a in alerts if a.outcome_pnl >= tracker.WIN_THRESHOLD_PCT]
+    losers = [a for a in alerts if a.outcome_pnl <= tracker.LOSS_THRESHOLD_PCT]
+    rugged = [a for a in alerts if a.outcome_pnl <= tracker.RUG_THRESHOLD_PCT]
+    resolved = len(winners) + len(losers)
+    all_returns = [a.outcome_pnl for a in alerts]
+
+    def win_rate_for_type(alert_type: str) -> float:
+        type_alerts = [a for a in alerts if a.alert_type == alert_type]
+        type_winners = [a for a in type_alerts if a.outcome_pnl >= tracker.WIN_THRESHOLD_PCT]
+        type_resolved = len([a for a in type_alerts if a.outcome_pnl <= tracker.LOSS_THRESHOLD_PCT]) + len(type_winners)
+        return (len(type_winners) / type_resolved * 100) if type_resolved > 0 else 0
+
+    pending = tracker.session.query(Alert).filter(
+        Alert.created_at >= cutoff, Alert.outcome_pnl.is_(None)
+    ).count()
+    return PerformanceStats(
+        total_alerts=len(alerts) + pending, winners=len(winners), losers=len(losers),
+        rugged=len(rugged), pending=pending,
+        win_rate=(len(winners) / resolved * 100) if resolved else 0,
+        avg_return_pct=sum(a.outcome_pnl for a in winners) / len(winners) if winners else 0,
+        avg_loss_pct=sum(a.outcome_pnl for a in losers) / len(losers) if losers else 0,
+        best_return_pct=max(all_returns), worst_loss_pct=min(all_returns),
+        high_conviction_win_rate=win_rate_for_type('high_conviction'),
+        cluster_buy_win_rate=win_rate_for_type('cluster_buy'),
+        volume_spike_win_rate=win_rate_for_type('volume_spike')
+    )
+
+
+def _same(a: PerformanceStats, b: PerformanceStats) -> bool:
+    return all(abs(x - y) < 1e-6 for x, y in zip(astuple(a), astuple(b)))
+
+
+def _timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--alerts', type=int, default=500000)
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30])
+    args = parser.parse_args()
+
+    engine, path = temp_database()
+    try:
+        _seed(engine, random.Random(42), args.alerts)
+        session = get_session(engine)
+        try:
+            tracker = OutcomeTracker(session, token_service=object())
+            print(f"{args.alerts} alerts over 90 days")
+            print(f"{'days':>5} {'legacy ms':>10} {'sql ms':>8} {'speedup':>8}  same")
+            for days in args.days:
+                legacy, legacy_ms = _timed(lambda: _legacy_stats(tracker, days))
+                session.expunge_all()
+                current, sql_ms = _timed(lambda: tracker.get_performance_stats(days))
+                print(f"{days:>5} {legacy_ms:>10.0f} {sql_ms:>8.0f} {legacy_ms / sql_ms:>7.0f}x  "
+                      f"{_same(legacy, current)}")
+
+            # Plan of the statement get_performance_stats actually runs
+            statements = []
+
+            def capture(conn, cursor, sql, params, *_):
+                statements.append((sql, params))
+
+            event.listen(engine, 'before_cursor_execute', capture)
+            tracker.get_performance_stats(args.days[0])
+            event.remove(engine, 'before_cursor_execute', capture)
+            sql, params = statements[-1]
+            with engine.connect() as conn:
+                plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            print("plan: " + "; ".join(row[-1] for row in plan))
+        finally:
+            session.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Warm restart benchmark
+
+Enriches a burst of alerted tokens (metadata + rug check, as the
+webhook path does) against a fake provider with fixed latency, persists
+the metadata and rug-check caches, then simulates a restart: fresh
+in-memory caches either empty (cold) or restored from the file (warm),
+and the same burst again. Finally compacts the file after padding it
+with expired entries.
+
+    python -m alphapulse.benchmarks.warm_restart [--tokens 200] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import alphapulse.services.goplus as goplus_module
+import alphapulse.services.token_metadata as token_metadata_module
+from alphapulse.benchmarks.fixtures import FakeProvider, random_address
+from alphapulse.processors.signal_enricher import SignalEnricher
+from alphapulse.services.goplus import GoPlusSecurity
+from alphapulse.services.metadata_cache import MetadataCache
+from alphapulse.services.persistent_cache import CachePersister, PersistentCache
+from alphapulse.services.rug_detector import RugDetector, RugResultCache
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.token_metadata import TokenMetadataService
+
+
+def _caches() -> tuple:
+    return MetadataCache(), RugResultCache()
+
+
+async def _burst(mints: list[str], latency: float, metadata_cache, rug_cache) -> tuple:
+    """Enrich every mint once; returns (elapsed seconds, upstream requests, rug-checked)"""
+    provider = FakeProvider(latency)
+    token_metadata_module.get_http_client = lambda name: provider
+    goplus_module.get_http_client = lambda name: provider
+
+    service = TokenMetadataService(helius_api_key='bench', cache=metadata_cache)
+    detector = RugDetector(token_service=service, result_cache=rug_cache, security=GoPlusSecurity())
+    # Generous deadlines: the benchmark measures work, not timeouts
+    enricher = SignalEnricher(service, detector, metadata_timeout=60, rug_check_timeout=60)
+
+    start = time.perf_counter()
+    enrichments = await enricher.enrich_many(mints)
+    elapsed = time.perf_counter() - start
+    checked = sum(1 for e in enrichments.values() if e.rug_checked)
+    return elapsed, sum(provider.requests.values()), checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    mints = [random_address(rng) for _ in range(args.tokens)]
+    latency = args.latency_ms / 1000
+    ticker = get_sol_price_ticker()
+    ticker.updated_at = time.monotonic() + 3600  # keep the SOL price out of the count
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "cache.db")
+
+        # First run fills the caches, which are then persisted
+        metadata_cache, rug_cache = _caches()
+        asyncio.run(_burst(mints, latency, metadata_cache, rug_cache))
+        persister = CachePersister(PersistentCache(path), [metadata_cache, rug_cache])
+        written = persister.flush()
+        persister.store.close()
+
+        # Restart without the file
+        cold = asyncio.run(_burst(mints, latency, *_caches()))
+
+        # Restart restoring from the file
+        metadata_cache, rug_cache = _caches()
+        persister = CachePersister(PersistentCache(path), [metadata_cache, rug_cache])
+        start = time.perf_counter()
+        restored = persister.warm()
+        load_ms = (time.perf_counter() - start) * 1000
+        warm = asyncio.run(_burst(mints, latency, metadata_cache, rug_cache))
+
+        # Compaction: pad with expired rows, then compact
+        past = time.time() - 3600
+        persister.store.put_many('rug_check', (
+            (random_address(rng), {}, past, past + 1) for _ in range(args.tokens * 20)
+        ))
+        size_before = persister.store.size_bytes()
+        compaction = persister.compact()
+        persister.store.close()
+
+    print(f"{args.tokens} alerted tokens, {args.latency_ms:.0f} ms provider latency")
+    print(f"persisted {written} rows; warm start restored {restored} in {load_ms:.1f} ms")
+    print(f"{'start':<6} {'burst ms':>9} {'requests':>9} {'rug-checked':>12}")
+    for label, (elapsed, requests, checked) in (('cold', cold), ('warm', warm)):
+        print(f"{label:<6} {elapsed * 1000:>9.0f} {requests:>9} {checked:>12}")
+    print(
+        f"compaction removed {compaction['expired']} expired rows: "
+        f"{size_before / 1024:.0f} KiB -> {compaction['size_bytes'] / 1024:.0f} KiB"
+    )
+
+
+if __name__ == '__main__':
+    main()
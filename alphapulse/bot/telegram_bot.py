@@ -10,7 +10,7 @@ Commands:
 - /alerts - Recent alerts
 - /report - Performance report (7d)
 - /portfolio <address> - View wallet holdings
-- /check <token_ca> - Rug check a token
+- /check <token_ca> [...] - Rug check one or more tokens
 - /add <address> - Add wallet to track (admin)
 - /remove <address> - Remove wallet (admin)
 """
@@ -31,6 +31,7 @@ from alphapulse.db.models import (
     init_db, get_session, SmartWallet, Token, Alert,
     WalletRepository
 )
+from alphapulse.db.identity_cache import get_identity_cache
 from alphapulse.utils.logger import get_logger, AlertFormatter
 
 logger = get_logger(__name__)
@@ -131,7 +132,7 @@ _Powered by Helius_
 /report - Performance report (7d win rate)
 /backtest [days] - Run strategy backtest
 /portfolio <addr> - View wallet holdings
-/check <token\\_ca> - Rug check a token
+/check <token\\_ca> [...] - Rug check one or more tokens
 /holdings - Tokens held by multiple wallets
 
 *Admin Only:*
@@ -271,6 +272,7 @@ _Powered by Helius_
             if wallet:
                 wallet.is_active = False
                 session.commit()
+                get_identity_cache().invalidate_wallet(address)
                 await update.message.reply_text(f"Wallet deactivated.")
             else:
                 await update.message.reply_text("Wallet not found.")
@@ -381,23 +383,27 @@ _Powered by Helius_
             session.close()
 
     async def cmd_check_token(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /check <token_ca> command - rug check a token"""
+        """Handle /check <token_ca> [<token_ca> ...] command - rug check tokens"""
         if not context.args:
-            await update.message.reply_text("Usage: /check <token_contract_address>")
+            await update.message.reply_text("Usage: /check <token_contract_address> [more addresses...]")
             return
 
-        token_ca = context.args[0]
-        if len(token_ca) < 32 or len(token_ca) > 44:
+        token_cas = list(dict.fromkeys(context.args))
+        if any(len(ca) < 32 or len(ca) > 44 for ca in token_cas):
             await update.message.reply_text("Invalid token address.")
             return
 
+        if len(token_cas) > 1:
+            await self._check_tokens_summary(update, token_cas)
+            return
+
+        token_ca = token_cas[0]
         await update.message.reply_text("Running rug check...")
 
         try:
-            from alphapulse.services.rug_detector import RugDetector
+            from alphapulse.services.rug_detector import get_rug_detector
 
-            detector = RugDetector()
-            result = await detector.check_token(token_ca)
+            result = await get_rug_detector().check_token(token_ca)
 
             # Risk level emoji
             risk_emoji = {
@@ -436,6 +442,34 @@ _Powered by Helius_
             logger.error(f"Rug check failed: {e}")
             await update.message.reply_text(f"Error running rug check: {e}")
 
+    async def _check_tokens_summary(self, update: Update, token_cas: list[str]):
+        """Rug check several tokens in one batch and reply with a one-line-per-token summary"""
+        token_cas = token_cas[:50]  # Keep the reply within Telegram's message size
+        await update.message.reply_text(f"Running rug checks on {len(token_cas)} tokens...")
+
+        try:
+            from alphapulse.services.rug_detector import get_rug_detector
+
+            results = [r async for r in get_rug_detector().check_tokens(token_cas)]
+            results.sort(key=lambda r: r.risk_score, reverse=True)
+
+            passed = sum(1 for r in results if r.passed)
+            lines = [f"*Rug Checks:* {passed}/{len(results)} passed\n"]
+            for r in results:
+                status = "PASS" if r.passed else "FAIL"
+                lines.append(
+                    f"`{r.contract_address[:8]}...` {status} "
+                    f"{r.risk_level.value.upper()} ({r.risk_score})"
+                )
+
+            await update.message.reply_text(
+                "\n".join(lines),
+                parse_mode=ParseMode.MARKDOWN
+            )
+        except Exception as e:
+            logger.error(f"Batch rug check failed: {e}")
+            await update.message.reply_text(f"Error running rug checks: {e}")
+
     async def cmd_common_holdings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /holdings command - show tokens held by multiple wallets"""
         await update.message.reply_text("Analyzing common holdings (this may take a minute)...")
@@ -524,9 +558,8 @@ _Powered by Helius_
 
         if action == "check_token":
             # Perform rug check on token
-            from alphapulse.services.rug_detector import RugDetector
-            detector = RugDetector()
-            result = await detector.check_token(value)
+            from alphapulse.services.rug_detector import get_rug_detector
+            result = await get_rug_detector().check_token(value)
 
             status = "" if result.passed else ""
             await query.message.reply_text(
@@ -54,6 +54,10 @@ class Settings(BaseSettings):
         default=10,
         description="Minimum trades in last 7 days"
     )
+    wallet_stats_enabled: bool = Field(
+        default=True,
+        description="Update per-wallet conviction metrics on each trade and rescore the wallet immediately"
+    )
 
     # Signal Trigger Thresholds
     high_conviction_min_sol: float = Field(
@@ -84,6 +88,208 @@ class Settings(BaseSettings):
         default=60,
         description="Max token age for 'new token' classification"
     )
+    signal_windows_enabled: bool = Field(
+        default=True,
+        description="Evaluate cluster/volume signals from in-memory windows instead of DB queries"
+    )
+    cluster_hysteresis_enabled: bool = Field(
+        default=True,
+        description="Alert once per cluster episode instead of on every buy inside the window"
+    )
+    cluster_cooldown_minutes: int = Field(
+        default=15,
+        description="Minutes without a cluster before a token re-arms for a new alert"
+    )
+    cluster_escalation_wallets: int = Field(
+        default=2,
+        description="Extra wallets joining a fired cluster that trigger a follow-up alert"
+    )
+
+    # Webhook Ingest & Processing
+    ingest_queue_max_size: int = Field(
+        default=1000,
+        description="Max webhook payloads buffered in memory"
+    )
+    ingest_worker_count: int = Field(
+        default=4,
+        description="Number of worker tasks draining the ingest queue"
+    )
+    ingest_overflow_policy: str = Field(
+        default="reject",
+        description="When the queue is full: 'reject' (503) or 'spill' (to disk)"
+    )
+    ingest_spill_dir: str = Field(
+        default="ingest_spill",
+        description="Directory for spilled webhook payloads"
+    )
+    webhook_execution_mode: str = Field(
+        default="thread",
+        description="Where webhook processing runs: 'inline' (event loop) or 'thread' (pool)"
+    )
+    webhook_processing_threads: int = Field(
+        default=2,
+        description="Thread pool size for 'thread' execution mode"
+    )
+    webhook_batch_commit: bool = Field(
+        default=True,
+        description="Persist each webhook payload in one transaction (savepoint per swap)"
+    )
+
+    # Signal Enrichment
+    enrichment_enabled: bool = Field(
+        default=True,
+        description="Fetch metadata and run a rug check for tokens in triggered alerts"
+    )
+    enrichment_metadata_timeout_seconds: float = Field(
+        default=3.0,
+        description="Deadline for the metadata stage before alerts go out unenriched"
+    )
+    enrichment_rug_check_timeout_seconds: float = Field(
+        default=5.0,
+        description="Deadline for the rug-check stage before alerts go out unchecked"
+    )
+
+    # Token Metadata Cache
+    metadata_cache_size: int = Field(
+        default=5000,
+        description="Max tokens held in the metadata cache (LRU)"
+    )
+    metadata_authorities_ttl_seconds: float = Field(
+        default=300,
+        description="Freshness of mint/freeze authority data"
+    )
+    metadata_supply_ttl_seconds: float = Field(
+        default=300,
+        description="Freshness of token supply data"
+    )
+    metadata_market_ttl_seconds: float = Field(
+        default=15,
+        description="Freshness of price, market cap and liquidity data"
+    )
+    metadata_batch_concurrency: int = Field(
+        default=4,
+        description="Max concurrent provider requests per bulk metadata/price lookup"
+    )
+
+    # Rug Check Cache
+    rug_check_cache_size: int = Field(
+        default=5000,
+        description="Max rug-check results kept in memory (LRU)"
+    )
+    rug_check_cache_ttl_seconds: float = Field(
+        default=300,
+        description="How long a rug-check result is reused before re-checking"
+    )
+    rug_check_deadline_seconds: float = Field(
+        default=4.0,
+        description="Deadline for a whole rug check; unfinished checks count as not flagged"
+    )
+    rug_check_batch_concurrency: int = Field(
+        default=20,
+        description="Max rug checks running at once in a batch check"
+    )
+
+    # Outcome Tracking
+    outcome_scheduler_enabled: bool = Field(
+        default=True,
+        description="Check each alert at its CHECK_WINDOWS from a due-time queue instead of polling"
+    )
+    outcome_retry_seconds: float = Field(
+        default=60.0,
+        description="Delay before retrying a scheduled outcome check whose token couldn't be priced"
+    )
+    outcome_check_concurrency: int = Field(
+        default=8,
+        description="Max tokens evaluated at once in an outcome pass"
+    )
+    outcome_check_timeout_seconds: float = Field(
+        default=10.0,
+        description="Deadline for pricing a token in an outcome pass; late tokens retry next pass"
+    )
+    outcome_batch_min: int = Field(
+        default=50,
+        description="Alerts per outcome pass when there is no backlog"
+    )
+    outcome_batch_max: int = Field(
+        default=2000,
+        description="Upper bound for the adaptive outcome batch size"
+    )
+    outcome_batch_target_seconds: float = Field(
+        default=60.0,
+        description="Outcome passes slower than this shrink the batch size"
+    )
+    outcome_backlog_interval_seconds: float = Field(
+        default=60.0,
+        description="Delay between polling outcome passes while alerts are still due"
+    )
+
+    # Price History
+    price_history_max_tokens: int = Field(
+        default=2000,
+        description="Max tokens with a price series in memory (LRU)"
+    )
+    price_history_max_samples: int = Field(
+        default=2880,
+        description="Max price samples kept per token"
+    )
+    price_history_retention_hours: float = Field(
+        default=48,
+        description="Price samples older than this are dropped"
+    )
+    price_sample_interval_seconds: float = Field(
+        default=60,
+        description="How often prices of tokens with open alerts are sampled"
+    )
+
+    # Copycat Detection
+    copycat_tokens_file: Optional[str] = Field(
+        default=None,
+        description="Known tickers to protect (JSON list or one per line); built-in list if unset"
+    )
+
+    # GoPlus Security Reports
+    goplus_report_ttl_seconds: float = Field(
+        default=600,
+        description="How long a GoPlus token security report is reused"
+    )
+    goplus_batch_window_ms: float = Field(
+        default=25,
+        description="Wait for more lookups before sending a batched GoPlus request"
+    )
+
+    # Persistent Cache
+    persistent_cache_enabled: bool = Field(
+        default=True,
+        description="Persist metadata, rug-check and price history caches to disk for warm restarts"
+    )
+    persistent_cache_path: str = Field(
+        default="alphapulse_cache.db",
+        description="SQLite file backing the persistent cache"
+    )
+    persistent_cache_flush_seconds: float = Field(
+        default=30,
+        description="How often changed cache entries are written to disk"
+    )
+    persistent_cache_compact_minutes: float = Field(
+        default=60,
+        description="How often expired entries are removed and the file compacted"
+    )
+
+    # SOL Price Ticker
+    sol_price_refresh_seconds: float = Field(
+        default=30,
+        description="How often the background ticker refreshes SOL/USD"
+    )
+    sol_price_max_age_seconds: float = Field(
+        default=120,
+        description="Age after which the SOL price is reported as stale"
+    )
+
+    # Request Coalescing
+    request_coalescing_enabled: bool = Field(
+        default=True,
+        description="Share one in-flight provider request among concurrent identical lookups"
+    )
 
     # Scraping Settings
     scrape_interval_minutes: int = Field(
@@ -6,12 +6,21 @@ from alphapulse.db.models import (
     Token,
     Trade,
     Alert,
+    AlertOutcomeCheck,
+    WalletStats,
+    WalletTokenStats,
     ClusterEvent,
     init_db,
     get_session,
     WalletRepository,
     TradeRepository
 )
+from alphapulse.db.identity_cache import (
+    WalletRef,
+    TokenRef,
+    IdentityCache,
+    get_identity_cache
+)
 
 __all__ = [
     'Base',
@@ -19,9 +28,16 @@ __all__ = [
     'Token',
     'Trade',
     'Alert',
+    'AlertOutcomeCheck',
+    'WalletStats',
+    'WalletTokenStats',
     'ClusterEvent',
     'init_db',
     'get_session',
     'WalletRepository',
-    'TradeRepository'
+    'TradeRepository',
+    'WalletRef',
+    'TokenRef',
+    'IdentityCache',
+    'get_identity_cache'
 ]
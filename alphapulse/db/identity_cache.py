@@ -0,0 +1,159 @@
+"""
+AlphaPulse Identity Cache
+Process-wide address -> row snapshots for wallets and tokens on the ingest path
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class WalletRef:
+    """Immutable snapshot of the SmartWallet fields signal processing reads"""
+    id: int
+    address: str
+    win_rate: float
+    conviction_score: float
+    tag: Optional[str] = None
+    # Inputs to live conviction scoring (see WalletStatsTracker)
+    total_trades: int = 0
+    pnl_total_sol: float = 0.0
+    pnl_7d_sol: float = 0.0
+    avg_hold_time_mins: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, wallet) -> "WalletRef":
+        return cls(
+            id=wallet.id,
+            address=wallet.address,
+            win_rate=wallet.win_rate or 0.0,
+            conviction_score=wallet.conviction_score or 0.0,
+            tag=wallet.tag,
+            total_trades=wallet.total_trades or 0,
+            pnl_total_sol=wallet.pnl_total_sol or 0.0,
+            pnl_7d_sol=wallet.pnl_7d_sol or 0.0,
+            avg_hold_time_mins=wallet.avg_hold_time_mins
+        )
+
+
+@dataclass(frozen=True)
+class TokenRef:
+    """Immutable snapshot of the Token fields signal processing reads"""
+    id: int
+    contract_address: str
+    symbol: Optional[str]
+    total_supply: Optional[float]
+    market_cap_sol: Optional[float]
+    launched_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, token) -> "TokenRef":
+        return cls(
+            id=token.id,
+            contract_address=token.contract_address,
+            symbol=token.symbol,
+            total_supply=token.total_supply,
+            market_cap_sol=token.market_cap_sol,
+            launched_at=token.launched_at
+        )
+
+    def age_minutes(self) -> float:
+        """Get token age in minutes since launch"""
+        if not self.launched_at:
+            return 0
+        delta = datetime.utcnow() - self.launched_at
+        return delta.total_seconds() / 60
+
+
+class IdentityCache:
+    """
+    Bounded LRU maps of wallet and token snapshots keyed by address
+
+    Writers (upsert_wallet, the bot's /add and /remove, score updates)
+    must invalidate entries they change. Thread-safe.
+    """
+
+    def __init__(self, max_wallets: int = 50_000, max_tokens: int = 50_000):
+        self.max_wallets = max_wallets
+        self.max_tokens = max_tokens
+        self._wallets: OrderedDict[str, WalletRef] = OrderedDict()
+        self._tokens: OrderedDict[str, TokenRef] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_wallet(self, address: str) -> Optional[WalletRef]:
+        return self._get(self._wallets, address)
+
+    def put_wallet(self, wallet) -> WalletRef:
+        ref = wallet if isinstance(wallet, WalletRef) else WalletRef.from_row(wallet)
+        self._put(self._wallets, ref.address, ref, self.max_wallets)
+        return ref
+
+    def invalidate_wallet(self, address: str):
+        with self._lock:
+            self._wallets.pop(address, None)
+
+    def get_token(self, contract_address: str) -> Optional[TokenRef]:
+        return self._get(self._tokens, contract_address)
+
+    def put_token(self, token) -> TokenRef:
+        ref = token if isinstance(token, TokenRef) else TokenRef.from_row(token)
+        self._put(self._tokens, ref.contract_address, ref, self.max_tokens)
+        return ref
+
+    def invalidate_token(self, contract_address: str):
+        with self._lock:
+            self._tokens.pop(contract_address, None)
+
+    def clear_wallets(self):
+        with self._lock:
+            self._wallets.clear()
+
+    def clear(self):
+        with self._lock:
+            self._wallets.clear()
+            self._tokens.clear()
+
+    def stats(self) -> dict:
+        return {
+            'wallets': len(self._wallets),
+            'tokens': len(self._tokens),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _get(self, store: OrderedDict, key: str):
+        with self._lock:
+            ref = store.get(key)
+            if ref is None:
+                self.misses += 1
+                return None
+            store.move_to_end(key)
+            self.hits += 1
+            return ref
+
+    def _put(self, store: OrderedDict, key: str, ref, max_size: int):
+        with self._lock:
+            store[key] = ref
+            store.move_to_end(key)
+            while len(store) > max_size:
+                store.popitem(last=False)
+
+
+# Global instance
+_identity_cache: Optional[IdentityCache] = None
+_identity_cache_lock = threading.Lock()
+
+
+def get_identity_cache() -> IdentityCache:
+    """Get global identity cache instance"""
+    global _identity_cache
+    if _identity_cache is None:
+        with _identity_cache_lock:
+            if _identity_cache is None:
+                _identity_cache = IdentityCache()
+    return _identity_cache
@@ -11,6 +11,8 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
+from alphapulse.db.identity_cache import get_identity_cache
+
 Base = declarative_base()
 
 
@@ -189,16 +191,104 @@ class Alert(Base):
 
     # Relationships
     token = relationship("Token", back_populates="alerts")
+    outcome_checks = relationship("AlertOutcomeCheck", back_populates="alert", cascade="all, delete-orphan")
 
     __table_args__ = (
         Index('idx_alert_type_time', 'alert_type', 'created_at'),
         Index('idx_alert_unsent', 'is_sent', 'created_at'),
+        # Covers performance stats: range on created_at, reads only these columns
+        Index('idx_alert_outcome_stats', 'created_at', 'alert_type', 'outcome_pnl'),
     )
 
     def __repr__(self):
         return f"<Alert {self.alert_type} for token_id={self.token_id}>"
 
 
+class AlertOutcomeCheck(Base):
+    """
+    Outcome of an alert at one of the OutcomeTracker check windows
+    """
+    __tablename__ = 'alert_outcome_checks'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    alert_id = Column(Integer, ForeignKey('alerts.id'), nullable=False)
+
+    # Window (minutes after the alert) and when it was actually checked
+    window_mins = Column(Integer, nullable=False)
+    checked_at = Column(DateTime, default=datetime.utcnow)
+
+    # Outcome
+    status = Column(String(10), nullable=False)  # pending, winner, loser, rugged
+    price_at_alert = Column(Float, nullable=True)
+    price_usd = Column(Float, nullable=True)
+    return_pct = Column(Float, nullable=True)
+
+    # Price path since the alert (from price history)
+    price_ath = Column(Float, nullable=True)
+    time_to_ath_mins = Column(Float, nullable=True)
+    max_drawdown_pct = Column(Float, nullable=True)
+
+    # Relationships
+    alert = relationship("Alert", back_populates="outcome_checks")
+
+    __table_args__ = (
+        UniqueConstraint('alert_id', 'window_mins', name='uq_alert_outcome_window'),
+    )
+
+    def __repr__(self):
+        return f"<AlertOutcomeCheck alert_id={self.alert_id} {self.window_mins}m {self.status}>"
+
+
+class WalletStats(Base):
+    """
+    Running per-wallet trade aggregates for conviction scoring
+
+    Updated on every recorded trade by WalletStatsTracker, so a score
+    is a single-row read instead of a scan of the wallet's trades.
+    """
+    __tablename__ = 'wallet_stats'
+
+    wallet_id = Column(Integer, ForeignKey('smart_wallets.id'), primary_key=True)
+
+    # Entries
+    buys = Column(Integer, default=0)
+    early_buys = Column(Integer, default=0)  # Buys soon after the token's launch
+    entry_mcap_buys = Column(Integer, default=0)  # Buys with a known mcap
+    avg_entry_mcap = Column(Float, default=0.0)  # Running mean over those buys
+    tokens_bought = Column(Integer, default=0)
+    rugged_tokens = Column(Integer, default=0)
+
+    # Net SOL PnL per token traded (Welford running mean / sum of squared deviations)
+    pnl_tokens = Column(Integer, default=0)
+    pnl_mean = Column(Float, default=0.0)
+    pnl_m2 = Column(Float, default=0.0)
+
+    # Trade counts per time bucket (JSON object: bucket index -> count)
+    trade_buckets = Column(Text, default='{}')
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<WalletStats wallet_id={self.wallet_id} buys={self.buys}>"
+
+
+class WalletTokenStats(Base):
+    """
+    A wallet's net SOL position in one token (feeds WalletStats)
+    """
+    __tablename__ = 'wallet_token_stats'
+
+    wallet_id = Column(Integer, ForeignKey('smart_wallets.id'), primary_key=True)
+    token_id = Column(Integer, ForeignKey('tokens.id'), primary_key=True)
+
+    net_sol = Column(Float, default=0.0)  # Sells minus buys
+    bought = Column(Boolean, default=False)
+
+    __table_args__ = (
+        Index('idx_wallet_token_stats_token', 'token_id', 'bought'),
+    )
+
+
 class ClusterEvent(Base):
     """
     Tracks when multiple wallets buy the same token within a time window
@@ -230,6 +320,10 @@ def init_db(database_url: str = "sqlite:///alphapulse.db"):
     """Initialize database and create all tables"""
     engine = create_engine(database_url, echo=False)
     Base.metadata.create_all(engine)
+    # create_all skips existing tables; add indexes declared since they were made
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
@@ -260,6 +354,17 @@ class WalletRepository:
             SmartWallet.address == address
         ).first()
 
+    def get_ref(self, address: str):
+        """Get a cached WalletRef snapshot by address (queries only on a miss)"""
+        cache = get_identity_cache()
+        ref = cache.get_wallet(address)
+        if ref is None:
+            wallet = self.get_by_address(address)
+            if wallet is None:
+                return None
+            ref = cache.put_wallet(wallet)
+        return ref
+
     def upsert_wallet(self, address: str, data: dict):
         """Insert or update wallet data"""
         wallet = self.get_by_address(address)
@@ -271,6 +376,7 @@ class WalletRepository:
             wallet = SmartWallet(address=address, **data)
             self.session.add(wallet)
         self.session.commit()
+        get_identity_cache().invalidate_wallet(address)
         return wallet
 
     def get_wallet_addresses(self) -> list[str]:
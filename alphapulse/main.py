@@ -10,7 +10,8 @@ from datetime import datetime
 from typing import Optional
 
 from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 import uvicorn
 
 from alphapulse.config import settings
@@ -18,13 +19,26 @@ from alphapulse.db.models import init_db, get_session, WalletRepository, Alert
 from alphapulse.scrapers import discover_smart_wallets, discover_from_dexscreener
 from alphapulse.processors.signal_processor import SignalProcessor
 from alphapulse.processors.helius_handler import HeliusWebhookHandler, HeliusWebhookManager
+from alphapulse.processors.ingest_queue import WebhookIngestQueue
+from alphapulse.processors.webhook_executor import WebhookExecutor
+from alphapulse.processors.signal_windows import get_signal_windows
+from alphapulse.processors.signal_enricher import get_signal_enricher
 from alphapulse.processors.webhook_security import (
     WebhookSecurityManager, RateLimiter,
     get_security_manager, get_rate_limiter
 )
 from alphapulse.bot.telegram_bot import AlphaPulseBot
+from alphapulse.services.metadata_cache import get_metadata_cache
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.persistent_cache import get_cache_persister
+from alphapulse.services.outcome_scheduler import get_outcome_scheduler
+from alphapulse.services.price_history import get_price_history
+from alphapulse.services.rug_detector import get_rug_check_timings, get_rug_detector
+from alphapulse.utils.single_flight import get_single_flight
 from alphapulse.services.conviction_calculator import ConvictionCalculator
+from alphapulse.services.wallet_stats import WalletStatsTracker
 from alphapulse.utils.logger import get_logger, setup_logging
+from alphapulse.utils.http_clients import close_http_clients
 
 setup_logging()
 logger = get_logger(__name__)
@@ -39,15 +53,18 @@ app = FastAPI(
 # Global instances
 engine = None
 webhook_handler: Optional[HeliusWebhookHandler] = None
+webhook_executor: Optional[WebhookExecutor] = None
 telegram_bot: Optional[AlphaPulseBot] = None
 security_manager: Optional[WebhookSecurityManager] = None
 rate_limiter: Optional[RateLimiter] = None
+ingest_queue: Optional[WebhookIngestQueue] = None
 
 
 @app.on_event("startup")
 async def startup():
     """Initialize components on startup"""
-    global engine, webhook_handler, telegram_bot, security_manager, rate_limiter
+    global engine, webhook_handler, webhook_executor, telegram_bot, security_manager, rate_limiter
+    global ingest_queue
 
     logger.info("Starting AlphaPulse...")
 
@@ -55,11 +72,40 @@ async def startup():
     engine = init_db(settings.database_url)
     logger.info("Database initialized")
 
-    # Initialize webhook handler
-    session = get_session(engine)
-    webhook_handler = HeliusWebhookHandler(session)
+    # Warm in-memory signal windows from recent trades
+    if settings.signal_windows_enabled:
+        session = get_session(engine)
+        try:
+            get_signal_windows().warm(session)
+        finally:
+            session.close()
+
+    # Create conviction metrics for wallets tracked before they existed
+    if settings.wallet_stats_enabled:
+        session = get_session(engine)
+        try:
+            WalletStatsTracker(session).backfill()
+        finally:
+            session.close()
+
+    # Initialize webhook handler (off-loop execution per settings)
+    webhook_executor = WebhookExecutor(engine)
+    webhook_handler = webhook_executor.handler
     logger.info("Webhook handler initialized")
 
+    # Restore provider caches from disk so enrichment starts hot
+    if settings.persistent_cache_enabled:
+        persister = get_cache_persister()
+        await asyncio.to_thread(persister.warm)
+        persister.start()
+
+    # Keep the SOL/USD price warm in the background
+    get_sol_price_ticker().start()
+
+    # Start ingest queue workers
+    ingest_queue = WebhookIngestQueue(process_webhook_body)
+    await ingest_queue.start()
+
     # Initialize security components
     security_manager = get_security_manager()
     rate_limiter = get_rate_limiter()
@@ -74,15 +120,36 @@ async def startup():
     # Schedule periodic tasks
     asyncio.create_task(discovery_loop())
     asyncio.create_task(conviction_update_loop())
-    asyncio.create_task(outcome_check_loop())
+    if settings.outcome_scheduler_enabled:
+        scheduler = get_outcome_scheduler()
+        session = get_session(engine)
+        try:
+            scheduler.warm(session)
+        finally:
+            session.close()
+        scheduler.start(lambda: get_session(engine))
+        # Sample prices of alerted tokens until their last check window
+        get_price_history().start(scheduler.token_service)
+    else:
+        asyncio.create_task(outcome_check_loop())
 
 
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup on shutdown"""
-    global telegram_bot
+    global telegram_bot, ingest_queue, webhook_executor
+    if ingest_queue:
+        await ingest_queue.stop()
+    if webhook_executor:
+        webhook_executor.shutdown()
     if telegram_bot:
         await telegram_bot.stop()
+    await get_sol_price_ticker().stop()
+    await get_outcome_scheduler().stop()
+    await get_price_history().stop()
+    if settings.persistent_cache_enabled:
+        await get_cache_persister().stop()
+    await close_http_clients()
     logger.info("AlphaPulse shutdown complete")
 
 
@@ -91,10 +158,13 @@ async def helius_webhook(request: Request):
     """
     Helius webhook endpoint
     Receives enhanced transaction data for tracked wallets
+
+    Only verifies the request and enqueues the raw body; processing
+    happens in the ingest queue workers so Helius gets a fast 202.
     """
-    global webhook_handler, telegram_bot, security_manager, rate_limiter
+    global security_manager, rate_limiter, ingest_queue
 
-    if not webhook_handler:
+    if not ingest_queue:
         raise HTTPException(status_code=503, detail="Handler not initialized")
 
     # Get client IP for rate limiting
@@ -117,41 +187,68 @@ async def helius_webhook(request: Request):
             logger.warning(f"Invalid webhook signature from {client_ip}: {validation.error}")
             raise HTTPException(status_code=401, detail=f"Invalid signature: {validation.error}")
 
-    try:
-        payload = json.loads(body)
-        logger.debug(f"Received webhook payload with {len(payload) if isinstance(payload, list) else 1} transactions")
+    if not ingest_queue.enqueue(body):
+        raise HTTPException(status_code=503, detail="Ingest queue full")
 
-        # Process the webhook
-        alerts = webhook_handler.handle_webhook(payload)
+    return JSONResponse(
+        {"status": "accepted", "queue_depth": ingest_queue.depth},
+        status_code=202
+    )
 
-        # Send Telegram alerts
-        if alerts and telegram_bot:
-            session = get_session(engine)
-            try:
-                signal_processor = SignalProcessor(session)
-                for alert_info in alerts:
-                    alert = session.query(Alert).get(alert_info['alert_id'])
-                    if alert and not alert.is_sent:
-                        # Enrich signal with rug check before sending
-                        # (Already done during alert creation now)
-
-                        # Get wallet details for the alert
-                        trigger_data = json.loads(alert.trigger_data) if alert.trigger_data else {}
-                        wallets = trigger_data.get('wallets', [])
-
-                        await telegram_bot.send_alert(alert, alert.token, wallets)
-                        signal_processor.mark_alert_sent(alert)
-            finally:
-                session.close()
 
-        return JSONResponse({"status": "ok", "alerts": len(alerts)})
+async def process_webhook_body(body: bytes):
+    """
+    Process one raw webhook body (runs in an ingest queue worker)
 
+    Parses the payload, runs signal detection, enriches the resulting
+    alerts (one metadata fetch and rug check per token, concurrently) and
+    sends them to Telegram.
+    """
+    global webhook_executor, telegram_bot
+
+    try:
+        payload = json.loads(body)
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in webhook: {e}")
-        raise HTTPException(status_code=400, detail="Invalid JSON payload")
-    except Exception as e:
-        logger.error(f"Webhook processing error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        return
+
+    logger.debug(f"Processing webhook payload with {len(payload) if isinstance(payload, list) else 1} transactions")
+
+    # Process the webhook (on the executor's thread pool in 'thread' mode)
+    alerts = await webhook_executor.handle(payload)
+
+    if not alerts:
+        return
+
+    # Enrich every token in the payload concurrently (bounded by per-stage deadlines)
+    enrichments = {}
+    if settings.enrichment_enabled:
+        enrichments = await get_signal_enricher().enrich_many([a['token'] for a in alerts])
+
+    session = get_session(engine)
+    try:
+        signal_processor = SignalProcessor(session)
+        for alert_info in alerts:
+            alert = session.get(Alert, alert_info['alert_id'])
+            if not alert or alert.is_sent:
+                continue
+
+            enrichment = enrichments.get(alert_info['token'])
+            if enrichment:
+                alert = signal_processor.apply_enrichment(alert, enrichment)
+                if alert is None:
+                    continue
+
+            # Send Telegram alert
+            if telegram_bot:
+                # Get wallet details for the alert
+                trigger_data = json.loads(alert.trigger_data) if alert.trigger_data else {}
+                wallets = trigger_data.get('wallets', [])
+
+                await telegram_bot.send_alert(alert, alert.token, wallets)
+                signal_processor.mark_alert_sent(alert)
+    finally:
+        session.close()
 
 
 @app.get("/health")
@@ -160,7 +257,15 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "tracked_wallets": len(webhook_handler._tracked_wallets) if webhook_handler else 0
+        "tracked_wallets": len(webhook_handler._tracked_wallets) if webhook_handler else 0,
+        "ingest_queue": ingest_queue.stats() if ingest_queue else None,
+        "metadata_cache": get_metadata_cache().stats(),
+        "sol_price": get_sol_price_ticker().stats(),
+        "request_coalescing": get_single_flight().stats(),
+        "rug_check": get_rug_check_timings().stats(),
+        "persistent_cache": get_cache_persister().stats() if settings.persistent_cache_enabled else None,
+        "outcome_scheduler": get_outcome_scheduler().stats() if settings.outcome_scheduler_enabled else None,
+        "price_history": get_price_history().stats()
     }
 
 
@@ -294,7 +399,9 @@ async def update_helius_webhook():
 async def conviction_update_loop():
     """
     Periodic conviction score update loop
-    Runs every 6 hours to recalculate wallet scores
+    Runs every 6 hours to recalculate wallet scores (with wallet stats
+    enabled scores are also updated on each trade; this pass ages out
+    the 7d / 30d trade counts of idle wallets)
     """
     await asyncio.sleep(60)  # Initial delay
 
@@ -317,12 +424,13 @@ async def conviction_update_loop():
 
 async def outcome_check_loop():
     """
-    Periodic outcome checking loop
+    Periodic outcome checking loop (when the outcome scheduler is disabled)
     Runs every 30 minutes to check alert outcomes
     """
     await asyncio.sleep(120)  # Initial delay
 
     while True:
+        backlog = 0
         try:
             logger.info("Checking alert outcomes...")
             session = get_session(engine)
@@ -330,14 +438,17 @@ async def outcome_check_loop():
                 from alphapulse.services.outcome_tracker import OutcomeTracker
                 tracker = OutcomeTracker(session)
                 outcomes = await tracker.check_pending_alerts()
+                backlog = tracker.backlog
                 logger.info(f"Checked {len(outcomes)} alert outcomes")
             finally:
                 session.close()
         except Exception as e:
             logger.error(f"Outcome check error: {e}")
 
-        # Run every 30 minutes
-        await asyncio.sleep(30 * 60)
+        # Run every 30 minutes, sooner while a backlog remains
+        await asyncio.sleep(
+            settings.outcome_backlog_interval_seconds if backlog else 30 * 60
+        )
 
 
 @app.get("/backtest")
@@ -371,6 +482,34 @@ async def run_backtest(days: int = 7):
         session.close()
 
 
+# Most tokens one POST /check may screen
+MAX_CHECK_TOKENS = 200
+
+
+class CheckRequest(BaseModel):
+    """Body of POST /check"""
+    mints: list[str]
+
+
+def _rug_check_response(result) -> dict:
+    """JSON shape of a rug check result"""
+    return {
+        "contract_address": result.contract_address,
+        "passed": result.passed,
+        "risk_level": result.risk_level.value,
+        "risk_score": result.risk_score,
+        "warnings": result.warnings,
+        "details": {
+            "mintable": result.mintable,
+            "freezable": result.freezable,
+            "lp_unlocked": result.lp_unlocked,
+            "low_liquidity": result.low_liquidity,
+            "high_concentration": result.high_concentration,
+            "honeypot_risk": result.honeypot_risk
+        }
+    }
+
+
 @app.get("/check/{token_ca}")
 async def check_token(token_ca: str):
     """
@@ -380,31 +519,45 @@ async def check_token(token_ca: str):
         token_ca: Token contract address
     """
     try:
-        from alphapulse.services.rug_detector import RugDetector
-
-        detector = RugDetector()
-        result = await detector.check_token(token_ca)
-
-        return {
-            "contract_address": token_ca,
-            "passed": result.passed,
-            "risk_level": result.risk_level.value,
-            "risk_score": result.risk_score,
-            "warnings": result.warnings,
-            "details": {
-                "mintable": result.mintable,
-                "freezable": result.freezable,
-                "lp_unlocked": result.lp_unlocked,
-                "low_liquidity": result.low_liquidity,
-                "high_concentration": result.high_concentration,
-                "honeypot_risk": result.honeypot_risk
-            }
-        }
+        result = await get_rug_detector().check_token(token_ca)
+        return _rug_check_response(result)
     except Exception as e:
         logger.error(f"Token check error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/check")
+async def check_tokens(body: CheckRequest):
+    """
+    Run rug checks on a list of tokens
+
+    Streams newline-delimited JSON, one result per line in completion
+    order (cached results first). Provider calls are batched and shared
+    across the list.
+
+    Body:
+        {"mints": ["<token_ca>", ...]} - up to MAX_CHECK_TOKENS addresses
+    """
+    mints = list(dict.fromkeys(body.mints))
+    if not mints:
+        raise HTTPException(status_code=400, detail="No mints given")
+    if len(mints) > MAX_CHECK_TOKENS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CHECK_TOKENS} mints per request")
+    invalid = [m for m in mints if not 32 <= len(m) <= 44]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid token addresses: {invalid[:5]}")
+
+    async def stream():
+        try:
+            async for result in get_rug_detector().check_tokens(mints):
+                yield json.dumps(_rug_check_response(result)) + "\n"
+        except Exception as e:
+            logger.error(f"Batch token check error: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 def main():
     """Main entry point"""
     logger.info("="*50)
@@ -10,6 +10,28 @@ from alphapulse.processors.helius_handler import (
     HeliusWebhookManager,
     ParsedSwap
 )
+from alphapulse.processors.signal_windows import (
+    SignalWindows,
+    get_signal_windows
+)
+from alphapulse.processors.cluster_state import (
+    ClusterStateMachine,
+    ClusterPhase,
+    get_cluster_states
+)
+from alphapulse.processors.signal_enricher import (
+    SignalEnricher,
+    Enrichment,
+    get_signal_enricher
+)
+from alphapulse.processors.ingest_queue import (
+    WebhookIngestQueue,
+    OverflowPolicy
+)
+from alphapulse.processors.webhook_executor import (
+    WebhookExecutor,
+    ExecutionMode
+)
 
 __all__ = [
     'SignalProcessor',
@@ -17,5 +39,17 @@ __all__ = [
     'SignalResult',
     'HeliusWebhookHandler',
     'HeliusWebhookManager',
-    'ParsedSwap'
+    'ParsedSwap',
+    'SignalWindows',
+    'get_signal_windows',
+    'ClusterStateMachine',
+    'ClusterPhase',
+    'get_cluster_states',
+    'SignalEnricher',
+    'Enrichment',
+    'get_signal_enricher',
+    'WebhookIngestQueue',
+    'OverflowPolicy',
+    'WebhookExecutor',
+    'ExecutionMode'
 ]
@@ -0,0 +1,250 @@
+"""
+AlphaPulse Cluster State
+Per-token hysteresis for cluster signals: one event and alert per episode
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional
+
+from alphapulse.config import settings
+
+
+class ClusterPhase(Enum):
+    """Lifecycle of a token's cluster signal"""
+    ARMED = "armed"        # No active episode; the next cluster fires
+    FIRED = "fired"        # Cluster alerted and still live
+    COOLDOWN = "cooldown"  # Cluster dropped out of the window; re-forming continues the episode
+
+
+class ClusterTransition(Enum):
+    """What a cluster observation should do"""
+    FIRE = "fire"          # New episode: create ClusterEvent and alert
+    ESCALATE = "escalate"  # Wallet count grew materially: update event and send follow-up
+    UPDATE = "update"      # New wallet joined: update event in place, no alert
+    NONE = "none"          # Nothing material changed
+
+
+@dataclass
+class ClusterState:
+    """Episode state for one token"""
+    phase: ClusterPhase = ClusterPhase.ARMED
+    event_id: Optional[int] = None
+    alerted_wallet_count: int = 0
+    addresses: list[str] = field(default_factory=list)
+    signatures: set[str] = field(default_factory=set)
+    total_sol: float = 0.0
+    first_buy_at: Optional[datetime] = None
+    last_buy_at: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+
+
+@dataclass
+class ClusterUndo:
+    """What one observe() changed, so a rolled-back write can be undone"""
+    previous: Optional[ClusterState]  # State object replaced by a new episode, if any
+    phase: ClusterPhase
+    event_id: Optional[int]
+    alerted_wallet_count: int
+    address_count: int
+    added_signatures: list[str]
+    total_sol: float
+    first_buy_at: Optional[datetime]
+    last_buy_at: Optional[datetime]
+    last_seen: Optional[datetime]
+
+
+class ClusterStateMachine:
+    """
+    Process-wide armed -> fired -> cooldown tracker keyed by token id
+
+    A cluster fires once per episode. While fired, newly joining wallets
+    update the episode's ClusterEvent in place, and a follow-up alert is
+    only emitted once the wallet count has grown by escalation_wallets
+    since the last alert. When the cluster drops out of the window the
+    token cools down; after cooldown_mins without a cluster it re-arms.
+    Thread-safe.
+    """
+
+    # Sweep expired states after this many observations
+    PRUNE_EVERY = 1000
+
+    def __init__(self, cooldown_mins: int = None, escalation_wallets: int = None):
+        self.cooldown = timedelta(
+            minutes=settings.cluster_cooldown_minutes if cooldown_mins is None else cooldown_mins
+        )
+        self.escalation_wallets = max(1, escalation_wallets or settings.cluster_escalation_wallets)
+        self._states: dict[int, ClusterState] = {}
+        self._lock = threading.Lock()
+        self._observations = 0
+
+    def observe(
+        self,
+        token_id: int,
+        trades: list,
+        addresses: list[str]
+    ) -> tuple[ClusterTransition, ClusterState, ClusterUndo]:
+        """
+        Feed a met cluster condition for a token
+
+        Args:
+            token_id: Token the cluster is on
+            trades: Qualifying trades (Trade rows or WindowEntry items)
+            addresses: Distinct wallet addresses in the cluster
+
+        Returns:
+            (transition, state, undo) - pass undo to restore() if the
+            caller's write is rolled back
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            previous = self._states.get(token_id)
+            state = self._current(previous, now)
+            undo = ClusterUndo(
+                previous=previous if state is not previous else None,
+                phase=state.phase,
+                event_id=state.event_id,
+                alerted_wallet_count=state.alerted_wallet_count,
+                address_count=len(state.addresses),
+                added_signatures=[],
+                total_sol=state.total_sol,
+                first_buy_at=state.first_buy_at,
+                last_buy_at=state.last_buy_at,
+                last_seen=state.last_seen
+            )
+
+            known = len(state.addresses)
+            for address in addresses:
+                if address not in state.addresses:
+                    state.addresses.append(address)
+            for trade in trades:
+                if trade.tx_signature not in state.signatures:
+                    state.signatures.add(trade.tx_signature)
+                    undo.added_signatures.append(trade.tx_signature)
+                    state.total_sol += trade.sol_amount
+                    if state.first_buy_at is None or trade.block_time < state.first_buy_at:
+                        state.first_buy_at = trade.block_time
+                    if state.last_buy_at is None or trade.block_time > state.last_buy_at:
+                        state.last_buy_at = trade.block_time
+            state.last_seen = now
+
+            if state.phase == ClusterPhase.ARMED:
+                transition = ClusterTransition.FIRE
+                state.alerted_wallet_count = len(state.addresses)
+            elif len(state.addresses) >= state.alerted_wallet_count + self.escalation_wallets:
+                transition = ClusterTransition.ESCALATE
+                state.alerted_wallet_count = len(state.addresses)
+            elif len(state.addresses) > known:
+                transition = ClusterTransition.UPDATE
+            else:
+                transition = ClusterTransition.NONE
+
+            state.phase = ClusterPhase.FIRED
+            self._states[token_id] = state
+
+            self._observations += 1
+            if self._observations % self.PRUNE_EVERY == 0:
+                self._prune_locked(now)
+            return transition, state, undo
+
+    def set_event_id(self, token_id: int, event_id: int):
+        """Attach the ClusterEvent row written for a FIRE"""
+        with self._lock:
+            state = self._states.get(token_id)
+            if state is not None:
+                state.event_id = event_id
+
+    def rearm(self, token_id: int, event_id: int) -> bool:
+        """
+        End the episode behind a FIRE whose alert was dropped
+
+        Only acts while the token is still on that episode, so a newer
+        episode is left alone.
+
+        Returns:
+            True if the token was re-armed
+        """
+        with self._lock:
+            state = self._states.get(token_id)
+            if state is None or state.event_id != event_id:
+                return False
+            del self._states[token_id]
+            return True
+
+    def cool_down(self, token_id: int):
+        """Note that the token's cluster condition is no longer met"""
+        with self._lock:
+            state = self._states.get(token_id)
+            if state is not None and state.phase == ClusterPhase.FIRED:
+                state.phase = ClusterPhase.COOLDOWN
+
+    def restore(self, token_id: int, undo: ClusterUndo):
+        """Undo an observe() whose database writes were rolled back"""
+        with self._lock:
+            state = self._states.get(token_id)
+            if state is None:
+                return
+            if undo.phase == ClusterPhase.ARMED:
+                # observe() started a new episode; put back what it replaced
+                if undo.previous is None:
+                    del self._states[token_id]
+                else:
+                    self._states[token_id] = undo.previous
+                return
+            state.phase = undo.phase
+            state.event_id = undo.event_id
+            state.alerted_wallet_count = undo.alerted_wallet_count
+            del state.addresses[undo.address_count:]
+            state.signatures.difference_update(undo.added_signatures)
+            state.total_sol = undo.total_sol
+            state.first_buy_at = undo.first_buy_at
+            state.last_buy_at = undo.last_buy_at
+            state.last_seen = undo.last_seen
+
+    def phase(self, token_id: int) -> ClusterPhase:
+        with self._lock:
+            state = self._current(self._states.get(token_id), datetime.utcnow())
+            return state.phase
+
+    def prune(self) -> int:
+        """Drop states whose cooldown expired; returns how many were removed"""
+        with self._lock:
+            return self._prune_locked(datetime.utcnow())
+
+    def _prune_locked(self, now: datetime) -> int:
+        expired = [
+            token_id for token_id, state in self._states.items()
+            if self._current(state, now).phase == ClusterPhase.ARMED
+        ]
+        for token_id in expired:
+            del self._states[token_id]
+        return len(expired)
+
+    def _current(self, state: Optional[ClusterState], now: datetime) -> ClusterState:
+        """State as of now: a fresh ARMED state once the cooldown has run out"""
+        if state is None or state.last_seen is None:
+            return ClusterState()
+        if now - state.last_seen > self.cooldown:
+            return ClusterState()
+        return state
+
+    @property
+    def token_count(self) -> int:
+        return len(self._states)
+
+
+# Global instance
+_cluster_states: Optional[ClusterStateMachine] = None
+_cluster_states_lock = threading.Lock()
+
+
+def get_cluster_states() -> ClusterStateMachine:
+    """Get global cluster state machine instance"""
+    global _cluster_states
+    if _cluster_states is None:
+        with _cluster_states_lock:
+            if _cluster_states is None:
+                _cluster_states = ClusterStateMachine()
+    return _cluster_states
@@ -15,6 +15,7 @@ from alphapulse.config import settings
 from alphapulse.processors.signal_processor import SignalProcessor
 from alphapulse.db.models import WalletRepository
 from alphapulse.utils.logger import get_logger
+from alphapulse.utils.http_clients import get_http_client
 
 logger = get_logger(__name__)
 
@@ -47,18 +48,39 @@ class HeliusWebhookHandler:
     # Native SOL mint
     SOL_MINT = "So11111111111111111111111111111111111111112"
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        tracked_wallets: Optional[set[str]] = None,
+        batch_commit: Optional[bool] = None
+    ):
+        """
+        Initialize handler
+
+        Args:
+            session: Database session used for all processing
+            tracked_wallets: Shared tracked-address set (e.g. from another
+                             handler); loaded from the database if omitted
+            batch_commit: Commit each payload once instead of per write
+                          (defaults to settings)
+        """
         self.session = session
+        self.batch_commit = settings.webhook_batch_commit if batch_commit is None else batch_commit
         self.wallet_repo = WalletRepository(session)
         self.signal_processor = SignalProcessor(session)
 
         # Cache tracked wallet addresses for fast lookup
-        self._tracked_wallets: set[str] = set()
-        self._refresh_wallet_cache()
+        if tracked_wallets is not None:
+            self._tracked_wallets = tracked_wallets
+        else:
+            self._tracked_wallets: set[str] = set()
+            self._refresh_wallet_cache()
 
     def _refresh_wallet_cache(self):
-        """Refresh the set of tracked wallet addresses"""
-        self._tracked_wallets = set(self.wallet_repo.get_wallet_addresses())
+        """Refresh the set of tracked wallet addresses (in place, so sharers see it)"""
+        addresses = set(self.wallet_repo.get_wallet_addresses())
+        self._tracked_wallets.intersection_update(addresses)
+        self._tracked_wallets.update(addresses)
         logger.info(f"Wallet cache refreshed: {len(self._tracked_wallets)} wallets tracked")
 
     def handle_webhook(self, payload: dict) -> list[dict]:
@@ -71,42 +93,151 @@ class HeliusWebhookHandler:
         Returns:
             List of generated alerts (if any)
         """
-        alerts = []
-
         # Helius sends array of transactions
         transactions = payload if isinstance(payload, list) else [payload]
 
+        if self.batch_commit:
+            return self._handle_batched(transactions)
+
+        alerts = []
         for tx in transactions:
             try:
                 parsed = self._parse_transaction(tx)
-                if parsed and parsed.is_buy:
-                    # Check if wallet is tracked
-                    if parsed.wallet_address in self._tracked_wallets:
-                        signals = self.signal_processor.process_buy_event(
-                            wallet_address=parsed.wallet_address,
-                            token_ca=parsed.token_address,
-                            sol_amount=parsed.sol_amount,
-                            token_amount=parsed.token_amount,
-                            tx_signature=parsed.tx_signature,
-                            block_time=parsed.block_time
-                        )
-
-                        # Create alerts for triggered signals
-                        for signal in signals:
-                            if signal.triggered:
-                                alert = self.signal_processor.create_alert(signal)
-                                alerts.append({
-                                    'alert_id': alert.id,
-                                    'type': signal.signal_type.value,
-                                    'token': parsed.token_address
-                                })
+                if self._is_tracked_buy(parsed):
+                    alerts.extend(self._process_buy(parsed))
 
             except Exception as e:
                 logger.error(f"Error processing transaction: {e}")
+                self.session.rollback()
                 continue
 
         return alerts
 
+    def _handle_batched(self, transactions: list[dict]) -> list[dict]:
+        """
+        Persist a whole payload in a single transaction
+
+        Each swap's checks run inside their own savepoint so a bad one is
+        rolled back alone. Trades and cluster events are then written in
+        bulk (SignalProcessor.flush_pending), alerts created, and
+        everything committed once at the end.
+        """
+        buys = []
+        for tx in transactions:
+            try:
+                parsed = self._parse_transaction(tx)
+            except Exception as e:
+                logger.error(f"Error parsing transaction: {e}")
+                continue
+            if self._is_tracked_buy(parsed):
+                buys.append(parsed)
+
+        if not buys:
+            return []
+
+        alerts = []
+        with self.signal_processor.unit_of_work():
+            self.signal_processor.prefetch(
+                token_cas=[b.token_address for b in buys],
+                tx_signatures=[b.tx_signature for b in buys],
+                wallet_addresses=[b.wallet_address for b in buys]
+            )
+            detected = []
+            for parsed in buys:
+                savepoint = self.session.begin_nested()
+                try:
+                    signals = self._detect_signals(parsed)
+                    savepoint.commit()
+                    detected.append((parsed, signals))
+                except Exception as e:
+                    logger.error(f"Error processing transaction {parsed.tx_signature[:8]}...: {e}")
+                    savepoint.rollback()
+                    self.signal_processor.discard_event(parsed.tx_signature, parsed.token_address)
+
+            self.signal_processor.flush_pending()
+
+            triggered = [(parsed, signals) for parsed, signals in detected if any(s.triggered for s in signals)]
+            if triggered:
+                alerts = self._create_payload_alerts(triggered)
+
+        return alerts
+
+    def _create_payload_alerts(self, detected: list[tuple[ParsedSwap, list]]) -> list[dict]:
+        """
+        Create the alerts of a payload in one flush
+
+        If that fails, each buy's alerts are retried in their own
+        savepoint so only the bad ones are lost.
+        """
+        savepoint = self.session.begin_nested()
+        try:
+            alerts = self._create_all_alerts(detected)
+            savepoint.commit()
+            return alerts
+        except Exception as e:
+            logger.error(f"Error creating alerts for payload, retrying per transaction: {e}")
+            savepoint.rollback()
+
+        alerts = []
+        for parsed, signals in detected:
+            savepoint = self.session.begin_nested()
+            try:
+                tx_alerts = self._create_alerts(parsed, signals)
+                savepoint.commit()
+                alerts.extend(tx_alerts)
+            except Exception as e:
+                logger.error(f"Error creating alerts for {parsed.tx_signature[:8]}...: {e}")
+                savepoint.rollback()
+        return alerts
+
+    def _is_tracked_buy(self, parsed: Optional[ParsedSwap]) -> bool:
+        """Whether a parsed swap is a buy by a tracked wallet"""
+        return bool(parsed and parsed.is_buy and parsed.wallet_address in self._tracked_wallets)
+
+    def _process_buy(self, parsed: ParsedSwap) -> list[dict]:
+        """Run signal detection for one tracked buy and create its alerts"""
+        return self._create_alerts(parsed, self._detect_signals(parsed))
+
+    def _detect_signals(self, parsed: ParsedSwap) -> list:
+        """Record one tracked buy and run signal detection on it"""
+        return self.signal_processor.process_buy_event(
+            wallet_address=parsed.wallet_address,
+            token_ca=parsed.token_address,
+            sol_amount=parsed.sol_amount,
+            token_amount=parsed.token_amount,
+            tx_signature=parsed.tx_signature,
+            block_time=parsed.block_time
+        )
+
+    def _create_alerts(self, parsed: ParsedSwap, signals: list) -> list[dict]:
+        """Create alerts for the triggered signals of one buy"""
+        alerts = []
+        for signal in signals:
+            if signal.triggered:
+                alert = self.signal_processor.create_alert(signal)
+                if alert:
+                    alerts.append({
+                        'alert_id': alert.id,
+                        'type': signal.signal_type.value,
+                        'token': parsed.token_address
+                    })
+        return alerts
+
+    def _create_all_alerts(self, detected: list[tuple[ParsedSwap, list]]) -> list[dict]:
+        """Create alerts for the triggered signals of many buys in one flush"""
+        triggered = [
+            (parsed, signal) for parsed, signals in detected for signal in signals if signal.triggered
+        ]
+        created = self.signal_processor.create_alerts([signal for _, signal in triggered])
+        return [
+            {
+                'alert_id': alert.id,
+                'type': signal.signal_type.value,
+                'token': parsed.token_address
+            }
+            for (parsed, signal), alert in zip(triggered, created) if alert
+        ]
+
     def _parse_transaction(self, tx: dict) -> Optional[ParsedSwap]:
         """
         Parse a Helius enhanced transaction
@@ -224,8 +355,6 @@ class HeliusWebhookManager:
         Returns:
             Webhook configuration from Helius
         """
-        import httpx
-
         url = f"{self.base_url}/webhooks?api-key={self.api_key}"
 
         payload = {
@@ -236,10 +365,10 @@ class HeliusWebhookManager:
             "txnStatus": "success"
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client('helius')
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
 
     async def update_webhook(
         self,
@@ -256,36 +385,30 @@ class HeliusWebhookManager:
         Returns:
             Updated webhook configuration
         """
-        import httpx
-
         url = f"{self.base_url}/webhooks/{webhook_id}?api-key={self.api_key}"
 
         payload = {
             "accountAddresses": wallet_addresses
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, json=payload)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client('helius')
+        response = await client.put(url, json=payload)
+        response.raise_for_status()
+        return response.json()
 
     async def delete_webhook(self, webhook_id: str) -> bool:
         """Delete a webhook"""
-        import httpx
-
         url = f"{self.base_url}/webhooks/{webhook_id}?api-key={self.api_key}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url)
-            return response.status_code == 200
+        client = get_http_client('helius')
+        response = await client.delete(url)
+        return response.status_code == 200
 
     async def list_webhooks(self) -> list[dict]:
         """List all webhooks for this API key"""
-        import httpx
-
         url = f"{self.base_url}/webhooks?api-key={self.api_key}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client('helius')
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.json()
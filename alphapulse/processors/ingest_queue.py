@@ -0,0 +1,194 @@
+"""
+AlphaPulse Webhook Ingest Queue
+Bounded in-process queue that decouples webhook acknowledgement from processing
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """What to do with a payload when the queue is full"""
+    REJECT = "reject"  # Refuse with 503 so Helius retries later
+    SPILL = "spill"  # Write the payload to disk and replay it when there is room
+
+
+class WebhookIngestQueue:
+    """
+    Buffers raw webhook bodies and drains them with a pool of worker tasks
+
+    The webhook endpoint only verifies the signature and calls enqueue(),
+    so acknowledgement latency stays flat no matter how slow the database
+    or Telegram are. Workers hand each body to the configured processor
+    coroutine in arrival order.
+    """
+
+    def __init__(
+        self,
+        processor: Callable[[bytes], Awaitable[None]],
+        max_size: int = None,
+        worker_count: int = None,
+        overflow_policy: str = None,
+        spill_dir: str = None
+    ):
+        """
+        Initialize ingest queue
+
+        Args:
+            processor: Coroutine called with each raw webhook body
+            max_size: Maximum payloads held in memory
+            worker_count: Number of worker tasks draining the queue
+            overflow_policy: 'reject' or 'spill'
+            spill_dir: Directory for spilled payloads (spill policy only)
+        """
+        self.processor = processor
+        self.max_size = max_size or settings.ingest_queue_max_size
+        self.worker_count = worker_count or settings.ingest_worker_count
+        self.overflow_policy = OverflowPolicy(overflow_policy or settings.ingest_overflow_policy)
+        self.spill_dir = spill_dir or settings.ingest_spill_dir
+
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=self.max_size)
+        self._workers: list[asyncio.Task] = []
+        self._spilled: deque[str] = deque()
+        self._spill_seq = 0
+
+        # Counters
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.spilled = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of payloads waiting in memory"""
+        return self._queue.qsize()
+
+    @property
+    def spill_depth(self) -> int:
+        """Number of payloads waiting on disk"""
+        return len(self._spilled)
+
+    async def start(self):
+        """Recover spilled payloads and start worker tasks"""
+        if self.overflow_policy == OverflowPolicy.SPILL:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            leftovers = sorted(
+                f for f in os.listdir(self.spill_dir) if f.endswith('.json')
+            )
+            self._spilled.extend(os.path.join(self.spill_dir, f) for f in leftovers)
+            if leftovers:
+                logger.info(f"Recovered {len(leftovers)} spilled webhook payloads")
+            self._refill_from_spill()
+
+        for i in range(self.worker_count):
+            self._workers.append(asyncio.create_task(self._worker(i)))
+        logger.info(
+            f"Ingest queue started: {self.worker_count} workers, "
+            f"max_size={self.max_size}, overflow={self.overflow_policy.value}"
+        )
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """
+        Stop workers, giving in-flight payloads a chance to finish
+
+        Args:
+            drain_timeout: Seconds to wait for the in-memory queue to drain
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Ingest queue stopped with {self.depth} payloads undrained")
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, body: bytes) -> bool:
+        """
+        Enqueue a raw webhook body without blocking
+
+        Returns:
+            True if accepted (queued or spilled), False if rejected
+        """
+        # Keep FIFO order: once anything is on disk, new payloads go behind it
+        if not self._spilled:
+            try:
+                self._queue.put_nowait(body)
+                self.enqueued += 1
+                return True
+            except asyncio.QueueFull:
+                pass
+
+        if self.overflow_policy == OverflowPolicy.SPILL:
+            try:
+                self._spill(body)
+                self.enqueued += 1
+                return True
+            except OSError as e:
+                logger.error(f"Failed to spill webhook payload: {e}")
+
+        self.rejected += 1
+        logger.warning(f"Ingest queue full ({self.depth}), rejecting webhook")
+        return False
+
+    def stats(self) -> dict:
+        """Current queue depth and lifetime counters"""
+        return {
+            'depth': self.depth,
+            'max_size': self.max_size,
+            'spill_depth': self.spill_depth,
+            'workers': len(self._workers),
+            'overflow_policy': self.overflow_policy.value,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'spilled': self.spilled,
+        }
+
+    async def _worker(self, worker_id: int):
+        """Drain the queue until cancelled"""
+        while True:
+            body = await self._queue.get()
+            try:
+                await self.processor(body)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Ingest worker {worker_id} failed to process payload: {e}")
+            finally:
+                self._queue.task_done()
+                self._refill_from_spill()
+
+    def _spill(self, body: bytes):
+        """Write a payload to the spill directory"""
+        self._spill_seq += 1
+        path = os.path.join(self.spill_dir, f"{time.time_ns()}-{self._spill_seq:06d}.json")
+        with open(path, 'wb') as f:
+            f.write(body)
+        self._spilled.append(path)
+        self.spilled += 1
+
+    def _refill_from_spill(self):
+        """Move spilled payloads back into memory while there is room"""
+        while self._spilled and not self._queue.full():
+            path = self._spilled.popleft()
+            try:
+                with open(path, 'rb') as f:
+                    body = f.read()
+                os.remove(path)
+            except OSError as e:
+                logger.error(f"Failed to read spilled payload {path}: {e}")
+                continue
+            self._queue.put_nowait(body)
@@ -0,0 +1,148 @@
+"""
+AlphaPulse Signal Enricher
+Concurrent, per-mint coalesced metadata and rug-check enrichment for triggered signals
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from alphapulse.services.rug_detector import RugCheckResult
+    from alphapulse.services.token_metadata import TokenMetadata
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Enrichment:
+    """Enrichment results for one token (fields stay None when a stage failed or timed out)"""
+    contract_address: str
+    metadata: Optional["TokenMetadata"] = None
+    rug_result: Optional["RugCheckResult"] = None
+    timed_out: list[str] = field(default_factory=list)  # Stages that hit their deadline
+
+    @property
+    def rug_checked(self) -> bool:
+        return self.rug_result is not None
+
+
+class SignalEnricher:
+    """
+    Enriches triggered signals with token metadata and a rug check
+
+    Work is coalesced per mint: however many signals (or concurrent
+    payloads) ask for the same token, it gets one metadata fetch and one
+    rug check, and the rug check reuses that metadata. Each stage has
+    its own deadline; on timeout the signal goes out unenriched.
+    """
+
+    def __init__(
+        self,
+        token_service=None,
+        rug_detector=None,
+        metadata_timeout: float = None,
+        rug_check_timeout: float = None
+    ):
+        """
+        Initialize enricher
+
+        Args:
+            token_service: TokenMetadataService (the shared detector's if omitted)
+            rug_detector: RugDetector (the shared one, or one built on token_service)
+            metadata_timeout: Deadline in seconds for the metadata stage
+            rug_check_timeout: Deadline in seconds for the rug-check stage
+        """
+        self._token_service = token_service
+        self._rug_detector = rug_detector
+        self.metadata_timeout = metadata_timeout or settings.enrichment_metadata_timeout_seconds
+        self.rug_check_timeout = rug_check_timeout or settings.enrichment_rug_check_timeout_seconds
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    @property
+    def token_service(self):
+        if self._token_service is None:
+            self._token_service = self.rug_detector.token_service
+        return self._token_service
+
+    @property
+    def rug_detector(self):
+        if self._rug_detector is None:
+            # Lazy import to avoid circular dependencies
+            from alphapulse.services.rug_detector import RugDetector, get_rug_detector
+            if self._token_service is None:
+                self._rug_detector = get_rug_detector()
+            else:
+                self._rug_detector = RugDetector(self._token_service)
+        return self._rug_detector
+
+    async def enrich_many(self, contract_addresses: list[str]) -> dict[str, Enrichment]:
+        """
+        Enrich several tokens concurrently
+
+        Returns:
+            Mapping of contract address -> Enrichment (one per distinct mint)
+        """
+        mints = list(dict.fromkeys(contract_addresses))
+        results = await asyncio.gather(*(self.enrich(mint) for mint in mints))
+        return dict(zip(mints, results))
+
+    async def enrich(self, contract_address: str) -> Enrichment:
+        """Enrich one token, joining an in-flight enrichment of the same mint"""
+        task = self._inflight.get(contract_address)
+        if task is None:
+            task = asyncio.ensure_future(self._enrich(contract_address))
+            self._inflight[contract_address] = task
+            task.add_done_callback(lambda t: self._forget(contract_address, t))
+        # Shielded so one caller's cancellation doesn't cancel the others' work
+        return await asyncio.shield(task)
+
+    def _forget(self, contract_address: str, task: asyncio.Task):
+        if self._inflight.get(contract_address) is task:
+            del self._inflight[contract_address]
+
+    async def _enrich(self, contract_address: str) -> Enrichment:
+        enrichment = Enrichment(contract_address=contract_address)
+
+        # Stage 1: metadata
+        try:
+            enrichment.metadata = await asyncio.wait_for(
+                self.token_service.get_token_metadata(contract_address),
+                timeout=self.metadata_timeout
+            )
+        except asyncio.TimeoutError:
+            enrichment.timed_out.append('metadata')
+            logger.warning(f"Metadata for {contract_address[:8]}... timed out after {self.metadata_timeout}s")
+            return enrichment
+        except Exception as e:
+            logger.error(f"Error fetching metadata for {contract_address[:8]}...: {e}")
+            return enrichment
+
+        # Stage 2: rug check, reusing the metadata
+        try:
+            enrichment.rug_result = await asyncio.wait_for(
+                self.rug_detector.check_token(contract_address, metadata=enrichment.metadata),
+                timeout=self.rug_check_timeout
+            )
+        except asyncio.TimeoutError:
+            enrichment.timed_out.append('rug_check')
+            logger.warning(f"Rug check for {contract_address[:8]}... timed out after {self.rug_check_timeout}s")
+        except Exception as e:
+            logger.error(f"Error in rug check for {contract_address[:8]}...: {e}")
+
+        return enrichment
+
+
+# Global instance
+_signal_enricher: Optional[SignalEnricher] = None
+
+
+def get_signal_enricher() -> SignalEnricher:
+    """Get global signal enricher instance"""
+    global _signal_enricher
+    if _signal_enricher is None:
+        _signal_enricher = SignalEnricher()
+    return _signal_enricher
@@ -6,43 +6,52 @@ With integrated rug detection and token metadata enrichment
 
 import json
 import asyncio
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, replace
 from typing import Optional
 from enum import Enum
 
+from sqlalchemy import bindparam, delete, inspect, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from alphapulse.db.identity_cache import TokenRef, WalletRef, get_identity_cache
+
 from alphapulse.db.models import (
     SmartWallet, Token, Trade, Alert, ClusterEvent,
     WalletRepository, TradeRepository
 )
+from alphapulse.processors.signal_windows import SignalWindows, get_signal_windows
+from alphapulse.processors.signal_enricher import Enrichment, get_signal_enricher
+from alphapulse.processors.cluster_state import (
+    ClusterPhase, ClusterState, ClusterStateMachine, ClusterTransition, get_cluster_states
+)
 from alphapulse.config import settings
 from alphapulse.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Lazy imports to avoid circular dependencies
-_rug_detector = None
-_token_service = None
+# Per-row bulk updates for flush_pending(); rows whose target is gone are
+# skipped rather than failing the payload
+_UPDATE_WALLET_ACTIVITY = update(SmartWallet.__table__).where(SmartWallet.__table__.c.id == bindparam('b_id'))
+_UPDATE_CLUSTER_EVENT = update(ClusterEvent.__table__).where(ClusterEvent.__table__.c.id == bindparam('b_id'))
 
+# SQLite allows one writer per database; payload transactions from
+# different threads take turns on this per-engine lock (see unit_of_work())
+_sqlite_write_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_sqlite_write_locks_lock = threading.Lock()
 
-def _get_rug_detector():
-    """Lazy load rug detector"""
-    global _rug_detector
-    if _rug_detector is None:
-        from alphapulse.services.rug_detector import RugDetector
-        _rug_detector = RugDetector()
-    return _rug_detector
 
-
-def _get_token_service():
-    """Lazy load token metadata service"""
-    global _token_service
-    if _token_service is None:
-        from alphapulse.services.token_metadata import TokenMetadataService
-        _token_service = TokenMetadataService()
-    return _token_service
+def _sqlite_write_lock(engine) -> threading.Lock:
+    """The writer lock shared by all sessions bound to a SQLite engine"""
+    with _sqlite_write_locks_lock:
+        lock = _sqlite_write_locks.get(engine)
+        if lock is None:
+            lock = _sqlite_write_locks[engine] = threading.Lock()
+        return lock
 
 
 class SignalType(Enum):
@@ -57,7 +66,7 @@ class SignalResult:
     """Result of signal detection"""
     triggered: bool
     signal_type: SignalType
-    token: Optional[Token] = None
+    token: Optional[TokenRef] = None
     trades: list = None
     wallets: list = None
     total_sol: float = 0.0
@@ -91,10 +100,53 @@ class SignalProcessor:
     3. Volume Spike: New token (<60 min) with 5-min volume >10% of mcap
     """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        use_signal_windows: Optional[bool] = None,
+        use_cluster_hysteresis: Optional[bool] = None
+    ):
+        """
+        Initialize processor
+
+        Args:
+            session: Database session
+            use_signal_windows: Run window-based checks from the in-memory
+                                SignalWindows instead of querying trades
+                                (defaults to settings)
+            use_cluster_hysteresis: Alert once per cluster episode and
+                                    update its ClusterEvent in place
+                                    (defaults to settings)
+        """
         self.session = session
         self.wallet_repo = WalletRepository(session)
         self.trade_repo = TradeRepository(session)
+        self.identity_cache = get_identity_cache()
+
+        if use_signal_windows is None:
+            use_signal_windows = settings.signal_windows_enabled
+        self.windows: Optional[SignalWindows] = get_signal_windows() if use_signal_windows else None
+
+        if use_cluster_hysteresis is None:
+            use_cluster_hysteresis = settings.cluster_hysteresis_enabled
+        self.cluster_states: Optional[ClusterStateMachine] = (
+            get_cluster_states() if use_cluster_hysteresis else None
+        )
+        # Lazy imports to avoid circular dependencies
+        from alphapulse.services.price_history import get_price_history
+        from alphapulse.services.sol_price import get_sol_price_ticker
+        self.price_history = get_price_history()
+        self.sol_price = get_sol_price_ticker()
+        self.outcome_scheduler = None
+        if settings.outcome_scheduler_enabled:
+            from alphapulse.services.outcome_scheduler import get_outcome_scheduler
+            self.outcome_scheduler = get_outcome_scheduler()
+        self.wallet_stats = None
+        if settings.wallet_stats_enabled:
+            from alphapulse.services.conviction_calculator import ConvictionCalculator
+            from alphapulse.services.wallet_stats import WalletStatsTracker
+            self.wallet_stats = WalletStatsTracker(session)
+            self.conviction = ConvictionCalculator(session)
 
         # Load thresholds from config
         self.high_conviction_min_sol = settings.high_conviction_min_sol
@@ -105,6 +157,237 @@ class SignalProcessor:
         self.volume_spike_threshold = settings.volume_spike_threshold
         self.new_token_max_age = settings.new_token_max_age_minutes
 
+        # Unit-of-work state (see unit_of_work())
+        self.autocommit = True
+        self._uow_tokens: dict[str, Token] = {}
+        self._uow_token_cas: set[str] = set()
+        self._uow_signatures: set[str] = set()
+        self._uow_signatures_loaded: set[str] = set()
+        self._uow_window_buys: dict[str, tuple] = {}  # tx_signature -> (token_id, block_time, sol)
+        self._uow_touched_tokens: set[str] = set()
+        self._uow_cluster_undos: dict[str, tuple] = {}  # tx_signature -> (token_id, ClusterUndo)
+        self._uow_wallet_scores: dict[str, str] = {}  # tx_signature -> rescored wallet address
+        self._uow_prices: dict[str, tuple] = {}  # tx_signature -> (mint, price, ts) recorded on commit
+        # Writes deferred to flush_pending() (see _deferring)
+        self._uow_trades: dict[str, dict] = {}  # tx_signature -> Trade row
+        self._uow_wallet_updates: dict[str, tuple] = {}  # tx_signature -> (WalletRef, changes)
+        self._uow_cluster_rows: dict[str, dict] = {}  # tx_signature -> ClusterEvent row
+        self._uow_cluster_fires: dict[int, ClusterState] = {}  # token_id -> episode without an event yet
+        self._uow_cluster_updates: dict[int, ClusterState] = {}  # token_id -> episode whose event changed
+        self._uow_cluster_details: dict[int, list] = {}  # token_id -> signal details awaiting the event id
+
+    def _commit(self):
+        """Commit now, or just flush when running inside a unit of work"""
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
+
+    @property
+    def _deferring(self) -> bool:
+        """
+        Whether trade and cluster writes wait for flush_pending()
+
+        Only inside a unit of work with SignalWindows, whose checks never
+        read the trades table; the query-based checks need rows written.
+        """
+        return not self.autocommit and self.windows is not None
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Defer all commits until the block exits
+
+        Inside the block tokens and alerts are only flushed, while trades,
+        cluster events and wallet activity are collected and written in
+        bulk by flush_pending() (see _deferring); a single commit happens
+        on exit (rollback on error). Use session.begin_nested() inside it
+        to isolate individual events. On SQLite the block holds the
+        engine's writer lock throughout, so units of work on other threads
+        wait instead of failing with "database is locked".
+        """
+        with self._sqlite_transaction():
+            self.autocommit = False
+            try:
+                yield self
+                self.flush_pending()
+                self.session.commit()
+                for mint, price, ts in self._uow_prices.values():
+                    self.price_history.record(mint, price, ts)
+            except Exception:
+                self.session.rollback()
+                touched = (
+                    self._uow_window_buys.keys() | self._uow_cluster_undos.keys() | self._uow_wallet_scores.keys()
+                )
+                for tx_signature in list(touched):
+                    self.discard_event(tx_signature)
+                for contract_address in self._uow_touched_tokens:
+                    self.identity_cache.invalidate_token(contract_address)
+                raise
+            finally:
+                self.autocommit = True
+                if self.wallet_stats:
+                    self.wallet_stats.clear()
+                self._uow_tokens.clear()
+                self._uow_token_cas.clear()
+                self._uow_signatures.clear()
+                self._uow_signatures_loaded.clear()
+                self._uow_window_buys.clear()
+                self._uow_touched_tokens.clear()
+                self._uow_cluster_undos.clear()
+                self._uow_wallet_scores.clear()
+                self._uow_prices.clear()
+                self._uow_trades.clear()
+                self._uow_wallet_updates.clear()
+                self._uow_cluster_rows.clear()
+                self._uow_cluster_fires.clear()
+                self._uow_cluster_updates.clear()
+                self._uow_cluster_details.clear()
+
+    def flush_pending(self):
+        """
+        Write the rows a unit of work has deferred so far
+
+        Trades and new cluster events go in one INSERT each, and wallet
+        activity and changed episodes in one UPDATE per wallet / event
+        with their final values. Wallet stats are written the same way,
+        and each traded wallet is rescored once. New episodes get their
+        event ids, which are also filled into the cluster signal details
+        waiting on them.
+        Call before creating alerts for the payload.
+        """
+        if self._uow_trades:
+            self.session.execute(insert(Trade), list(self._uow_trades.values()))
+            self._uow_trades.clear()
+
+        if self._uow_wallet_updates:
+            wallets, refs = {}, {}
+            for wallet, changes in self._uow_wallet_updates.values():
+                wallets.setdefault(wallet.id, {'b_id': wallet.id}).update(changes)
+                refs[wallet.id] = wallet
+            if self.wallet_stats:
+                for wallet_id, aggregates in self.wallet_stats.flush().items():
+                    if wallet_id in refs:
+                        score = self.conviction.calculate_score(refs[wallet_id], aggregates)
+                        wallets[wallet_id]['conviction_score'] = score
+                        self.identity_cache.put_wallet(replace(refs[wallet_id], conviction_score=score))
+            self.session.execute(_UPDATE_WALLET_ACTIVITY, list(wallets.values()))
+            self._uow_wallet_updates.clear()
+
+        fires = list(self._uow_cluster_fires.items())
+        rows = list(self._uow_cluster_rows.values()) + [
+            {'token_id': token_id, **self._episode_values(state)} for token_id, state in fires
+        ]
+        if rows:
+            event_ids = self.session.scalars(
+                insert(ClusterEvent).returning(ClusterEvent.id, sort_by_parameter_order=True), rows
+            ).all()
+            for (token_id, state), event_id in zip(fires, event_ids[len(self._uow_cluster_rows):]):
+                self.cluster_states.set_event_id(token_id, event_id)
+                for details in self._uow_cluster_details.pop(token_id, []):
+                    details['cluster_event_id'] = event_id
+            self._uow_cluster_rows.clear()
+            self._uow_cluster_fires.clear()
+
+        if self._uow_cluster_updates:
+            self.session.execute(_UPDATE_CLUSTER_EVENT, [
+                {'b_id': state.event_id, **self._episode_values(state)}
+                for state in self._uow_cluster_updates.values()
+            ])
+            self._uow_cluster_updates.clear()
+
+    def discard_event(self, tx_signature: str, token_ca: Optional[str] = None):
+        """
+        Forget in-memory state for a buy whose savepoint was rolled back
+
+        Only needed inside a unit of work; outside one, windows are fed
+        after the commit succeeds.
+        """
+        if token_ca:
+            # The snapshot may describe a row or values that were rolled back
+            self.identity_cache.invalidate_token(token_ca)
+        buy = self._uow_window_buys.pop(tx_signature, None)
+        if buy is not None and self.windows:
+            token_id, block_time, sol_amount = buy
+            self.windows.discard_buy(token_id, tx_signature, block_time, sol_amount)
+        cluster = self._uow_cluster_undos.pop(tx_signature, None)
+        if cluster is not None and self.cluster_states:
+            token_id, undo = cluster
+            self.cluster_states.restore(token_id, undo)
+            if undo.phase == ClusterPhase.ARMED:
+                # The episode this buy started is gone, and so is its event
+                self._uow_cluster_fires.pop(token_id, None)
+        self._uow_prices.pop(tx_signature, None)
+        if self.wallet_stats:
+            self.wallet_stats.discard(tx_signature)
+        self._uow_trades.pop(tx_signature, None)
+        self._uow_wallet_updates.pop(tx_signature, None)
+        self._uow_cluster_rows.pop(tx_signature, None)
+        wallet_address = self._uow_wallet_scores.pop(tx_signature, None)
+        if wallet_address is not None:
+            # The cached score came from rolled-back wallet stats
+            self.identity_cache.invalidate_wallet(wallet_address)
+
+    @contextmanager
+    def _sqlite_transaction(self):
+        """
+        Take the engine's writer lock and open a write transaction on SQLite
+
+        pysqlite only emits BEGIN lazily before DML, so releasing a
+        SAVEPOINT opened outside a transaction would commit it on the spot.
+        A deferred BEGIN would also upgrade to a write lock mid-payload,
+        which fails at once if another connection is writing; BEGIN
+        IMMEDIATE takes it up front (waiting out the busy timeout).
+        Other dialects pass straight through.
+        """
+        conn = self.session.connection()
+        if conn.dialect.name != 'sqlite':
+            yield
+            return
+        with _sqlite_write_lock(conn.engine):
+            if not conn.connection.dbapi_connection.in_transaction:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+            yield
+
+    def prefetch(self, token_cas: list[str], tx_signatures: list[str], wallet_addresses: list[str] = ()):
+        """
+        Bulk-load tokens, already-recorded signatures and wallet stats for a unit of work
+
+        Replaces one token SELECT and one trade SELECT per event with one
+        IN query each for the whole payload. Tokens already in the identity
+        cache are not loaded at all. With live wallet stats, the buyers'
+        stats and positions in the payload's tokens are loaded too, so
+        recording a trade needs no query.
+        """
+        if self.autocommit:
+            return
+
+        token_cas = set(token_cas)
+        missing = {
+            ca for ca in token_cas - self._uow_token_cas
+            if self.identity_cache.get_token(ca) is None
+        }
+        if missing:
+            for token in self.session.query(Token).filter(Token.contract_address.in_(missing)):
+                self._uow_tokens[token.contract_address] = token
+            self._uow_token_cas.update(missing)
+
+        tx_signatures = set(tx_signatures) - self._uow_signatures_loaded
+        if tx_signatures:
+            rows = self.session.query(Trade.tx_signature).filter(
+                Trade.tx_signature.in_(tx_signatures)
+            )
+            self._uow_signatures.update(r[0] for r in rows)
+            self._uow_signatures_loaded.update(tx_signatures)
+
+        if self.wallet_stats and self._deferring and wallet_addresses:
+            wallets = (self.wallet_repo.get_ref(address) for address in set(wallet_addresses))
+            tokens = (self.identity_cache.get_token(ca) or self._uow_tokens.get(ca) for ca in token_cas)
+            self.wallet_stats.prefetch(
+                [w.id for w in wallets if w is not None],
+                [t.id for t in tokens if t is not None]
+            )
+
     def process_buy_event(
         self,
         wallet_address: str,
@@ -134,8 +417,8 @@ class SignalProcessor:
         """
         signals = []
 
-        # Get or create wallet record
-        wallet = self.wallet_repo.get_by_address(wallet_address)
+        # Wallet snapshot (cached; no query for known wallets)
+        wallet = self.wallet_repo.get_ref(wallet_address)
         if not wallet:
             logger.debug(f"Unknown wallet {wallet_address[:8]}..., skipping")
             return signals
@@ -167,7 +450,7 @@ class SignalProcessor:
             logger.info(f"HIGH CONVICTION: {wallet.address[:8]}... bought {supply_pct:.2f}% of {token.symbol}")
 
         # Check Signal 2: Cluster Buying
-        cluster_signal = self._check_cluster_buying(token)
+        cluster_signal = self._check_cluster_buying(token, tx_signature)
         if cluster_signal.triggered:
             signals.append(cluster_signal)
             logger.info(f"CLUSTER BUY: {cluster_signal.details.get('wallet_count')} wallets on {token.symbol}")
@@ -183,9 +466,9 @@ class SignalProcessor:
 
     def _check_high_conviction(
         self,
-        wallet: SmartWallet,
+        wallet: WalletRef,
         trade: Trade,
-        token: Token,
+        token: TokenRef,
         supply_pct: float,
         sol_amount: float
     ) -> SignalResult:
@@ -216,23 +499,39 @@ class SignalProcessor:
             }
         )
 
-    def _check_cluster_buying(self, token: Token) -> SignalResult:
+    def _check_cluster_buying(self, token: TokenRef, tx_signature: Optional[str] = None) -> SignalResult:
         """
         Check Cluster Buying condition:
         - 2+ tracked wallets purchase same token
         - Within 5-minute window
         - Minimum 0.5 SOL each
+
+        Uses the in-memory SignalWindows when enabled; the trades-table
+        query is kept as the reference implementation. With hysteresis
+        enabled only the first cluster of an episode and material
+        escalations trigger; see ClusterStateMachine.
         """
-        is_cluster, trades = self.trade_repo.check_cluster_condition(
-            token_id=token.id,
-            min_wallets=self.cluster_min_wallets,
-            window_mins=self.cluster_window_mins,
-            min_sol=self.cluster_min_sol
-        )
+        if self.windows:
+            trades = self.windows.check_cluster(token.id, self.cluster_min_wallets)
+            is_cluster = trades is not None
+        else:
+            is_cluster, trades = self.trade_repo.check_cluster_condition(
+                token_id=token.id,
+                min_wallets=self.cluster_min_wallets,
+                window_mins=self.cluster_window_mins,
+                min_sol=self.cluster_min_sol
+            )
 
         if not is_cluster:
+            if self.cluster_states:
+                self.cluster_states.cool_down(token.id)
             return SignalResult(triggered=False, signal_type=SignalType.CLUSTER_BUY)
 
+        if self.windows:
+            wallets_by_id = self._load_wallets(trades)
+        else:
+            wallets_by_id = {t.wallet_id: t.wallet for t in trades}
+
         # Gather wallet details
         wallets = []
         wallet_addresses = []
@@ -240,14 +539,34 @@ class SignalProcessor:
         max_supply = 0.0
 
         for trade in trades:
-            if trade.wallet.address not in wallet_addresses:
-                wallet_addresses.append(trade.wallet.address)
-                wallets.append(trade.wallet)
+            wallet = wallets_by_id.get(trade.wallet_id)
+            if wallet is not None and wallet.address not in wallet_addresses:
+                wallet_addresses.append(wallet.address)
+                wallets.append(wallet)
             total_sol += trade.sol_amount
             max_supply = max(max_supply, trade.supply_percentage or 0)
 
-        # Record cluster event
-        self._record_cluster_event(token, trades)
+        details = {
+            'wallet_count': len(wallets),
+            'wallet_addresses': wallet_addresses,
+            'avg_win_rate': sum(w.win_rate for w in wallets) / len(wallets),
+            'window_minutes': self.cluster_window_mins
+        }
+
+        if self.cluster_states is None:
+            # Record cluster event
+            self._record_cluster_event(token, trades, wallet_addresses, tx_signature=tx_signature)
+        else:
+            transition, state = self._advance_cluster_state(token, trades, wallet_addresses, tx_signature)
+            if transition in (ClusterTransition.UPDATE, ClusterTransition.NONE):
+                return SignalResult(triggered=False, signal_type=SignalType.CLUSTER_BUY)
+            details['cluster_event_id'] = state.event_id
+            if state.event_id is None and token.id in self._uow_cluster_fires:
+                # Filled in when flush_pending() writes the episode's event
+                self._uow_cluster_details.setdefault(token.id, []).append(details)
+            if transition == ClusterTransition.ESCALATE:
+                details['escalation'] = True
+                details['episode_wallet_count'] = len(state.addresses)
 
         return SignalResult(
             triggered=True,
@@ -257,15 +576,62 @@ class SignalProcessor:
             wallets=wallets,
             total_sol=total_sol,
             max_supply_pct=max_supply,
-            details={
-                'wallet_count': len(wallets),
-                'wallet_addresses': wallet_addresses,
-                'avg_win_rate': sum(w.win_rate for w in wallets) / len(wallets),
-                'window_minutes': self.cluster_window_mins
-            }
+            details=details
         )
 
-    def _check_volume_spike(self, token: Token) -> SignalResult:
+    def _advance_cluster_state(
+        self,
+        token: TokenRef,
+        trades: list,
+        addresses: list[str],
+        tx_signature: Optional[str]
+    ) -> tuple[ClusterTransition, ClusterState]:
+        """Feed a met cluster condition to the state machine and persist the episode"""
+        transition, state, undo = self.cluster_states.observe(token.id, trades, addresses)
+        try:
+            if transition == ClusterTransition.FIRE and self._deferring and tx_signature:
+                self._uow_cluster_fires[token.id] = state
+            elif transition == ClusterTransition.FIRE:
+                cluster = self._record_cluster_event(
+                    token, trades, state.addresses,
+                    total_sol=state.total_sol,
+                    first_buy_at=state.first_buy_at,
+                    last_buy_at=state.last_buy_at
+                )
+                self.cluster_states.set_event_id(token.id, cluster.id)
+            elif transition != ClusterTransition.NONE and state.event_id is not None:
+                if self._deferring:
+                    self._uow_cluster_updates[token.id] = state
+                else:
+                    self._update_cluster_event(state)
+        except Exception:
+            self.cluster_states.restore(token.id, undo)
+            raise
+
+        if not self.autocommit and tx_signature:
+            self._uow_cluster_undos[tx_signature] = (token.id, undo)
+        return transition, state
+
+    def _load_wallets(self, entries: list) -> dict[int, WalletRef]:
+        """Wallet snapshots for window entries (cache first, misses in one query)"""
+        wallets_by_id = {}
+        missing = set()
+        for entry in entries:
+            if entry.wallet_id in wallets_by_id:
+                continue
+            ref = self.identity_cache.get_wallet(entry.wallet_address)
+            if ref is not None:
+                wallets_by_id[ref.id] = ref
+            else:
+                missing.add(entry.wallet_id)
+
+        missing -= wallets_by_id.keys()
+        if missing:
+            for wallet in self.session.query(SmartWallet).filter(SmartWallet.id.in_(missing)):
+                wallets_by_id[wallet.id] = self.identity_cache.put_wallet(wallet)
+        return wallets_by_id
+
+    def _check_volume_spike(self, token: TokenRef) -> SignalResult:
         """
         Check Volume Spike condition:
         - Token age < 60 minutes
@@ -274,20 +640,24 @@ class SignalProcessor:
         if token.age_minutes() > self.new_token_max_age:
             return SignalResult(triggered=False, signal_type=SignalType.VOLUME_SPIKE)
 
-        # Calculate 5-minute volume from recent trades
-        five_min_ago = datetime.utcnow() - timedelta(minutes=5)
-        recent_trades = self.session.query(Trade).filter(
-            Trade.token_id == token.id,
-            Trade.trade_type == 'BUY',
-            Trade.block_time >= five_min_ago
-        ).all()
-
-        volume_5m = sum(t.sol_amount for t in recent_trades)
         market_cap = token.market_cap_sol or 0
 
         if market_cap <= 0:
             return SignalResult(triggered=False, signal_type=SignalType.VOLUME_SPIKE)
 
+        # 5-minute volume: constant-time lookup, or summed from recent trades
+        if self.windows:
+            recent_trades = []
+            volume_5m = self.windows.volume(token.id)
+        else:
+            five_min_ago = datetime.utcnow() - timedelta(minutes=5)
+            recent_trades = self.session.query(Trade).filter(
+                Trade.token_id == token.id,
+                Trade.trade_type == 'BUY',
+                Trade.block_time >= five_min_ago
+            ).all()
+            volume_5m = sum(t.sol_amount for t in recent_trades)
+
         volume_ratio = volume_5m / market_cap
 
         triggered = volume_ratio >= self.volume_spike_threshold
@@ -312,13 +682,24 @@ class SignalProcessor:
         contract_address: str,
         market_cap: Optional[float],
         total_supply: Optional[float]
-    ) -> Token:
-        """Get existing token or create new one"""
-        token = self.session.query(Token).filter(
-            Token.contract_address == contract_address
-        ).first()
+    ) -> TokenRef:
+        """
+        Get existing token or create new one
 
-        if not token:
+        Known tokens come from the identity cache without a query, and
+        market data is only written when it actually changed. A new mint
+        is inserted in a savepoint: if a concurrent writer created it
+        first, the insert's IntegrityError is rolled back alone and that
+        writer's row is used instead.
+        """
+        if not self.autocommit:
+            self._uow_touched_tokens.add(contract_address)
+
+        ref = self.identity_cache.get_token(contract_address)
+        if ref is None:
+            ref = self._load_token(contract_address)
+
+        if ref is None:
             token = Token(
                 contract_address=contract_address,
                 market_cap_sol=market_cap,
@@ -326,22 +707,57 @@ class SignalProcessor:
                 platform='unknown',  # Will be determined from tx
                 launched_at=datetime.utcnow()  # Approximate
             )
-            self.session.add(token)
-            self.session.commit()
+            try:
+                with self.session.begin_nested():
+                    self.session.add(token)
+                if self.wallet_stats:
+                    self.wallet_stats.new_token(token.id)
+            except IntegrityError:
+                token = self.session.query(Token).filter(
+                    Token.contract_address == contract_address
+                ).one()
+                logger.debug(f"Token {contract_address[:8]}... created concurrently, using its row")
+            self._commit()
+            if not self.autocommit:
+                self._uow_tokens[contract_address] = token
+                self._uow_token_cas.add(contract_address)
+            ref = self.identity_cache.put_token(token)
+
+        # Update market data (skipped when nothing changed)
+        changes = {}
+        if market_cap and market_cap != ref.market_cap_sol:
+            changes['market_cap_sol'] = market_cap
+        if total_supply and total_supply != ref.total_supply:
+            changes['total_supply'] = total_supply
+        if changes:
+            self.session.query(Token).filter(Token.id == ref.id).update(
+                changes, synchronize_session=False
+            )
+            self._commit()
+            ref = self.identity_cache.put_token(replace(ref, **changes))
+
+        return ref
+
+    def _load_token(self, contract_address: str) -> Optional[TokenRef]:
+        """Load a token snapshot from the prefetch map or the database"""
+        if contract_address in self._uow_token_cas:
+            # Prefetched; a token added in a rolled-back savepoint is gone again
+            token = self._uow_tokens.get(contract_address)
+            if token is not None and not inspect(token).persistent:
+                token = None
         else:
-            # Update market data
-            if market_cap:
-                token.market_cap_sol = market_cap
-            if total_supply:
-                token.total_supply = total_supply
-            self.session.commit()
+            token = self.session.query(Token).filter(
+                Token.contract_address == contract_address
+            ).first()
 
-        return token
+        if token is None:
+            return None
+        return self.identity_cache.put_token(token)
 
     def _record_trade(
         self,
-        wallet: SmartWallet,
-        token: Token,
+        wallet: WalletRef,
+        token: TokenRef,
         sol_amount: float,
         token_amount: float,
         supply_pct: float,
@@ -349,16 +765,21 @@ class SignalProcessor:
         block_time: datetime,
         market_cap: Optional[float]
     ) -> Trade:
-        """Record a trade in the database"""
-        # Check if trade already exists
-        existing = self.session.query(Trade).filter(
-            Trade.tx_signature == tx_signature
-        ).first()
+        """Record a trade in the database (deferred to flush_pending() when _deferring)"""
+        pending = self._uow_trades.get(tx_signature)
+        if pending is not None:
+            return Trade(**pending)
+
+        # Check if trade already exists (skipped when prefetch proved it doesn't)
+        if tx_signature not in self._uow_signatures_loaded or tx_signature in self._uow_signatures:
+            existing = self.session.query(Trade).filter(
+                Trade.tx_signature == tx_signature
+            ).first()
 
-        if existing:
-            return existing
+            if existing:
+                return existing
 
-        trade = Trade(
+        row = dict(
             wallet_id=wallet.id,
             token_id=token.id,
             tx_signature=tx_signature,
@@ -369,33 +790,124 @@ class SignalProcessor:
             mcap_at_trade=market_cap,
             block_time=block_time
         )
-        self.session.add(trade)
-        self.session.commit()
-
-        # Update wallet activity
-        wallet.last_activity = block_time
-        self.session.commit()
+        trade = Trade(**row)
+        if self._deferring:
+            self._uow_trades[tx_signature] = row
+        else:
+            self.session.add(trade)
+
+        # Update wallet activity and, with live wallet stats, its
+        # conviction score (no need to load the row). When deferring,
+        # stats and scores are settled once per wallet in flush_pending()
+        changes = {'last_activity': block_time}
+        if self.wallet_stats:
+            self.wallet_stats.record_trade(
+                wallet.id, token.id, 'BUY', sol_amount, block_time,
+                mcap=market_cap, launched_at=token.launched_at,
+                tx_signature=tx_signature if self._deferring else None
+            )
+            if not self.autocommit:
+                self._uow_wallet_scores[tx_signature] = wallet.address
+        if self._deferring:
+            self._uow_wallet_updates[tx_signature] = (wallet, changes)
+        else:
+            if self.wallet_stats:
+                aggregates = self.wallet_stats.flush()[wallet.id]
+                changes['conviction_score'] = self.conviction.calculate_score(wallet, aggregates)
+                self.identity_cache.put_wallet(replace(wallet, conviction_score=changes['conviction_score']))
+            self.session.query(SmartWallet).filter(SmartWallet.id == wallet.id).update(
+                changes, synchronize_session=False
+            )
+            self._commit()
+        if not self.autocommit:
+            self._uow_signatures.add(tx_signature)
+
+        # Feed the price history (swap price in SOL, converted once the
+        # SOL price is known); inside a unit of work only once it commits
+        if token_amount > 0 and not self.sol_price.is_fallback:
+            point = (
+                token.contract_address,
+                sol_amount / token_amount * self.sol_price.price,
+                block_time.replace(tzinfo=timezone.utc).timestamp()
+            )
+            if self.autocommit:
+                self.price_history.record(*point)
+            else:
+                self._uow_prices[tx_signature] = point
+
+        # Feed in-memory signal windows
+        if self.windows:
+            self.windows.record_buy(
+                token_id=token.id,
+                wallet_id=wallet.id,
+                wallet_address=wallet.address,
+                sol_amount=sol_amount,
+                supply_pct=supply_pct,
+                tx_signature=tx_signature,
+                block_time=block_time,
+                launched_at=token.launched_at
+            )
+            if not self.autocommit:
+                self._uow_window_buys[tx_signature] = (token.id, block_time, sol_amount)
 
         return trade
 
-    def _record_cluster_event(self, token: Token, trades: list[Trade]) -> ClusterEvent:
-        """Record a cluster buying event"""
-        addresses = list(set(t.wallet.address for t in trades))
+    def _record_cluster_event(
+        self,
+        token: TokenRef,
+        trades: list,
+        addresses: list[str],
+        total_sol: Optional[float] = None,
+        first_buy_at: Optional[datetime] = None,
+        last_buy_at: Optional[datetime] = None,
+        tx_signature: Optional[str] = None
+    ) -> Optional[ClusterEvent]:
+        """
+        Record a cluster buying event (trades may be Trade rows or WindowEntry items)
+
+        Returns None when the row is deferred to flush_pending().
+        """
         block_times = [t.block_time for t in trades]
+        first_buy_at = first_buy_at or min(block_times)
+        last_buy_at = last_buy_at or max(block_times)
 
-        cluster = ClusterEvent(
+        row = dict(
             token_id=token.id,
             wallet_addresses=json.dumps(addresses),
             wallet_count=len(addresses),
-            total_sol=sum(t.sol_amount for t in trades),
-            first_buy_at=min(block_times),
-            last_buy_at=max(block_times),
-            window_seconds=int((max(block_times) - min(block_times)).total_seconds())
+            total_sol=sum(t.sol_amount for t in trades) if total_sol is None else total_sol,
+            first_buy_at=first_buy_at,
+            last_buy_at=last_buy_at,
+            window_seconds=int((last_buy_at - first_buy_at).total_seconds())
         )
+        if self._deferring and tx_signature:
+            self._uow_cluster_rows[tx_signature] = row
+            return None
+
+        cluster = ClusterEvent(**row)
         self.session.add(cluster)
-        self.session.commit()
+        self._commit()
         return cluster
 
+    def _update_cluster_event(self, state: ClusterState):
+        """Bring an episode's ClusterEvent up to date without loading it"""
+        self.session.query(ClusterEvent).filter(ClusterEvent.id == state.event_id).update(
+            self._episode_values(state), synchronize_session=False
+        )
+        self._commit()
+
+    @staticmethod
+    def _episode_values(state: ClusterState) -> dict:
+        """ClusterEvent columns describing an episode"""
+        return {
+            'wallet_addresses': json.dumps(state.addresses),
+            'wallet_count': len(state.addresses),
+            'total_sol': state.total_sol,
+            'first_buy_at': state.first_buy_at,
+            'last_buy_at': state.last_buy_at,
+            'window_seconds': int((state.last_buy_at - state.first_buy_at).total_seconds())
+        }
+
     async def enrich_and_validate_signal(self, signal: SignalResult) -> SignalResult:
         """
         Enrich signal with token metadata and perform rug check
@@ -410,52 +922,126 @@ class SignalProcessor:
             return signal
 
         try:
-            # Fetch fresh token metadata
-            token_service = _get_token_service()
-            metadata = await token_service.get_token_metadata(signal.token.contract_address)
+            enrichment = await get_signal_enricher().enrich(signal.token.contract_address)
 
             # Update token record with fresh data
-            if metadata.name:
-                signal.token.name = metadata.name
-            if metadata.symbol:
-                signal.token.symbol = metadata.symbol
-            if metadata.market_cap_sol > 0:
-                signal.token.market_cap_sol = metadata.market_cap_sol
-            if metadata.liquidity_sol > 0:
-                signal.token.liquidity_sol = metadata.liquidity_sol
-            if metadata.total_supply > 0:
-                signal.token.total_supply = metadata.total_supply
+            if enrichment.metadata:
+                token = self.session.get(Token, signal.token.id)
+                if token is not None:
+                    self._update_token_metadata(token, enrichment.metadata)
+                    self.session.commit()
+                    signal.token = self.identity_cache.put_token(token)
+
+            rug_result = enrichment.rug_result
+            if rug_result:
+                signal.rug_checked = True
+                signal.rug_passed = rug_result.passed
+                signal.rug_risk_score = rug_result.risk_score
+                signal.rug_warnings = rug_result.warnings
+
+                # Add rug info to details
+                signal.details['rug_check'] = self._rug_check_summary(rug_result)
+
+                if not rug_result.passed:
+                    logger.warning(
+                        f"Rug check FAILED for {signal.token.contract_address[:8]}...: "
+                        f"score={rug_result.risk_score}, warnings={rug_result.warnings}"
+                    )
 
-            self.session.commit()
+        except Exception as e:
+            logger.error(f"Error enriching signal: {e}")
+            # Continue without enrichment rather than failing
 
-            # Perform rug check
-            rug_detector = _get_rug_detector()
-            rug_result = await rug_detector.check_token(signal.token.contract_address)
+        return signal
 
-            signal.rug_checked = True
-            signal.rug_passed = rug_result.passed
-            signal.rug_risk_score = rug_result.risk_score
-            signal.rug_warnings = rug_result.warnings
+    def apply_enrichment(
+        self,
+        alert: Alert,
+        enrichment: Enrichment,
+        skip_rug_failed: bool = True
+    ) -> Optional[Alert]:
+        """
+        Write enrichment results to an already-created alert and its token
+
+        Args:
+            alert: Unsent alert from the webhook path
+            enrichment: Result of SignalEnricher for the alert's token
+            skip_rug_failed: If True, drop the alert when the rug check failed
+
+        Returns:
+            The alert, or None if it was dropped
+        """
+        if enrichment.metadata and alert.token is not None:
+            self._update_token_metadata(alert.token, enrichment.metadata)
+            self.identity_cache.put_token(alert.token)
+
+        rug_result = enrichment.rug_result
+        if rug_result:
+            trigger_data = json.loads(alert.trigger_data) if alert.trigger_data else {}
+            if skip_rug_failed and not rug_result.passed:
+                logger.info(
+                    f"Dropping alert for {enrichment.contract_address[:8]}... - "
+                    f"rug check failed (score: {rug_result.risk_score})"
+                )
+                self._drop_alert(alert, trigger_data.get('details') or {})
+                return None
 
-            # Add rug info to details
-            signal.details['rug_check'] = {
+            trigger_data['rug_check'] = {
                 'passed': rug_result.passed,
                 'risk_score': rug_result.risk_score,
-                'risk_level': rug_result.risk_level.value,
-                'warnings': rug_result.warnings[:3]  # Top 3 warnings
+                'warnings': rug_result.warnings
             }
+            trigger_data.setdefault('details', {})['rug_check'] = self._rug_check_summary(rug_result)
+            alert.trigger_data = json.dumps(trigger_data)
 
-            if not rug_result.passed:
-                logger.warning(
-                    f"Rug check FAILED for {signal.token.contract_address[:8]}...: "
-                    f"score={rug_result.risk_score}, warnings={rug_result.warnings}"
-                )
+        self.session.commit()
+        return alert
 
-        except Exception as e:
-            logger.error(f"Error enriching signal: {e}")
-            # Continue without enrichment rather than failing
+    def _drop_alert(self, alert: Alert, details: dict):
+        """
+        Delete an alert and undo what creating it set in motion
 
-        return signal
+        The alert's outcome checks are unscheduled, and if it opened a
+        cluster episode the token is re-armed and the episode's event
+        removed, so the drop leaves no fired state behind.
+        """
+        if self.outcome_scheduler is not None:
+            self.outcome_scheduler.unschedule(alert.id)
+
+        event_id = details.get('cluster_event_id')
+        opened_episode = (
+            alert.alert_type == SignalType.CLUSTER_BUY.value
+            and event_id is not None
+            and not details.get('escalation')
+        )
+        if opened_episode and self.cluster_states is not None:
+            if self.cluster_states.rearm(alert.token_id, event_id):
+                self.session.execute(delete(ClusterEvent).where(ClusterEvent.id == event_id))
+
+        self.session.delete(alert)
+        self.session.commit()
+
+    def _update_token_metadata(self, token: Token, metadata):
+        """Copy fresh metadata onto a token row"""
+        if metadata.name:
+            token.name = metadata.name
+        if metadata.symbol:
+            token.symbol = metadata.symbol
+        if metadata.market_cap_sol > 0:
+            token.market_cap_sol = metadata.market_cap_sol
+        if metadata.liquidity_sol > 0:
+            token.liquidity_sol = metadata.liquidity_sol
+        if metadata.total_supply > 0:
+            token.total_supply = metadata.total_supply
+
+    def _rug_check_summary(self, rug_result) -> dict:
+        """Short rug check summary stored in signal details"""
+        return {
+            'passed': rug_result.passed,
+            'risk_score': rug_result.risk_score,
+            'risk_level': rug_result.risk_level.value,
+            'warnings': rug_result.warnings[:3]  # Top 3 warnings
+        }
 
     def create_alert(self, signal: SignalResult, skip_rug_failed: bool = True) -> Optional[Alert]:
         """
@@ -468,6 +1054,35 @@ class SignalProcessor:
         Returns:
             Alert record or None if skipped
         """
+        alert = self._build_alert(signal, skip_rug_failed)
+        if alert is None:
+            return None
+        self.session.add(alert)
+        self._commit()
+        self._alert_created(alert, signal)
+        return alert
+
+    def create_alerts(self, signals: list[SignalResult], skip_rug_failed: bool = True) -> list[Optional[Alert]]:
+        """
+        Create alert records for many signals with a single flush
+
+        Args:
+            signals: SignalResults to create alerts from
+            skip_rug_failed: If True, don't create alerts for failed rug checks
+
+        Returns:
+            Alert record (or None if skipped) per signal, in order
+        """
+        alerts = [self._build_alert(signal, skip_rug_failed) for signal in signals]
+        self.session.add_all(alert for alert in alerts if alert is not None)
+        self._commit()
+        for alert, signal in zip(alerts, signals):
+            if alert is not None:
+                self._alert_created(alert, signal)
+        return alerts
+
+    def _build_alert(self, signal: SignalResult, skip_rug_failed: bool) -> Optional[Alert]:
+        """Alert row for a signal, or None if its rug check failed"""
         # Skip if rug check failed
         if skip_rug_failed and signal.rug_checked and not signal.rug_passed:
             logger.info(
@@ -484,7 +1099,7 @@ class SignalProcessor:
                 'conviction_score': w.conviction_score
             })
 
-        alert = Alert(
+        return Alert(
             token_id=signal.token.id,
             alert_type=signal.signal_type.value,
             trigger_data=json.dumps({
@@ -503,11 +1118,16 @@ class SignalProcessor:
             ),
             max_supply_pct=signal.max_supply_pct
         )
-        self.session.add(alert)
-        self.session.commit()
+
+    def _alert_created(self, alert: Alert, signal: SignalResult):
+        """Schedule a written alert's outcome checks"""
+        if self.outcome_scheduler is not None:
+            # A rolled-back alert's checks are dropped when they come due
+            self.outcome_scheduler.schedule(
+                alert.id, alert.created_at, mint=signal.token.contract_address
+            )
 
         logger.info(f"Alert created: {alert.alert_type} for {signal.token.contract_address[:8]}...")
-        return alert
 
     def get_pending_alerts(self, limit: int = 10) -> list[Alert]:
         """Get unsent alerts for Telegram dispatch"""
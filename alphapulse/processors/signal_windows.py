@@ -0,0 +1,311 @@
+"""
+AlphaPulse Signal Windows
+In-memory sliding windows that let signal checks run without querying the database
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from alphapulse.config import settings
+from alphapulse.db.models import SmartWallet, Token, Trade
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class WindowEntry:
+    """A tracked buy held in a sliding window (mirrors the Trade fields signals use)"""
+    block_time: datetime
+    wallet_id: int
+    wallet_address: str
+    sol_amount: float
+    supply_percentage: float
+    tx_signature: str
+
+
+class ClusterWindow:
+    """
+    Qualifying buys for one token inside the cluster window
+
+    Entries are kept ordered by block_time with a per-wallet count, so
+    eviction is amortized O(1) and the distinct-wallet count is len().
+    """
+
+    def __init__(self):
+        self.entries: deque[WindowEntry] = deque()
+        self.wallet_counts: dict[int, int] = {}
+
+    def add(self, entry: WindowEntry):
+        """Insert keeping block_time order (buys usually arrive in order)"""
+        if not self.entries or entry.block_time >= self.entries[-1].block_time:
+            self.entries.append(entry)
+        else:
+            i = len(self.entries)
+            while i > 0 and self.entries[i - 1].block_time > entry.block_time:
+                i -= 1
+            self.entries.insert(i, entry)
+        self.wallet_counts[entry.wallet_id] = self.wallet_counts.get(entry.wallet_id, 0) + 1
+
+    def evict(self, cutoff: datetime):
+        """Drop entries older than cutoff"""
+        while self.entries and self.entries[0].block_time < cutoff:
+            self._forget(self.entries.popleft())
+
+    def discard(self, tx_signature: str) -> bool:
+        """Remove a specific entry (e.g. its transaction was rolled back)"""
+        for entry in self.entries:
+            if entry.tx_signature == tx_signature:
+                self.entries.remove(entry)
+                self._forget(entry)
+                return True
+        return False
+
+    def _forget(self, entry: WindowEntry):
+        count = self.wallet_counts[entry.wallet_id] - 1
+        if count:
+            self.wallet_counts[entry.wallet_id] = count
+        else:
+            del self.wallet_counts[entry.wallet_id]
+
+    @property
+    def wallet_count(self) -> int:
+        return len(self.wallet_counts)
+
+
+class RollingVolume:
+    """
+    Rolling SOL buy volume for one token over a fixed window
+
+    A ring of time buckets plus a running total: adding a buy and reading
+    the window sum are both constant time. Resolution is one bucket, so
+    the window edge is accurate to BUCKET_SECONDS.
+    """
+
+    BUCKET_SECONDS = 10
+
+    def __init__(self, window_seconds: int, launched_at: Optional[datetime]):
+        self.launched_at = launched_at
+        self.size = max(1, window_seconds // self.BUCKET_SECONDS)
+        self.sums = [0.0] * self.size
+        self.slots = [-1] * self.size  # absolute bucket index held by each slot
+        self.total = 0.0
+
+    def _bucket(self, ts: datetime) -> int:
+        return int((ts - _EPOCH).total_seconds()) // self.BUCKET_SECONDS
+
+    def add(self, block_time: datetime, sol_amount: float, now: datetime):
+        """Add a buy (ignored if it already fell out of the window)"""
+        bucket = self._bucket(block_time)
+        if bucket <= self._bucket(now) - self.size:
+            return
+        slot = bucket % self.size
+        if self.slots[slot] != bucket:
+            if self.slots[slot] > bucket:
+                return  # Slot already reused by a newer bucket
+            self.total -= self.sums[slot]
+            self.sums[slot] = 0.0
+            self.slots[slot] = bucket
+        self.sums[slot] += sol_amount
+        self.total += sol_amount
+
+    def remove(self, block_time: datetime, sol_amount: float):
+        """Undo an add() whose bucket is still live"""
+        bucket = self._bucket(block_time)
+        slot = bucket % self.size
+        if self.slots[slot] == bucket:
+            self.sums[slot] -= sol_amount
+            self.total -= sol_amount
+
+    def volume(self, now: datetime) -> float:
+        """Sum of buys inside the window ending at now"""
+        oldest = self._bucket(now) - self.size
+        for slot in range(self.size):
+            if 0 <= self.slots[slot] <= oldest:
+                self.total -= self.sums[slot]
+                self.sums[slot] = 0.0
+                self.slots[slot] = -1
+        return max(0.0, self.total)
+
+
+class SignalWindows:
+    """
+    Process-wide per-token windows fed as trades are recorded
+
+    Thread-safe, since webhook processing may run on a thread pool.
+    """
+
+    # Sweep every window after this many inserts so idle tokens don't linger
+    PRUNE_EVERY = 1000
+
+    # Volume-spike window (matches the 5-minute volume in the signal spec)
+    VOLUME_WINDOW_MINUTES = 5
+
+    def __init__(
+        self,
+        cluster_window_mins: int = None,
+        cluster_min_sol: float = None,
+        new_token_max_age_mins: int = None
+    ):
+        self.cluster_window = timedelta(
+            minutes=cluster_window_mins or settings.cluster_window_minutes
+        )
+        self.cluster_min_sol = (
+            settings.cluster_min_sol if cluster_min_sol is None else cluster_min_sol
+        )
+        self.volume_window = timedelta(minutes=self.VOLUME_WINDOW_MINUTES)
+        self.new_token_max_age = timedelta(
+            minutes=new_token_max_age_mins or settings.new_token_max_age_minutes
+        )
+        self._clusters: dict[int, ClusterWindow] = {}
+        self._volumes: dict[int, RollingVolume] = {}
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+    def record_buy(
+        self,
+        token_id: int,
+        wallet_id: int,
+        wallet_address: str,
+        sol_amount: float,
+        supply_pct: float,
+        tx_signature: str,
+        block_time: datetime,
+        launched_at: Optional[datetime] = None
+    ):
+        """Add a recorded buy to the token's cluster and volume windows"""
+        now = datetime.utcnow()
+        with self._lock:
+            # Rolling volume, only while the token still counts as new
+            if launched_at is None or now - launched_at <= self.new_token_max_age:
+                volume = self._volumes.get(token_id)
+                if volume is None:
+                    volume = self._volumes[token_id] = RollingVolume(
+                        int(self.volume_window.total_seconds()), launched_at
+                    )
+                volume.add(block_time, sol_amount, now)
+
+            # Cluster window, qualifying buys only
+            if sol_amount >= self.cluster_min_sol and block_time >= now - self.cluster_window:
+                window = self._clusters.get(token_id)
+                if window is None:
+                    window = self._clusters[token_id] = ClusterWindow()
+                window.add(WindowEntry(
+                    block_time=block_time,
+                    wallet_id=wallet_id,
+                    wallet_address=wallet_address,
+                    sol_amount=sol_amount,
+                    supply_percentage=supply_pct or 0.0,
+                    tx_signature=tx_signature
+                ))
+
+            self._inserts += 1
+            if self._inserts % self.PRUNE_EVERY == 0:
+                self._prune_locked()
+
+    def discard_buy(self, token_id: int, tx_signature: str, block_time: datetime, sol_amount: float):
+        """Remove a buy whose database write was rolled back"""
+        with self._lock:
+            window = self._clusters.get(token_id)
+            if window and window.discard(tx_signature) and not window.entries:
+                del self._clusters[token_id]
+            volume = self._volumes.get(token_id)
+            if volume:
+                volume.remove(block_time, sol_amount)
+
+    def check_cluster(self, token_id: int, min_wallets: int) -> Optional[list[WindowEntry]]:
+        """
+        Check the cluster condition for a token
+
+        Returns:
+            Qualifying entries if min_wallets distinct wallets bought inside
+            the window, otherwise None
+        """
+        cutoff = datetime.utcnow() - self.cluster_window
+        with self._lock:
+            window = self._clusters.get(token_id)
+            if window is None:
+                return None
+            window.evict(cutoff)
+            if not window.entries:
+                del self._clusters[token_id]
+                return None
+            if window.wallet_count < min_wallets:
+                return None
+            return list(window.entries)
+
+    def volume(self, token_id: int) -> float:
+        """SOL bought in the token over the last VOLUME_WINDOW_MINUTES"""
+        with self._lock:
+            volume = self._volumes.get(token_id)
+            return volume.volume(datetime.utcnow()) if volume else 0.0
+
+    def prune(self):
+        """Evict expired entries and tokens too old for volume-spike checks"""
+        with self._lock:
+            self._prune_locked()
+
+    def _prune_locked(self):
+        now = datetime.utcnow()
+        cutoff = now - self.cluster_window
+        for token_id in list(self._clusters):
+            window = self._clusters[token_id]
+            window.evict(cutoff)
+            if not window.entries:
+                del self._clusters[token_id]
+
+        for token_id in list(self._volumes):
+            volume = self._volumes[token_id]
+            too_old = volume.launched_at and now - volume.launched_at > self.new_token_max_age
+            if too_old or volume.volume(now) <= 0:
+                del self._volumes[token_id]
+
+    def warm(self, session: Session) -> int:
+        """
+        Load buys still inside the window from the database
+
+        Returns:
+            Number of buys loaded
+        """
+        cutoff = datetime.utcnow() - max(self.cluster_window, self.volume_window)
+        rows = session.query(
+            Trade.token_id, Trade.wallet_id, SmartWallet.address, Trade.sol_amount,
+            Trade.supply_percentage, Trade.tx_signature, Trade.block_time, Token.launched_at
+        ).join(SmartWallet, Trade.wallet_id == SmartWallet.id).join(
+            Token, Trade.token_id == Token.id
+        ).filter(
+            Trade.trade_type == 'BUY',
+            Trade.block_time >= cutoff
+        ).order_by(Trade.block_time).all()
+
+        for row in rows:
+            self.record_buy(*row)
+
+        logger.info(f"Signal windows warmed with {len(rows)} recent buys")
+        return len(rows)
+
+    @property
+    def token_count(self) -> int:
+        return len(self._clusters.keys() | self._volumes.keys())
+
+
+# Global instance
+_signal_windows: Optional[SignalWindows] = None
+_signal_windows_lock = threading.Lock()
+
+
+def get_signal_windows() -> SignalWindows:
+    """Get global signal windows instance"""
+    global _signal_windows
+    if _signal_windows is None:
+        with _signal_windows_lock:
+            if _signal_windows is None:
+                _signal_windows = SignalWindows()
+    return _signal_windows
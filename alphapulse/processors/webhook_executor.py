@@ -0,0 +1,118 @@
+"""
+AlphaPulse Webhook Executor
+Runs blocking webhook processing off the asyncio event loop
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Optional
+
+from alphapulse.config import settings
+from alphapulse.db.models import get_session
+from alphapulse.processors.helius_handler import HeliusWebhookHandler
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExecutionMode(Enum):
+    """Where HeliusWebhookHandler.handle_webhook runs"""
+    INLINE = "inline"  # Directly on the event loop (blocks it during DB work)
+    THREAD = "thread"  # On a dedicated thread pool, one session per thread
+
+
+class WebhookExecutor:
+    """
+    Dispatches webhook payloads to a HeliusWebhookHandler
+
+    In THREAD mode every pool thread lazily builds its own handler and
+    session (SQLAlchemy sessions are not thread-safe), while all handlers
+    share the primary handler's tracked-wallet set so cache updates from
+    discovery or the bot are seen everywhere.
+    """
+
+    def __init__(
+        self,
+        engine,
+        mode: str = None,
+        max_workers: int = None,
+        batch_commit: Optional[bool] = None
+    ):
+        """
+        Initialize executor
+
+        Args:
+            engine: SQLAlchemy engine used to create per-thread sessions
+            mode: 'inline' or 'thread' (defaults to settings)
+            max_workers: Thread pool size (defaults to settings)
+            batch_commit: Passed to every handler (defaults to settings)
+        """
+        self.engine = engine
+        self.mode = ExecutionMode(mode or settings.webhook_execution_mode)
+        self.max_workers = max_workers or settings.webhook_processing_threads
+        self.batch_commit = batch_commit
+
+        # Primary handler: used inline, and owns the shared wallet cache
+        self.handler = HeliusWebhookHandler(get_session(engine), batch_commit=batch_commit)
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._thread_handlers: list[HeliusWebhookHandler] = []
+        self._lock = threading.Lock()
+
+        if self.mode == ExecutionMode.THREAD:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="webhook"
+            )
+
+        logger.info(f"Webhook executor mode={self.mode.value} workers={self.max_workers}")
+
+    async def handle(self, payload) -> list[dict]:
+        """
+        Process a parsed webhook payload
+
+        Returns:
+            List of generated alert dicts (see HeliusWebhookHandler.handle_webhook)
+        """
+        if self.mode == ExecutionMode.INLINE:
+            return self.handler.handle_webhook(payload)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._handle_in_thread, payload)
+
+    def _handle_in_thread(self, payload) -> list[dict]:
+        """Run the handler bound to the current pool thread"""
+        handler = getattr(self._local, 'handler', None)
+        if handler is None:
+            handler = HeliusWebhookHandler(
+                get_session(self.engine),
+                tracked_wallets=self.handler._tracked_wallets,
+                batch_commit=self.batch_commit
+            )
+            self._local.handler = handler
+            with self._lock:
+                self._thread_handlers.append(handler)
+        return handler.handle_webhook(payload)
+
+    def add_wallet_to_cache(self, address: str):
+        """Add a new wallet to the shared tracking cache"""
+        self.handler.add_wallet_to_cache(address)
+
+    def remove_wallet_from_cache(self, address: str):
+        """Remove a wallet from the shared tracking cache"""
+        self.handler.remove_wallet_from_cache(address)
+
+    def shutdown(self):
+        """Wait for in-flight work and close all sessions"""
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+        with self._lock:
+            for handler in self._thread_handlers:
+                handler.session.close()
+            self._thread_handlers = []
+        self.handler.session.close()
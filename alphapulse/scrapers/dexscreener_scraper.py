@@ -12,6 +12,7 @@ from playwright.async_api import async_playwright, Page, Browser
 
 from alphapulse.scrapers.gmgn_scraper import ScrapedWallet
 from alphapulse.utils.logger import get_logger
+from alphapulse.utils.http_clients import get_http_client
 
 logger = get_logger(__name__)
 
@@ -75,31 +76,29 @@ class DexscreenerScraper:
         Fetch trending Solana pairs from Dexscreener API
         Uses public API endpoint for reliability
         """
-        import aiohttp
-
         pairs = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # Dexscreener API endpoint for Solana gainers
-                url = f"{self.API_URL}/latest/dex/tokens/solana"
-
-                async with session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Extract pairs from response
-                        for pair in data.get('pairs', [])[:limit]:
-                            pairs.append({
-                                'contract_address': pair.get('baseToken', {}).get('address'),
-                                'name': pair.get('baseToken', {}).get('name', 'Unknown'),
-                                'symbol': pair.get('baseToken', {}).get('symbol', '???'),
-                                'price_change_24h': float(pair.get('priceChange', {}).get('h24', 0) or 0),
-                                'market_cap': float(pair.get('fdv', 0) or 0),
-                                'liquidity': float(pair.get('liquidity', {}).get('usd', 0) or 0),
-                                'volume_24h': float(pair.get('volume', {}).get('h24', 0) or 0),
-                                'pair_address': pair.get('pairAddress')
-                            })
+            client = get_http_client('dexscreener')
+            # Dexscreener API endpoint for Solana gainers
+            url = f"{self.API_URL}/latest/dex/tokens/solana"
+
+            response = await client.get(url)
+            if response.status_code == 200:
+                data = response.json()
+
+                # Extract pairs from response
+                for pair in data.get('pairs', [])[:limit]:
+                    pairs.append({
+                        'contract_address': pair.get('baseToken', {}).get('address'),
+                        'name': pair.get('baseToken', {}).get('name', 'Unknown'),
+                        'symbol': pair.get('baseToken', {}).get('symbol', '???'),
+                        'price_change_24h': float(pair.get('priceChange', {}).get('h24', 0) or 0),
+                        'market_cap': float(pair.get('fdv', 0) or 0),
+                        'liquidity': float(pair.get('liquidity', {}).get('usd', 0) or 0),
+                        'volume_24h': float(pair.get('volume', {}).get('h24', 0) or 0),
+                        'pair_address': pair.get('pairAddress')
+                    })
 
             logger.info(f"Fetched {len(pairs)} trending pairs from Dexscreener API")
 
@@ -1,9 +1,22 @@
 """AlphaPulse Services Package"""
 
 from alphapulse.services.token_metadata import TokenMetadataService, TokenMetadata
-from alphapulse.services.conviction_calculator import ConvictionCalculator, WalletMetrics
-from alphapulse.services.rug_detector import RugDetector, RugCheckResult, RiskLevel
-from alphapulse.services.outcome_tracker import OutcomeTracker, AlertOutcome, PerformanceStats
+from alphapulse.services.metadata_cache import MetadataCache, get_metadata_cache
+from alphapulse.services.sol_price import SolPriceTicker, get_sol_price_ticker, FALLBACK_SOL_PRICE_USD
+from alphapulse.services.conviction_calculator import ConvictionCalculator, TradeAggregates, WalletMetrics
+from alphapulse.services.wallet_stats import WalletStatsTracker
+from alphapulse.services.goplus import GoPlusSecurity, get_goplus_security
+from alphapulse.services.copycat_index import CopycatIndex, get_copycat_index
+from alphapulse.services.rug_detector import (
+    RugDetector, RugCheckResult, RiskLevel, RugResultCache, get_rug_result_cache,
+    RugCheckTimings, get_rug_check_timings, get_rug_detector
+)
+from alphapulse.services.persistent_cache import PersistentCache, CachePersister, get_cache_persister
+from alphapulse.services.outcome_tracker import (
+    OutcomeTracker, AlertOutcome, PerformanceStats, OutcomeBatchLimit, get_outcome_batch_limit
+)
+from alphapulse.services.outcome_scheduler import OutcomeScheduler, get_outcome_scheduler
+from alphapulse.services.price_history import PriceHistory, PriceSummary, get_price_history
 from alphapulse.services.position_tracker import PositionTracker, WalletPortfolio, TokenPosition
 from alphapulse.services.backtester import (
     Backtester, BacktestConfig, BacktestResult, BacktestTrade,
@@ -13,13 +26,39 @@ from alphapulse.services.backtester import (
 __all__ = [
     'TokenMetadataService',
     'TokenMetadata',
+    'MetadataCache',
+    'get_metadata_cache',
+    'SolPriceTicker',
+    'get_sol_price_ticker',
+    'FALLBACK_SOL_PRICE_USD',
     'ConvictionCalculator',
     'WalletMetrics',
+    'TradeAggregates',
+    'WalletStatsTracker',
+    'GoPlusSecurity',
+    'get_goplus_security',
+    'CopycatIndex',
+    'get_copycat_index',
     'RugDetector',
+    'get_rug_detector',
     'RugCheckResult',
     'RiskLevel',
+    'RugResultCache',
+    'get_rug_result_cache',
+    'RugCheckTimings',
+    'get_rug_check_timings',
+    'PersistentCache',
+    'CachePersister',
+    'get_cache_persister',
     'OutcomeTracker',
     'AlertOutcome',
+    'OutcomeBatchLimit',
+    'get_outcome_batch_limit',
+    'OutcomeScheduler',
+    'get_outcome_scheduler',
+    'PriceHistory',
+    'PriceSummary',
+    'get_price_history',
     'PerformanceStats',
     'PositionTracker',
     'WalletPortfolio',
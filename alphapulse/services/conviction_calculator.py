@@ -8,9 +8,10 @@ from typing import Optional
 from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, distinct, func, select
 
-from alphapulse.db.models import SmartWallet, Trade, Alert
+from alphapulse.db.models import SmartWallet, Token, Trade, WalletStats
+from alphapulse.db.identity_cache import get_identity_cache
 from alphapulse.config import settings
 from alphapulse.utils.logger import get_logger
 
@@ -35,6 +36,23 @@ class WalletMetrics:
     rug_avoidance_rate: float  # % of tokens that didn't rug
 
 
+@dataclass
+class TradeAggregates:
+    """Per-wallet trade aggregates, computed in SQL"""
+    trades_7d: int = 0
+    trades_30d: int = 0
+    buys: int = 0
+    early_buys: int = 0  # Buys within 30 mins of the token's launch
+    entry_mcap_buys: int = 0  # Buys with a known mcap
+    avg_entry_mcap: float = 0.0
+    tokens_bought: int = 0
+    rugged_tokens: int = 0  # Distinct bought tokens that rugged
+    # Net SOL PnL per token traded: count, sum and sum of squares
+    pnl_tokens: int = 0
+    pnl_sum: float = 0.0
+    pnl_sum_sq: float = 0.0
+
+
 class ConvictionCalculator:
     """
     Calculates conviction scores for smart wallets
@@ -56,20 +74,27 @@ class ConvictionCalculator:
     WEIGHT_EARLY_ENTRY = 10
     WEIGHT_RUG_AVOIDANCE = 10
 
+    # Buys this soon after launch count as early entries
+    EARLY_ENTRY_MINS = 30
+
     def __init__(self, session: Session):
         self.session = session
 
-    def calculate_score(self, wallet: SmartWallet) -> float:
+    def calculate_score(self, wallet: SmartWallet, aggregates: TradeAggregates = None) -> float:
         """
         Calculate conviction score for a wallet
 
         Args:
-            wallet: SmartWallet record
+            wallet: SmartWallet record (or a row / WalletRef with the same fields)
+            aggregates: Precomputed trade aggregates (read from the wallet's
+                        WalletStats row, or queried, if omitted)
 
         Returns:
             Conviction score 0-100
         """
-        metrics = self._gather_metrics(wallet)
+        if aggregates is None:
+            aggregates = self._aggregates_for(wallet.id)
+        metrics = self._gather_metrics(wallet, aggregates)
 
         # Component scores
         win_rate_score = self._score_win_rate(metrics.win_rate)
@@ -97,106 +122,137 @@ class ConvictionCalculator:
 
         return min(100, max(0, total_score))
 
-    def _gather_metrics(self, wallet: SmartWallet) -> WalletMetrics:
-        """Gather all metrics needed for score calculation"""
-        now = datetime.utcnow()
-        seven_days_ago = now - timedelta(days=7)
-        thirty_days_ago = now - timedelta(days=30)
-
-        # Get trades
-        all_trades = self.session.query(Trade).filter(
-            Trade.wallet_id == wallet.id
-        ).all()
-
-        trades_7d = [t for t in all_trades if t.block_time >= seven_days_ago]
-        trades_30d = [t for t in all_trades if t.block_time >= thirty_days_ago]
+    def aggregate_trades(self, wallet_ids=None, now: Optional[datetime] = None) -> dict[int, TradeAggregates]:
+        """
+        Trade aggregates for many wallets in two grouped queries
 
-        # Calculate metrics
-        buy_trades = [t for t in all_trades if t.trade_type == 'BUY']
-        sell_trades = [t for t in all_trades if t.trade_type == 'SELL']
+        Args:
+            wallet_ids: Wallet ids, or a select of them, to aggregate
+                        (defaults to all active wallets)
+            now: End of the 7d / 30d windows (defaults to the current time)
 
-        # Early entry rate (trades on tokens < 30 mins old)
-        early_entries = 0
-        for trade in buy_trades:
-            if trade.token and trade.token.launched_at:
-                entry_age = (trade.block_time - trade.token.launched_at).total_seconds() / 60
-                if entry_age <= 30:
-                    early_entries += 1
-        early_entry_rate = (early_entries / len(buy_trades) * 100) if buy_trades else 0
+        Returns:
+            Wallet id -> TradeAggregates, for wallets with trades
+        """
+        now = now or datetime.utcnow()
+        seven_days_ago = now - timedelta(days=7)
+        thirty_days_ago = now - timedelta(days=30)
+        is_buy = Trade.trade_type == 'BUY'
+
+        if wallet_ids is None:
+            wallet_filter = Trade.wallet_id.in_(
+                select(SmartWallet.id).where(SmartWallet.is_active == True)
+            )
+        else:
+            wallet_filter = Trade.wallet_id.in_(wallet_ids)
+
+        # Counts, early entries, entry mcap and rugged tokens per wallet
+        entry_mins = self._minutes_between(Trade.block_time, Token.launched_at)
+        rows = self.session.query(
+            Trade.wallet_id,
+            func.count(case((Trade.block_time >= seven_days_ago, 1))),
+            func.count(case((Trade.block_time >= thirty_days_ago, 1))),
+            func.count(case((is_buy, 1))),
+            func.count(case((is_buy & (entry_mins <= self.EARLY_ENTRY_MINS), 1))),
+            func.count(case((is_buy & (Trade.mcap_at_trade > 0), 1))),
+            func.avg(case((is_buy & (Trade.mcap_at_trade > 0), Trade.mcap_at_trade))),
+            func.count(distinct(case((is_buy, Trade.token_id)))),
+            func.count(distinct(case((is_buy & (Token.is_rugged == True), Trade.token_id))))
+        ).outerjoin(
+            Token, Trade.token_id == Token.id
+        ).filter(wallet_filter).group_by(Trade.wallet_id)
+
+        aggregates: dict[int, TradeAggregates] = {}
+        for wallet_id, t7, t30, buys, early, mcap_buys, mcap, bought, rugged in rows:
+            aggregates[wallet_id] = TradeAggregates(
+                trades_7d=t7, trades_30d=t30, buys=buys, early_buys=early,
+                entry_mcap_buys=mcap_buys, avg_entry_mcap=mcap or 0.0,
+                tokens_bought=bought, rugged_tokens=rugged
+            )
+
+        # Net SOL PnL per (wallet, token), reduced to count/sum/sum of squares
+        net = func.sum(case((is_buy, -Trade.sol_amount), else_=Trade.sol_amount))
+        per_token = self.session.query(
+            Trade.wallet_id.label('wallet_id'), net.label('pnl')
+        ).filter(wallet_filter).group_by(Trade.wallet_id, Trade.token_id).subquery()
+        rows = self.session.query(
+            per_token.c.wallet_id,
+            func.count(),
+            func.sum(per_token.c.pnl),
+            func.sum(per_token.c.pnl * per_token.c.pnl)
+        ).group_by(per_token.c.wallet_id)
+
+        for wallet_id, count, total, total_sq in rows:
+            entry = aggregates.setdefault(wallet_id, TradeAggregates())
+            entry.pnl_tokens, entry.pnl_sum, entry.pnl_sum_sq = count, total or 0.0, total_sq or 0.0
+
+        return aggregates
+
+    def _aggregates_for(self, wallet_id: int) -> TradeAggregates:
+        """One wallet's aggregates: its WalletStats row, else a trades query"""
+        if settings.wallet_stats_enabled:
+            # Lazy import to avoid circular dependencies
+            from alphapulse.services.wallet_stats import WalletStatsTracker
+            stats = self.session.get(WalletStats, wallet_id)
+            if stats is not None:
+                return WalletStatsTracker(self.session).aggregates(stats)
+        return self.aggregate_trades([wallet_id]).get(wallet_id, TradeAggregates())
+
+    def _minutes_between(self, later, earlier):
+        """SQL expression: minutes from `earlier` to `later`"""
+        if self.session.get_bind().dialect.name == 'sqlite':
+            return (func.julianday(later) - func.julianday(earlier)) * 1440
+        return func.extract('epoch', later - earlier) / 60
+
+    def _gather_metrics(self, wallet: SmartWallet, aggregates: TradeAggregates) -> WalletMetrics:
+        """Combine a wallet's stored stats with its trade aggregates"""
+        buys = aggregates.buys
+        early_entry_rate = (aggregates.early_buys / buys * 100) if buys else 0
 
         # Rug avoidance (tokens that didn't rug)
-        tokens_traded = set(t.token_id for t in buy_trades)
-        rugged_tokens = self.session.query(func.count()).filter(
-            Trade.token_id.in_(tokens_traded),
-            Trade.token.has(is_rugged=True)
-        ).scalar() or 0
-        rug_avoidance = ((len(tokens_traded) - rugged_tokens) / len(tokens_traded) * 100) if tokens_traded else 100
-
-        # Average entry market cap
-        entry_mcaps = [t.mcap_at_trade for t in buy_trades if t.mcap_at_trade]
-        avg_entry_mcap = sum(entry_mcaps) / len(entry_mcaps) if entry_mcaps else 0
+        bought = aggregates.tokens_bought
+        rug_avoidance = ((bought - aggregates.rugged_tokens) / bought * 100) if bought else 100
 
         # Best trade multiple (simplified - would need full PnL tracking)
         best_multiple = 1.0  # Placeholder
 
-        # Consistency score (standard deviation of returns)
-        consistency = self._calculate_consistency(wallet)
-
         return WalletMetrics(
             address=wallet.address,
             win_rate=wallet.win_rate,
             total_trades=wallet.total_trades,
-            trades_7d=len(trades_7d),
-            trades_30d=len(trades_30d),
+            trades_7d=aggregates.trades_7d,
+            trades_30d=aggregates.trades_30d,
             pnl_total_sol=wallet.pnl_total_sol,
             pnl_7d_sol=wallet.pnl_7d_sol,
             avg_hold_time_mins=wallet.avg_hold_time_mins or 0,
-            avg_entry_mcap=avg_entry_mcap,
+            avg_entry_mcap=aggregates.avg_entry_mcap,
             best_trade_multiple=best_multiple,
-            consistency_score=consistency,
+            consistency_score=self._consistency(aggregates),
             early_entry_rate=early_entry_rate,
             rug_avoidance_rate=rug_avoidance
         )
 
-    def _calculate_consistency(self, wallet: SmartWallet) -> float:
+    @staticmethod
+    def _consistency(aggregates: TradeAggregates) -> float:
         """
-        Calculate consistency of returns
+        Calculate consistency of returns from per-token PnL moments
         Lower variance = more consistent = higher score
 
         Returns:
             0-100 consistency score
         """
-        # Get PnL per token traded
-        trades_by_token = {}
-        trades = self.session.query(Trade).filter(
-            Trade.wallet_id == wallet.id
-        ).all()
-
-        for trade in trades:
-            if trade.token_id not in trades_by_token:
-                trades_by_token[trade.token_id] = {'buys': 0, 'sells': 0}
-            if trade.trade_type == 'BUY':
-                trades_by_token[trade.token_id]['buys'] += trade.sol_amount
-            else:
-                trades_by_token[trade.token_id]['sells'] += trade.sol_amount
-
-        # Calculate PnL per token
-        pnls = []
-        for token_id, amounts in trades_by_token.items():
-            pnl = amounts['sells'] - amounts['buys']
-            pnls.append(pnl)
-
-        if len(pnls) < 3:
+        n = aggregates.pnl_tokens
+        if n < 3:
             return 50  # Not enough data
 
         # Calculate coefficient of variation
-        avg_pnl = sum(pnls) / len(pnls)
+        avg_pnl = aggregates.pnl_sum / n
         if avg_pnl == 0:
             return 50
 
-        variance = sum((p - avg_pnl) ** 2 for p in pnls) / len(pnls)
+        variance = max(0.0, aggregates.pnl_sum_sq / n - avg_pnl ** 2)
         std_dev = variance ** 0.5
-        cv = abs(std_dev / avg_pnl) if avg_pnl != 0 else 1
+        cv = abs(std_dev / avg_pnl)
 
         # Convert CV to score (lower CV = higher consistency)
         # CV of 0 = 100 score, CV of 2+ = 0 score
@@ -247,25 +303,44 @@ class ConvictionCalculator:
         """
         Recalculate conviction scores for all active wallets
 
+        Trade aggregates come from the WalletStats rows kept current on
+        each trade (backfilled first for wallets without one), or from two
+        grouped trade queries (see aggregate_trades) when wallet stats are
+        disabled. Scores are written back with one bulk update.
+
         Returns:
             Number of wallets updated
         """
-        wallets = self.session.query(SmartWallet).filter(
+        wallets = self.session.query(
+            SmartWallet.id, SmartWallet.address, SmartWallet.win_rate,
+            SmartWallet.total_trades, SmartWallet.pnl_total_sol,
+            SmartWallet.pnl_7d_sol, SmartWallet.avg_hold_time_mins
+        ).filter(
             SmartWallet.is_active == True
         ).all()
-
-        updated = 0
+        if settings.wallet_stats_enabled:
+            # Lazy import to avoid circular dependencies
+            from alphapulse.services.wallet_stats import WalletStatsTracker
+            tracker = WalletStatsTracker(self.session)
+            tracker.backfill()
+            aggregates = tracker.load_aggregates()
+        else:
+            aggregates = self.aggregate_trades()
+        empty = TradeAggregates()
+
+        updates = []
         for wallet in wallets:
             try:
-                new_score = self.calculate_score(wallet)
-                wallet.conviction_score = new_score
-                updated += 1
+                new_score = self.calculate_score(wallet, aggregates.get(wallet.id, empty))
+                updates.append({'id': wallet.id, 'conviction_score': new_score})
             except Exception as e:
                 logger.warning(f"Failed to update score for {wallet.address[:8]}...: {e}")
 
+        self.session.bulk_update_mappings(SmartWallet, updates)
         self.session.commit()
-        logger.info(f"Updated conviction scores for {updated} wallets")
-        return updated
+        get_identity_cache().clear_wallets()
+        logger.info(f"Updated conviction scores for {len(updates)} wallets")
+        return len(updates)
 
     def get_top_wallets(self, limit: int = 20, min_score: float = 50) -> list[SmartWallet]:
         """Get top wallets by conviction score"""
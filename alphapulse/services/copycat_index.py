@@ -0,0 +1,233 @@
+"""
+AlphaPulse Copycat Index
+Precompiled matcher for tokens impersonating known tickers
+"""
+
+import json
+import threading
+import unicodedata
+from collections import deque
+from typing import Iterable, Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Built-in known tickers, used when no list file is configured
+DEFAULT_KNOWN_TOKENS = [
+    "BONK", "WIF", "PEPE", "DOGE", "SHIB",  # Popular memes
+    "SOL", "ETH", "BTC",  # Major coins
+    "USDC", "USDT",  # Stablecoins
+]
+
+# Look-alike characters folded before matching (after NFKC, uppercased).
+# Cyrillic and Greek capitals that render like Latin ones, plus common
+# digit/symbol stand-ins ("B0NK", "$HIB", "PEP3").
+HOMOGLYPHS = str.maketrans({
+    'А': 'A', 'В': 'B', 'Е': 'E', 'К': 'K', 'М': 'M', 'Н': 'H', 'О': 'O',
+    'Р': 'P', 'С': 'C', 'Т': 'T', 'У': 'Y', 'Х': 'X', 'І': 'I', 'Ј': 'J', 'Ѕ': 'S',
+    'Α': 'A', 'Β': 'B', 'Ε': 'E', 'Ζ': 'Z', 'Η': 'H', 'Ι': 'I', 'Κ': 'K', 'Μ': 'M',
+    'Ν': 'N', 'Ο': 'O', 'Ρ': 'P', 'Τ': 'T', 'Υ': 'Y', 'Χ': 'X',
+    '0': 'O', '1': 'I', '3': 'E', '4': 'A', '5': 'S', '7': 'T',
+    '$': 'S', '@': 'A', '€': 'E', '|': 'I', '!': 'I',
+})
+
+# Affixes copycats add around a known ticker ("BABYDOGE", "PEPE2.0", "WIFINU"),
+# compared against the normalized symbol
+COPYCAT_PREFIXES = ("BABY", "MINI")
+COPYCAT_SUFFIXES = ("2", "2O", "INU", "MOON")  # "2.0" normalizes to "2O"
+
+
+def normalize(text: Optional[str]) -> str:
+    """Canonical form for matching: NFKC, uppercase, homoglyphs folded, letters/digits only"""
+    return normalize_words(text)[0]
+
+
+def normalize_words(text: Optional[str]) -> tuple[str, set[int]]:
+    """
+    normalize() plus the positions in the result where a word starts
+
+    Words are separated by anything that is not a letter or digit, and by
+    camelCase humps ("BabyDoge" -> "BABY", "DOGE").
+    """
+    if not text:
+        return "", set()
+    chars, starts = [], set()
+    prev = ""
+    for ch in unicodedata.normalize("NFKC", text):
+        folded = ch.upper().translate(HOMOGLYPHS)
+        if not (folded.isalnum() and folded.isascii()):
+            prev = ""
+            continue
+        if not prev or (ch.isupper() and prev.islower()):
+            starts.add(len(chars))
+        chars.append(folded)
+        prev = ch
+    return "".join(chars), starts
+
+
+class CopycatIndex:
+    """
+    Matches token symbols and names against a list of known tickers
+
+    Built once: known tickers are normalized into a set (for exact and
+    affix-variant symbol matches) and an Aho-Corasick automaton (for
+    tickers at word starts in names), so a lookup costs O(len(name))
+    however many tickers are protected. Tickers shorter than min_substring_len
+    only match exactly, otherwise they would hit most names.
+    """
+
+    def __init__(self, known_tokens: Iterable[str], min_substring_len: int = 3):
+        """
+        Build the index
+
+        Args:
+            known_tokens: Tickers to protect
+            min_substring_len: Shortest ticker matched inside names
+        """
+        self.min_substring_len = min_substring_len
+        self.known: dict[str, str] = {}  # normalized -> ticker as listed
+        for token in known_tokens:
+            key = normalize(token)
+            if key:
+                self.known.setdefault(key, token.strip().upper())
+
+        # Aho-Corasick automaton: goto transitions, failure links and the
+        # ticker ending at each state
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[Optional[str]] = [None]
+        for key in self.known:
+            if len(key) >= min_substring_len:
+                self._insert(key)
+        self._link()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "CopycatIndex":
+        """Load tickers from a JSON list or a text file with one ticker per line ('#' comments)"""
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        if content.lstrip().startswith("["):
+            tokens = json.loads(content)
+        else:
+            tokens = [
+                line.split("#", 1)[0].strip() for line in content.splitlines()
+            ]
+        return cls([t for t in tokens if t], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def _insert(self, key: str):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            state = nxt
+        self._out[state] = key
+
+    def _link(self):
+        """Breadth-first pass setting failure links"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+
+    def find_in(self, text: str, starts: Optional[set[int]] = None) -> Optional[str]:
+        """
+        Longest known ticker (normalized) occurring in normalized text
+
+        Args:
+            starts: If given, only occurrences beginning at one of these
+                    positions count (see normalize_words)
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state, best = 0, None
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            # Every ticker ending here sits on the failure chain
+            match = state
+            while match:
+                found = out[match]
+                if (
+                    found
+                    and (starts is None or end - len(found) in starts)
+                    and (best is None or len(found) > len(best))
+                ):
+                    best = found
+                match = fail[match]
+        return best
+
+    def match(self, symbol: Optional[str], name: Optional[str]) -> Optional[str]:
+        """
+        Known ticker a token appears to copy
+
+        Matches, in order: the symbol is a known ticker (after homoglyph
+        folding); the symbol is a known ticker with a copycat prefix
+        and/or suffix ("BABYDOGE", "PEPE2.0", "BABYWIFINU"); a word of
+        the name starts with a known ticker ("Baby Doge Coin", "Solana
+        Cat") and the name is not exactly that ticker. A ticker inside a
+        word does not count ("Console" is not a copy of SOL).
+
+        Returns:
+            The ticker being copied, or None
+        """
+        sym = normalize(symbol)
+        if sym:
+            if sym in self.known:
+                return self.known[sym]
+            # Strip an optional prefix and an optional suffix ("BABYWIFINU")
+            stems = [sym] + [sym[len(p):] for p in COPYCAT_PREFIXES if sym.startswith(p)]
+            for stem in stems:
+                if stem is not sym and stem in self.known:
+                    return self.known[stem]
+                for suffix in COPYCAT_SUFFIXES:
+                    if stem.endswith(suffix) and stem[:-len(suffix)] in self.known:
+                        return self.known[stem[:-len(suffix)]]
+
+        nam, starts = normalize_words(name)
+        if nam and nam not in self.known:
+            found = self.find_in(nam, starts)
+            if found:
+                return self.known[found]
+        return None
+
+
+# Global instance
+_copycat_index: Optional[CopycatIndex] = None
+_copycat_index_lock = threading.Lock()
+
+
+def get_copycat_index() -> CopycatIndex:
+    """Get the global copycat index (from copycat_tokens_file, else the built-in list)"""
+    global _copycat_index
+    if _copycat_index is None:
+        with _copycat_index_lock:
+            if _copycat_index is None:
+                _copycat_index = _load_index()
+    return _copycat_index
+
+
+def _load_index() -> CopycatIndex:
+    path = settings.copycat_tokens_file
+    if path:
+        try:
+            index = CopycatIndex.from_file(path)
+            logger.info(f"Loaded copycat index with {len(index)} known tokens from {path}")
+            return index
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load copycat tokens from {path}: {e}; using built-in list")
+    return CopycatIndex(DEFAULT_KNOWN_TOKENS)
@@ -0,0 +1,170 @@
+"""
+AlphaPulse GoPlus Security Reports
+One cached, batched GoPlus token_security fetch shared by every risk check
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.http_clients import get_http_client
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class GoPlusSecurity:
+    """
+    GoPlus token security reports
+
+    A report is fetched once per mint and cached for ttl seconds; every
+    risk check parses the same report. Lookups arriving within
+    batch_window seconds of each other are sent together, BATCH_SIZE
+    comma-separated mints per request, and concurrent lookups of a mint
+    already being fetched wait for that request.
+    """
+
+    SECURITY_API = "https://api.gopluslabs.io/api/v1/token_security/solana"
+    BATCH_SIZE = 20
+
+    def __init__(self, ttl: float = None, max_size: int = None, batch_window: float = None):
+        """
+        Initialize report source
+
+        Args:
+            ttl: Seconds a fetched report is reused
+            max_size: Max reports kept in memory (LRU)
+            batch_window: Seconds to wait for more lookups before sending a batch
+        """
+        self.ttl = ttl or settings.goplus_report_ttl_seconds
+        self.max_size = max_size or settings.rug_check_cache_size
+        self.batch_window = (
+            batch_window if batch_window is not None else settings.goplus_batch_window_ms / 1000
+        )
+        self._reports: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Lookups queued or in flight, per event loop
+        self._waiting: dict[str, asyncio.Future] = {}
+        self._queued: list[str] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+
+    def cached(self, mint: str) -> Optional[dict]:
+        """Cached report if still fresh"""
+        with self._lock:
+            entry = self._reports.get(mint)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                return None
+            self._reports.move_to_end(mint)
+            return entry[0]
+
+    async def get_report(self, mint: str) -> Optional[dict]:
+        """
+        Security report for a mint
+
+        Returns:
+            The GoPlus record ({} if GoPlus has none), or None if the
+            request failed
+        """
+        return (await self.get_reports([mint])).get(mint)
+
+    async def get_reports(self, mints: list[str]) -> dict[str, Optional[dict]]:
+        """Security reports for many mints (see get_report)"""
+        reports, waits = {}, {}
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures from another (probably closed) loop can't be awaited
+            self._waiting, self._queued, self._loop = {}, [], loop
+
+        for mint in dict.fromkeys(mints):
+            report = self.cached(mint)
+            if report is not None:
+                self.hits += 1
+                reports[mint] = report
+                continue
+            self.misses += 1
+            future = self._waiting.get(mint)
+            if future is None:
+                future = self._waiting[mint] = loop.create_future()
+                if not self._queued:
+                    loop.call_later(self.batch_window, self._flush)
+                self._queued.append(mint)
+            waits[mint] = future
+
+        for mint, future in waits.items():
+            reports[mint] = await asyncio.shield(future)
+        return reports
+
+    def _flush(self):
+        queued, self._queued = self._queued, []
+        for i in range(0, len(queued), self.BATCH_SIZE):
+            chunk = queued[i:i + self.BATCH_SIZE]
+            task = self._loop.create_task(self._fetch_chunk(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch_chunk(self, chunk: list[str]):
+        results: dict[str, Optional[dict]] = {}
+        try:
+            self.requests += 1
+            client = get_http_client('goplus')
+            response = await client.get(
+                self.SECURITY_API,
+                params={"contract_addresses": ",".join(chunk)}
+            )
+            if response.status_code == 200:
+                data = response.json().get('result') or {}
+                now = time.monotonic()
+                with self._lock:
+                    for mint in chunk:
+                        report = data.get(mint) or data.get(mint.lower()) or {}
+                        results[mint] = report
+                        self._reports[mint] = (report, now)
+                        self._reports.move_to_end(mint)
+                    while len(self._reports) > self.max_size:
+                        self._reports.popitem(last=False)
+            else:
+                logger.debug(f"GoPlus returned {response.status_code} for {len(chunk)} mints")
+        except Exception as e:
+            logger.debug(f"GoPlus security fetch failed: {e}")
+        finally:
+            for mint in chunk:
+                future = self._waiting.pop(mint, None)
+                if future is not None and not future.done():
+                    future.set_result(results.get(mint))
+
+    def invalidate(self, mint: str):
+        with self._lock:
+            self._reports.pop(mint, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._reports),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'requests': self.requests,
+        }
+
+
+# Global instance
+_goplus_security: Optional[GoPlusSecurity] = None
+_goplus_security_lock = threading.Lock()
+
+
+def get_goplus_security() -> GoPlusSecurity:
+    """Get global GoPlus security report source"""
+    global _goplus_security
+    if _goplus_security is None:
+        with _goplus_security_lock:
+            if _goplus_security is None:
+                _goplus_security = GoPlusSecurity()
+    return _goplus_security
@@ -0,0 +1,272 @@
+"""
+AlphaPulse Metadata Cache
+Per-mint token metadata cache with separate freshness per field group
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Field groups, by how fast they change
+IDENTITY = 'identity'        # name, symbol, decimals
+AUTHORITIES = 'authorities'  # mint / freeze authority
+SUPPLY = 'supply'            # total / circulating supply
+MARKET = 'market'            # price, market cap, liquidity, holders
+
+FIELD_GROUPS = (IDENTITY, AUTHORITIES, SUPPLY, MARKET)
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """
+    How long a field group is served from cache
+
+    Younger than ttl: fresh. Between ttl and max_stale: served stale
+    while a background refresh runs. Older: fetched before returning.
+    ttl None means the group never expires.
+    """
+    ttl: Optional[float]
+    max_stale: Optional[float] = None
+
+
+class MetadataCache:
+    """
+    Bounded LRU of per-mint field groups
+
+    Each entry holds the data of every group fetched for a mint plus the
+    time it was fetched; lookups classify groups as fresh, stale or
+    missing so the caller only fetches what it needs. Thread-safe.
+    """
+
+    # max_stale as a multiple of ttl
+    STALE_FACTOR = 4
+
+    # PersistentCache namespace
+    namespace = 'metadata'
+
+    def __init__(
+        self,
+        max_size: int = None,
+        authorities_ttl: float = None,
+        supply_ttl: float = None,
+        market_ttl: float = None
+    ):
+        self.max_size = max_size or settings.metadata_cache_size
+        authorities_ttl = authorities_ttl or settings.metadata_authorities_ttl_seconds
+        supply_ttl = supply_ttl or settings.metadata_supply_ttl_seconds
+        market_ttl = market_ttl or settings.metadata_market_ttl_seconds
+        self.policies: dict[str, FreshnessPolicy] = {
+            IDENTITY: FreshnessPolicy(ttl=None),
+            AUTHORITIES: FreshnessPolicy(authorities_ttl, authorities_ttl * self.STALE_FACTOR),
+            SUPPLY: FreshnessPolicy(supply_ttl, supply_ttl * self.STALE_FACTOR),
+            MARKET: FreshnessPolicy(market_ttl, market_ttl * self.STALE_FACTOR),
+        }
+
+        self._entries: OrderedDict[str, dict[str, tuple[dict, float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: set[tuple[str, str]] = set()
+        self._dirty: set[tuple[str, str]] = set()  # (mint, group) changed since last persisted
+        self._tasks: set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def lookup(
+        self,
+        mint: str,
+        groups: tuple = FIELD_GROUPS,
+        max_age: dict[str, float] = None
+    ) -> tuple[dict[str, dict], set[str], set[str]]:
+        """
+        Classify cached field groups for a mint
+
+        Args:
+            mint: Token mint address
+            groups: Field groups the caller needs
+            max_age: Optional per-group ttl override in seconds (no stale
+                     serving for overridden groups)
+
+        Returns:
+            (cached data by group, groups to fetch now, groups served stale)
+        """
+        now = time.monotonic()
+        data, missing, stale = {}, set(), set()
+        with self._lock:
+            entry = self._entries.get(mint)
+            if entry is not None:
+                self._entries.move_to_end(mint)
+
+            for group in groups:
+                cached = entry.get(group) if entry else None
+                if cached is None:
+                    missing.add(group)
+                    self.misses += 1
+                    continue
+
+                values, fetched_at = cached
+                policy = self.policies[group]
+                override = group in (max_age or {})
+                ttl = max_age[group] if override else policy.ttl
+                age = now - fetched_at
+                if ttl is None or age <= ttl:
+                    data[group] = values
+                    self.hits += 1
+                elif not override and policy.max_stale is not None and age <= policy.max_stale:
+                    data[group] = values
+                    stale.add(group)
+                    self.stale_hits += 1
+                else:
+                    missing.add(group)
+                    self.misses += 1
+        return data, missing, stale
+
+    def store(self, mint: str, groups: dict[str, dict]):
+        """Store freshly fetched field groups"""
+        if not groups:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(mint)
+            if entry is None:
+                entry = self._entries[mint] = {}
+            for group, values in groups.items():
+                entry[group] = (values, now)
+                self._dirty.add((mint, group))
+            self._entries.move_to_end(mint)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def revalidate(
+        self,
+        mint: str,
+        groups: set[str],
+        fetch: Callable[[str, set[str]], Awaitable[dict[str, dict]]]
+    ):
+        """Refresh stale groups in the background (at most one refresh per mint and group)"""
+        with self._lock:
+            groups = {g for g in groups if (mint, g) not in self._refreshing}
+            self._refreshing.update((mint, g) for g in groups)
+        if not groups:
+            return
+
+        async def refresh():
+            try:
+                self.store(mint, await fetch(mint, groups))
+                self.refreshes += 1
+            except Exception as e:
+                logger.debug(f"Background metadata refresh failed for {mint[:8]}...: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((mint, g) for g in groups)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def revalidate_many(
+        self,
+        mints: list[str],
+        group: str,
+        fetch: Callable[[list[str]], Awaitable[dict[str, dict]]]
+    ):
+        """Refresh one stale group for many mints with a single batch fetch in the background"""
+        with self._lock:
+            mints = [m for m in mints if (m, group) not in self._refreshing]
+            self._refreshing.update((m, group) for m in mints)
+        if not mints:
+            return
+
+        async def refresh():
+            try:
+                for mint, values in (await fetch(mints)).items():
+                    self.store(mint, {group: values})
+                self.refreshes += 1
+            except Exception as e:
+                logger.debug(f"Background {group} refresh failed for {len(mints)} mints: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((m, group) for m in mints)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def invalidate(self, mint: str):
+        with self._lock:
+            self._entries.pop(mint, None)
+
+    @property
+    def max_rows(self) -> int:
+        return self.max_size * len(FIELD_GROUPS)
+
+    def dirty_rows(self) -> list[tuple]:
+        """Groups stored since the last call, as PersistentCache rows"""
+        now_mono, now_wall = time.monotonic(), time.time()
+        rows = []
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for mint, group in dirty:
+                cached = self._entries.get(mint, {}).get(group)
+                if cached is None:
+                    continue  # evicted since
+                values, fetched_at = cached
+                stored_at = now_wall - (now_mono - fetched_at)
+                max_stale = self.policies[group].max_stale
+                expires_at = stored_at + max_stale if max_stale is not None else None
+                rows.append((f"{mint}:{group}", values, stored_at, expires_at))
+        return rows
+
+    def restore(self, rows: list[tuple]) -> int:
+        """Load persisted groups, keeping their original age"""
+        now_mono, now_wall = time.monotonic(), time.time()
+        restored = 0
+        with self._lock:
+            for key, values, stored_at, _ in rows:
+                mint, _, group = key.rpartition(':')
+                if group not in self.policies:
+                    continue
+                entry = self._entries.get(mint)
+                if entry is None:
+                    entry = self._entries[mint] = {}
+                entry[group] = (values, now_mono - max(0.0, now_wall - stored_at))
+                self._entries.move_to_end(mint)
+                restored += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return restored
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            'background_refreshes': self.refreshes,
+        }
+
+
+# Global instance
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Get global metadata cache instance"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache()
+    return _metadata_cache
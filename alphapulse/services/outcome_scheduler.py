@@ -0,0 +1,360 @@
+"""
+AlphaPulse Outcome Scheduler
+Checks every alert once per OutcomeTracker.CHECK_WINDOWS window, when it falls due
+"""
+
+import asyncio
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from alphapulse.config import settings
+from alphapulse.db.models import Alert, AlertOutcomeCheck, Token
+from alphapulse.services.outcome_tracker import (
+    OutcomeBatchLimit,
+    OutcomeTracker,
+    get_outcome_batch_limit,
+)
+from alphapulse.services.price_history import PriceHistory, epoch_seconds, get_price_history
+from alphapulse.services.token_metadata import TokenMetadataService
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OutcomeScheduler:
+    """
+    Due-time heap of (alert, window) outcome checks
+
+    schedule() pushes one entry per window when an alert is created; the
+    background task sleeps until the earliest entry is due (or a new one
+    jumps the queue), evaluates everything due with
+    OutcomeTracker.check_alerts and records one AlertOutcomeCheck row per
+    entry. Nothing scans the alerts table except warm() at startup, which
+    re-queues windows missed while the process was down. Alerted tokens
+    are watched by the price history sampler until their last window.
+
+    schedule() is thread-safe (alerts may be created on the webhook thread
+    pool); everything else runs on the event loop.
+    """
+
+    MAX_ATTEMPTS = 5  # Entries whose token can't be priced are retried, then dropped
+
+    def __init__(
+        self,
+        windows: list[int] = None,
+        token_service: TokenMetadataService = None,
+        batch_limit: OutcomeBatchLimit = None,
+        retry_seconds: float = None,
+        price_history: PriceHistory = None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            windows: Minutes after an alert to check it (defaults to CHECK_WINDOWS)
+            token_service: Metadata service used for pricing
+            batch_limit: Max entries evaluated per pass (adaptive)
+            retry_seconds: Delay before retrying an entry that failed
+            price_history: Price series store (watched tokens, ATH)
+        """
+        self.windows = sorted(windows or OutcomeTracker.CHECK_WINDOWS)
+        self.token_service = token_service or TokenMetadataService()
+        self.batch_limit = batch_limit or get_outcome_batch_limit()
+        self.retry_seconds = retry_seconds or settings.outcome_retry_seconds
+        self.price_history = price_history or get_price_history()
+
+        # (due wall-clock timestamp, alert id, window mins, alert created_at, attempts)
+        self._heap: list[tuple[float, int, int, datetime, int]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._session_factory: Optional[Callable[[], Session]] = None
+
+        self.recorded = 0
+        self.retried = 0
+        self.dropped = 0
+        self.lateness_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(
+        self,
+        alert_id: int,
+        created_at: datetime,
+        windows: list[int] = None,
+        mint: Optional[str] = None
+    ):
+        """
+        Queue outcome checks for an alert
+
+        Args:
+            alert_id: Alert primary key
+            created_at: Alert creation time (naive UTC, as stored)
+            windows: Subset of windows to queue (defaults to all)
+            mint: Alerted token, watched for price samples until the last window
+        """
+        base = epoch_seconds(created_at)
+        if mint:
+            self.price_history.watch(mint, base + self.windows[-1] * 60)
+        with self._lock:
+            earliest = self._heap[0][0] if self._heap else None
+            for window in windows or self.windows:
+                heapq.heappush(self._heap, (base + window * 60, alert_id, window, created_at, 0))
+            jumped = earliest is None or self._heap[0][0] < earliest
+        if jumped:
+            self._notify()
+
+    def unschedule(self, alert_id: int) -> int:
+        """
+        Drop queued checks for an alert that was deleted
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            kept = [entry for entry in self._heap if entry[1] != alert_id]
+            removed = len(self._heap) - len(kept)
+            if removed:
+                heapq.heapify(kept)
+                self._heap = kept
+        return removed
+
+    def _notify(self):
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    def warm(self, session: Session) -> int:
+        """
+        Queue windows not yet recorded for recent alerts
+
+        Only alerts younger than the longest window (plus a day's grace
+        for downtime) are considered; windows that passed while the
+        process was down are checked straight away.
+
+        Returns:
+            Number of entries queued
+        """
+        horizon = datetime.utcnow() - timedelta(minutes=self.windows[-1]) - timedelta(days=1)
+        alerts = session.query(Alert.id, Alert.created_at, Token.contract_address).join(
+            Token, Alert.token_id == Token.id
+        ).filter(
+            Alert.created_at >= horizon
+        ).all()
+        if not alerts:
+            return 0
+
+        done: dict[int, set[int]] = {}
+        for alert_id, window in session.query(
+            AlertOutcomeCheck.alert_id, AlertOutcomeCheck.window_mins
+        ).join(Alert).filter(Alert.created_at >= horizon):
+            done.setdefault(alert_id, set()).add(window)
+
+        queued = 0
+        for alert_id, created_at, mint in alerts:
+            missing = [w for w in self.windows if w not in done.get(alert_id, ())]
+            if missing:
+                self.schedule(alert_id, created_at, missing, mint=mint)
+                queued += len(missing)
+
+        logger.info(f"Outcome scheduler warmed with {queued} checks for {len(alerts)} recent alerts")
+        return queued
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest entry is due (<= 0 if overdue), None if empty"""
+        with self._lock:
+            if not self._heap:
+                return None
+            return self._heap[0][0] - time.time()
+
+    def _pop_due(self, limit: int) -> list[tuple]:
+        now = time.time()
+        entries = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(entries) < limit:
+                entries.append(heapq.heappop(self._heap))
+        return entries
+
+    async def run_due(self, session: Session) -> int:
+        """
+        Evaluate entries that are due, up to the batch limit, in one commit
+
+        Entries whose alert no longer exists (rolled back, or its id now
+        belongs to a newer alert) or whose window is already recorded are
+        dropped; entries whose token couldn't be priced are retried after
+        retry_seconds.
+
+        Returns:
+            Number of outcome rows recorded
+        """
+        started = time.monotonic()
+        entries = self._pop_due(self.batch_limit.value)
+        if not entries:
+            return 0
+        try:
+            return await self._check(session, entries, started)
+        except Exception:
+            session.rollback()
+            self._requeue(entries)
+            raise
+
+    async def _check(self, session: Session, entries: list[tuple], started: float) -> int:
+        alert_ids = {entry[1] for entry in entries}
+        alerts = {
+            alert.id: alert
+            for alert in session.query(Alert).options(joinedload(Alert.token)).filter(
+                Alert.id.in_(alert_ids)
+            )
+        }
+        existing = set(session.query(AlertOutcomeCheck.alert_id, AlertOutcomeCheck.window_mins).filter(
+            AlertOutcomeCheck.alert_id.in_(alert_ids)
+        ))
+
+        live = []
+        for entry in entries:
+            _, alert_id, window, created_at, _ = entry
+            alert = alerts.get(alert_id)
+            if alert is None or alert.created_at != created_at or (alert_id, window) in existing:
+                self.dropped += 1
+            else:
+                live.append(entry)
+
+        tracker = OutcomeTracker(
+            session,
+            token_service=self.token_service,
+            batch_limit=self.batch_limit,
+            price_history=self.price_history
+        )
+        outcomes = await tracker.check_alerts(
+            list({e[1]: alerts[e[1]] for e in live}.values()), scheduled=True
+        )
+
+        retry = []
+        now = time.time()
+        for entry in live:
+            due, alert_id, window, created_at, attempts = entry
+            outcome = outcomes.get(alert_id)
+            if outcome is None:
+                retry.append(entry)
+                continue
+            session.add(AlertOutcomeCheck(
+                alert_id=alert_id,
+                window_mins=window,
+                checked_at=outcome.checked_at,
+                status=outcome.status.value,
+                price_at_alert=outcome.price_at_alert,
+                price_usd=outcome.price_current,
+                return_pct=outcome.return_pct,
+                price_ath=outcome.price_ath,
+                time_to_ath_mins=outcome.time_to_ath_mins,
+                max_drawdown_pct=outcome.max_drawdown_pct
+            ))
+            self.lateness_total += max(0.0, now - due)
+        session.commit()
+
+        self._requeue(retry)
+        with self._lock:
+            overdue = sum(1 for entry in self._heap if entry[0] <= now)
+
+        written = len(live) - len(retry)
+        self.recorded += written
+        self.batch_limit.update(overdue, time.monotonic() - started)
+        logger.info(
+            f"Recorded {written} outcome checks for {len(outcomes)} alerts; "
+            f"{len(retry)} to retry, {overdue} overdue"
+        )
+        return written
+
+    def _requeue(self, entries: list[tuple]):
+        """Retry entries after retry_seconds, dropping those out of attempts"""
+        retry_at = time.time() + self.retry_seconds
+        with self._lock:
+            for due, alert_id, window, created_at, attempts in entries:
+                if attempts + 1 >= self.MAX_ATTEMPTS:
+                    self.dropped += 1
+                    logger.warning(f"Giving up on {window}m outcome for alert {alert_id}")
+                else:
+                    self.retried += 1
+                    heapq.heappush(self._heap, (retry_at, alert_id, window, created_at, attempts + 1))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, session_factory: Callable[[], Session]):
+        """
+        Start the background task on the running loop
+
+        Args:
+            session_factory: Returns a new database session per pass
+        """
+        if not self.running:
+            self._session_factory = session_factory
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+            logger.info(f"Outcome scheduler started ({len(self)} checks queued)")
+
+    async def stop(self):
+        """Stop the background task; queued entries are re-queued by warm() next start"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            # Clear before looking, so a schedule() in between still wakes us
+            self._wake.clear()
+            wait = self.next_due_in()
+            if wait is None or wait > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            session = self._session_factory()
+            try:
+                await self.run_due(session)
+            except Exception as e:
+                logger.error(f"Outcome check error: {e}")
+            finally:
+                session.close()
+
+    def stats(self) -> dict:
+        wait = self.next_due_in()
+        return {
+            'queued': len(self),
+            'next_due_seconds': round(wait, 1) if wait is not None else None,
+            'recorded': self.recorded,
+            'retried': self.retried,
+            'dropped': self.dropped,
+            'avg_lateness_seconds': round(self.lateness_total / self.recorded, 1) if self.recorded else 0.0,
+            'batch_limit': self.batch_limit.value,
+        }
+
+
+# Global instance
+_outcome_scheduler: Optional[OutcomeScheduler] = None
+_outcome_scheduler_lock = threading.Lock()
+
+
+def get_outcome_scheduler() -> OutcomeScheduler:
+    """Get global outcome scheduler"""
+    global _outcome_scheduler
+    if _outcome_scheduler is None:
+        with _outcome_scheduler_lock:
+            if _outcome_scheduler is None:
+                _outcome_scheduler = OutcomeScheduler()
+    return _outcome_scheduler
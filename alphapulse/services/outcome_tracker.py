@@ -3,16 +3,24 @@ AlphaPulse Outcome Tracker
 Tracks performance of alerts - did they result in profit?
 """
 
+import asyncio
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func
 
-from alphapulse.db.models import Alert, Token, Trade
-from alphapulse.services.token_metadata import TokenMetadataService
+from alphapulse.config import settings
+from alphapulse.db.models import Alert, Trade
+from alphapulse.services.token_metadata import TokenMetadataService, TokenMetadata
+from alphapulse.services.metadata_cache import SUPPLY, MARKET
+from alphapulse.services.price_history import PriceHistory, epoch_seconds, get_price_history
+from alphapulse.services.wallet_stats import WalletStatsTracker
 from alphapulse.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -50,6 +58,9 @@ class AlertOutcome:
     # Meta
     checked_at: datetime = None
 
+    # Worst fall from a running peak since the alert (%, <= 0)
+    max_drawdown_pct: float = 0.0
+
     def __post_init__(self):
         if self.checked_at is None:
             self.checked_at = datetime.utcnow()
@@ -76,6 +87,56 @@ class PerformanceStats:
     volume_spike_win_rate: float
 
 
+class OutcomeBatchLimit:
+    """
+    Adaptive limit on alerts evaluated per outcome pass
+
+    Doubles (up to maximum) while passes leave a backlog and finish
+    within target_seconds, halves when a pass overruns, and settles back
+    toward minimum once the backlog is gone.
+    """
+
+    def __init__(self, minimum: int = None, maximum: int = None, target_seconds: float = None):
+        self.minimum = minimum or settings.outcome_batch_min
+        self.maximum = max(maximum or settings.outcome_batch_max, self.minimum)
+        self.target_seconds = target_seconds or settings.outcome_batch_target_seconds
+        self.value = self.minimum
+
+    def update(self, backlog: int, elapsed: float) -> int:
+        """
+        Adjust after a pass
+
+        Args:
+            backlog: Alerts still due after the pass
+            elapsed: Seconds the pass took
+
+        Returns:
+            The limit for the next pass
+        """
+        if elapsed > self.target_seconds:
+            self.value = max(self.minimum, self.value // 2)
+        elif backlog > 0:
+            self.value = min(self.maximum, self.value * 2)
+        else:
+            self.value = max(self.minimum, self.value // 2)
+        return self.value
+
+
+# Global instance (outlives the per-pass OutcomeTracker)
+_outcome_batch_limit: Optional[OutcomeBatchLimit] = None
+_outcome_batch_limit_lock = threading.Lock()
+
+
+def get_outcome_batch_limit() -> OutcomeBatchLimit:
+    """Get global outcome batch limit"""
+    global _outcome_batch_limit
+    if _outcome_batch_limit is None:
+        with _outcome_batch_limit_lock:
+            if _outcome_batch_limit is None:
+                _outcome_batch_limit = OutcomeBatchLimit()
+    return _outcome_batch_limit
+
+
 class OutcomeTracker:
     """
     Tracks and analyzes alert outcomes
@@ -95,37 +156,85 @@ class OutcomeTracker:
     LOSS_THRESHOLD_PCT = -30  # <-30% loss = loser
     RUG_THRESHOLD_PCT = -80  # <-80% = probably rugged
 
-    def __init__(self, session: Session, token_service: TokenMetadataService = None):
+    # Alerts become due this long after they fire, and again after RECHECK
+    MIN_AGE_MINS = 30
+    RECHECK_HOURS = 4
+
+    def __init__(
+        self,
+        session: Session,
+        token_service: TokenMetadataService = None,
+        batch_limit: OutcomeBatchLimit = None,
+        price_history: PriceHistory = None
+    ):
         self.session = session
         self.token_service = token_service or TokenMetadataService()
-
-    async def check_alert_outcome(self, alert: Alert) -> AlertOutcome:
+        self.batch_limit = batch_limit or get_outcome_batch_limit()
+        self.price_history = price_history or get_price_history()
+        # Alerts still due after the last check_pending_alerts pass
+        self.backlog = 0
+
+    async def check_alert_outcome(
+        self,
+        alert: Alert,
+        metadata: Optional[TokenMetadata] = None
+    ) -> AlertOutcome:
         """
         Check the outcome of a single alert
 
         Args:
             alert: Alert record to check
+            metadata: Token metadata already fetched in bulk (looked up if omitted)
 
         Returns:
             AlertOutcome with current status
         """
         token = alert.token
-        alert_age_mins = (datetime.utcnow() - alert.created_at).total_seconds() / 60
+        if metadata is None:
+            metadata = await self.token_service.get_token_metadata(token.contract_address)
+        trades = self._trigger_trades(token.id, [alert])
+        outcome = self._evaluate(alert, metadata, trades)
+        self.session.commit()
+        return outcome
 
-        # Get current price
-        metadata = await self.token_service.get_token_metadata(token.contract_address)
+    def _trigger_trades(self, token_id: int, alerts: list[Alert]) -> list[Trade]:
+        """Trades within a minute of any of the token's alerts, oldest first, in one query"""
+        window = timedelta(minutes=1)
+        return self.session.query(Trade).filter(
+            Trade.token_id == token_id,
+            Trade.block_time >= min(a.created_at for a in alerts) - window,
+            Trade.block_time <= max(a.created_at for a in alerts) + window
+        ).order_by(Trade.block_time).all()
+
+    def _evaluate(
+        self,
+        alert: Alert,
+        metadata: TokenMetadata,
+        trades: list[Trade],
+        scheduled: bool = False
+    ) -> AlertOutcome:
+        """
+        Classify an alert and update its record (the caller commits)
+
+        Polled checks leave alerts younger than MIN_AGE_MINS pending.
+        A scheduled check is for a window that has already elapsed, so
+        it is classified whatever the alert's age.
+        """
+        token = alert.token
+        alert_age_mins = (datetime.utcnow() - alert.created_at).total_seconds() / 60
         current_price = metadata.price_usd
+        self.price_history.record(token.contract_address, current_price)
 
         # Get price at alert time (from mcap_at_trade of triggering trade)
-        trigger_trades = self.session.query(Trade).filter(
-            Trade.token_id == token.id,
-            Trade.block_time >= alert.created_at - timedelta(minutes=1),
-            Trade.block_time <= alert.created_at + timedelta(minutes=1)
-        ).all()
+        window = timedelta(minutes=1)
+        trigger = next(
+            (t for t in trades if abs(t.block_time - alert.created_at) <= window),
+            None
+        )
 
-        if trigger_trades and trigger_trades[0].mcap_at_trade:
+        if trigger is not None and trigger.mcap_at_trade:
             # Estimate price from mcap
-            price_at_alert = trigger_trades[0].mcap_at_trade / (metadata.total_supply or 1)
+            price_at_alert = trigger.mcap_at_trade / (metadata.total_supply or 1)
         else:
             price_at_alert = current_price  # Fallback
 
@@ -135,17 +244,20 @@ class OutcomeTracker:
         else:
             return_pct = 0
 
-        # Determine ATH (would need price history - simplified here)
-        price_ath = max(current_price, price_at_alert * 1.5)  # Placeholder
+        # ATH, time to ATH and drawdown from the price samples since the alert
+        price_ath, time_to_ath_mins, max_drawdown_pct = self._price_path(
+            token.contract_address, alert, price_at_alert, current_price
+        )
         ath_return_pct = ((price_ath - price_at_alert) / price_at_alert) * 100 if price_at_alert > 0 else 0
 
         # Determine status
-        if alert_age_mins < 30:
+        if alert_age_mins < self.MIN_AGE_MINS and not scheduled:
             status = OutcomeStatus.PENDING
         elif return_pct <= self.RUG_THRESHOLD_PCT:
             status = OutcomeStatus.RUGGED
+            if not token.is_rugged and settings.wallet_stats_enabled:
+                WalletStatsTracker(self.session).mark_rugged(token.id)
             token.is_rugged = True
-            self.session.commit()
         elif return_pct >= self.WIN_THRESHOLD_PCT:
             status = OutcomeStatus.WINNER
         elif return_pct <= self.LOSS_THRESHOLD_PCT:
@@ -162,40 +274,161 @@ class OutcomeTracker:
             price_ath=price_ath,
             return_pct=return_pct,
             ath_return_pct=ath_return_pct,
-            time_to_ath_mins=15,  # Placeholder
-            alert_age_mins=alert_age_mins
+            time_to_ath_mins=time_to_ath_mins,
+            alert_age_mins=alert_age_mins,
+            max_drawdown_pct=max_drawdown_pct
         )
 
-        # Update alert record
-        alert.outcome_pnl = return_pct
-        alert.outcome_checked_at = datetime.utcnow()
-        self.session.commit()
+        # Update alert record (early checks don't count as an outcome yet)
+        if alert_age_mins >= self.MIN_AGE_MINS:
+            alert.outcome_pnl = return_pct
+            alert.outcome_checked_at = datetime.utcnow()
 
-        logger.info(
+        logger.debug(
             f"Alert {alert.id} outcome: {status.value} "
             f"({return_pct:+.1f}% after {alert_age_mins:.0f}m)"
         )
 
         return outcome
 
-    async def check_pending_alerts(self) -> list[AlertOutcome]:
-        """Check all alerts that need outcome evaluation"""
-        # Get alerts older than 30 mins that haven't been checked recently
-        cutoff = datetime.utcnow() - timedelta(minutes=30)
-        recheck_cutoff = datetime.utcnow() - timedelta(hours=4)
+    def _price_path(
+        self,
+        mint: str,
+        alert: Alert,
+        price_at_alert: float,
+        current_price: float
+    ) -> tuple[float, float, float]:
+        """
+        (ATH, minutes from alert to ATH, max drawdown %) since the alert
 
-        alerts = self.session.query(Alert).filter(
+        The price at alert counts as the first point of the path, so a token
+        that only fell has its ATH at minute 0.
+        """
+        alert_ts = epoch_seconds(alert.created_at)
+        path = self.price_history.summary(mint, since=alert_ts)
+        if path is None:
+            price_ath = max(current_price, price_at_alert)
+            low = min(current_price, price_at_alert)
+            time_to_ath = 0.0 if price_ath == price_at_alert else (time.time() - alert_ts) / 60
+            drawdown = (low / price_ath - 1) * 100 if price_ath > 0 else 0.0
+            return price_ath, time_to_ath, drawdown
+
+        if price_at_alert >= path.ath:
+            price_ath, time_to_ath = price_at_alert, 0.0
+        else:
+            price_ath, time_to_ath = path.ath, max(0.0, path.ath_ts - alert_ts) / 60
+        drawdown = path.max_drawdown_pct
+        if price_at_alert > 0:
+            drawdown = min(drawdown, (path.low / price_at_alert - 1) * 100)
+        return price_ath, time_to_ath, drawdown
+
+    def _due_filter(self):
+        """Alerts old enough to judge that haven't been checked recently"""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(minutes=self.MIN_AGE_MINS)
+        recheck_cutoff = now - timedelta(hours=self.RECHECK_HOURS)
+        return (
             Alert.created_at <= cutoff,
             (Alert.outcome_checked_at == None) | (Alert.outcome_checked_at <= recheck_cutoff)
-        ).limit(50).all()
+        )
+
+    async def check_alerts(
+        self,
+        alerts: list[Alert],
+        scheduled: bool = False
+    ) -> dict[int, AlertOutcome]:
+        """
+        Evaluate many alerts, grouped by token (the caller commits)
+
+        Every token is priced once (one bulk metadata lookup, per-token
+        fallbacks for anything it missed) and its alerts share one
+        trigger-trade query. Tokens are evaluated concurrently, at most
+        outcome_check_concurrency at a time, each under
+        outcome_check_timeout_seconds so a slow provider only delays its
+        own alerts.
 
-        outcomes = []
+        Args:
+            alerts: Alert records, with their tokens loaded
+            scheduled: Checks for a due window (no MIN_AGE_MINS gate)
+
+        Returns:
+            Alert id -> outcome, for the alerts that could be evaluated
+        """
+        by_token: dict[int, list[Alert]] = defaultdict(list)
         for alert in alerts:
+            by_token[alert.token_id].append(alert)
+
+        # Price and supply for every alerted token in a few batched requests
+        mints = [group[0].token.contract_address for group in by_token.values()]
+        try:
+            metadata = await asyncio.wait_for(
+                self.token_service.get_token_metadata_many(mints, groups=(SUPPLY, MARKET)),
+                timeout=settings.outcome_check_timeout_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Bulk metadata for {len(mints)} alerted tokens failed: {e}")
+            metadata = {}
+
+        semaphore = asyncio.Semaphore(settings.outcome_check_concurrency)
+
+        async def check_token(group: list[Alert]) -> list[AlertOutcome]:
+            token = group[0].token
             try:
-                outcome = await self.check_alert_outcome(alert)
-                outcomes.append(outcome)
+                async with semaphore:
+                    token_metadata = metadata.get(token.contract_address)
+                    if token_metadata is None:
+                        token_metadata = await asyncio.wait_for(
+                            self.token_service.get_token_metadata(
+                                token.contract_address, groups=(SUPPLY, MARKET)
+                            ),
+                            timeout=settings.outcome_check_timeout_seconds
+                        )
+                    trades = self._trigger_trades(token.id, group)
+                    return [
+                        self._evaluate(alert, token_metadata, trades, scheduled)
+                        for alert in group
+                    ]
             except Exception as e:
-                logger.warning(f"Failed to check alert {alert.id}: {e}")
+                logger.warning(f"Failed to check {len(group)} alerts for {token.contract_address}: {e}")
+                return []
+
+        results = await asyncio.gather(*(check_token(group) for group in by_token.values()))
+        return {outcome.alert_id: outcome for group in results for outcome in group}
+
+    async def check_pending_alerts(self, limit: Optional[int] = None) -> list[AlertOutcome]:
+        """
+        Sweep the alerts table for alerts that need outcome evaluation
+
+        Due alerts are evaluated with check_alerts; those whose token
+        could not be priced stay due for the next pass. All updates are
+        written in one commit. The OutcomeScheduler checks alerts at
+        CHECK_WINDOWS without sweeping; this is the polling fallback.
+
+        Args:
+            limit: Max alerts this pass (defaults to the adaptive batch limit,
+                   which grows while a backlog remains)
+
+        Returns:
+            Outcomes for the alerts evaluated
+        """
+        started = time.monotonic()
+        limit = limit or self.batch_limit.value
+        due = self._due_filter()
+
+        alerts = self.session.query(Alert).options(joinedload(Alert.token)).filter(
+            *due
+        ).order_by(Alert.created_at).limit(limit).all()
+
+        outcomes = list((await self.check_alerts(alerts)).values())
+        self.session.commit()
+
+        self.backlog = self.session.query(func.count(Alert.id)).filter(*due).scalar() or 0
+        elapsed = time.monotonic() - started
+        next_limit = self.batch_limit.update(self.backlog, elapsed)
+        logger.info(
+            f"Checked {len(outcomes)}/{len(alerts)} alerts in {elapsed:.1f}s; "
+            f"{self.backlog} still due, next batch {next_limit}"
+        )
 
         return outcomes
 
@@ -210,13 +443,46 @@ class OutcomeTracker:
             PerformanceStats with win rates and returns
         """
         cutoff = datetime.utcnow() - timedelta(days=days)
-
-        alerts = self.session.query(Alert).filter(
-            Alert.created_at >= cutoff,
-            Alert.outcome_pnl != None
-        ).all()
-
-        if not alerts:
+        pnl = Alert.outcome_pnl
+        is_winner = pnl >= self.WIN_THRESHOLD_PCT
+        is_loser = pnl <= self.LOSS_THRESHOLD_PCT
+
+        # One range scan of the covering (created_at, alert_type, outcome_pnl)
+        # index, grouped by signal type. Grouping on an expression (alert_type
+        # is NOT NULL, so it's the same value) keeps SQLite from walking
+        # idx_alert_type_time for its order and reading every row instead.
+        alert_type = func.coalesce(Alert.alert_type, '')
+        rows = self.session.query(
+            alert_type,
+            func.count(pnl),
+            func.count(case((pnl == None, 1))),
+            func.count(case((is_winner, 1))),
+            func.count(case((is_loser, 1))),
+            func.count(case((pnl <= self.RUG_THRESHOLD_PCT, 1))),
+            func.sum(case((is_winner, pnl))),
+            func.sum(case((is_loser, pnl))),
+            func.max(pnl),
+            func.min(pnl)
+        ).filter(
+            Alert.created_at >= cutoff
+        ).group_by(alert_type).all()
+
+        by_type = {}
+        totals = dict(with_pnl=0, pending=0, winners=0, losers=0, rugged=0, win_sum=0.0, loss_sum=0.0)
+        best, worst = None, None
+        for alert_type, with_pnl, pending, winners, losers, rugged, win_sum, loss_sum, top, bottom in rows:
+            by_type[alert_type] = (winners, winners + losers)
+            for key, value in (
+                ('with_pnl', with_pnl), ('pending', pending), ('winners', winners),
+                ('losers', losers), ('rugged', rugged),
+                ('win_sum', win_sum or 0.0), ('loss_sum', loss_sum or 0.0)
+            ):
+                totals[key] += value
+            if top is not None:
+                best = top if best is None else max(best, top)
+                worst = bottom if worst is None else min(worst, bottom)
+
+        if not totals['with_pnl']:
             return PerformanceStats(
                 total_alerts=0, winners=0, losers=0, rugged=0, pending=0,
                 win_rate=0, avg_return_pct=0, avg_loss_pct=0,
@@ -224,46 +490,22 @@ class OutcomeTracker:
                 high_conviction_win_rate=0, cluster_buy_win_rate=0, volume_spike_win_rate=0
             )
 
-        # Categorize
-        winners = [a for a in alerts if a.outcome_pnl >= self.WIN_THRESHOLD_PCT]
-        losers = [a for a in alerts if a.outcome_pnl <= self.LOSS_THRESHOLD_PCT]
-        rugged = [a for a in alerts if a.outcome_pnl <= self.RUG_THRESHOLD_PCT]
-
-        # Calculate stats
-        resolved = len(winners) + len(losers)
-        win_rate = (len(winners) / resolved * 100) if resolved > 0 else 0
+        winners, losers = totals['winners'], totals['losers']
+        resolved = winners + losers
 
-        winner_returns = [a.outcome_pnl for a in winners]
-        loser_returns = [a.outcome_pnl for a in losers]
-
-        avg_return = sum(winner_returns) / len(winner_returns) if winner_returns else 0
-        avg_loss = sum(loser_returns) / len(loser_returns) if loser_returns else 0
-
-        all_returns = [a.outcome_pnl for a in alerts]
-        best = max(all_returns) if all_returns else 0
-        worst = min(all_returns) if all_returns else 0
-
-        # By signal type
         def win_rate_for_type(alert_type: str) -> float:
-            type_alerts = [a for a in alerts if a.alert_type == alert_type]
-            type_winners = [a for a in type_alerts if a.outcome_pnl >= self.WIN_THRESHOLD_PCT]
-            type_resolved = len([a for a in type_alerts if a.outcome_pnl <= self.LOSS_THRESHOLD_PCT]) + len(type_winners)
-            return (len(type_winners) / type_resolved * 100) if type_resolved > 0 else 0
-
-        pending_count = self.session.query(Alert).filter(
-            Alert.created_at >= cutoff,
-            Alert.outcome_pnl == None
-        ).count()
+            type_winners, type_resolved = by_type.get(alert_type, (0, 0))
+            return (type_winners / type_resolved * 100) if type_resolved > 0 else 0
 
         return PerformanceStats(
-            total_alerts=len(alerts) + pending_count,
-            winners=len(winners),
-            losers=len(losers),
-            rugged=len(rugged),
-            pending=pending_count,
-            win_rate=win_rate,
-            avg_return_pct=avg_return,
-            avg_loss_pct=avg_loss,
+            total_alerts=totals['with_pnl'] + totals['pending'],
+            winners=winners,
+            losers=losers,
+            rugged=totals['rugged'],
+            pending=totals['pending'],
+            win_rate=(winners / resolved * 100) if resolved > 0 else 0,
+            avg_return_pct=totals['win_sum'] / winners if winners else 0,
+            avg_loss_pct=totals['loss_sum'] / losers if losers else 0,
             best_return_pct=best,
             worst_loss_pct=worst,
             high_conviction_win_rate=win_rate_for_type('high_conviction'),
@@ -0,0 +1,299 @@
+"""
+AlphaPulse Persistent Cache
+On-disk copy of provider caches so restarts come back warm
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Protocol
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (key, value, stored_at, expires_at) - times are wall-clock epoch seconds,
+# expires_at None for entries that never expire
+Row = tuple[str, dict, float, Optional[float]]
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value store with per-entry expiry
+
+    Entries live in namespaces (one per in-memory cache). Values are JSON.
+    Expired rows are skipped on load and removed by compact(). Safe to use
+    from several threads.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Initialize store
+
+        Args:
+            path: SQLite file (created if missing; ':memory:' for tests)
+        """
+        self.path = path or settings.persistent_cache_path
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_expires ON cache_entries (expires_at)"
+            )
+
+    def put_many(self, namespace: str, rows: Iterable[Row]) -> int:
+        """Insert or replace entries in one transaction; returns the number written"""
+        params = [
+            (namespace, key, json.dumps(value), stored_at, expires_at)
+            for key, value, stored_at, expires_at in rows
+        ]
+        if not params:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)", params
+                )
+        return len(params)
+
+    def load(self, namespace: str, limit: int = None) -> list[Row]:
+        """
+        Unexpired entries of a namespace, oldest first
+
+        Args:
+            limit: Keep only the most recently stored entries
+        """
+        query = (
+            "SELECT key, value, stored_at, expires_at FROM cache_entries "
+            "WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?) "
+            "ORDER BY stored_at DESC"
+        )
+        params = [namespace, time.time()]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        entries = []
+        for key, value, stored_at, expires_at in reversed(rows):
+            try:
+                entries.append((key, json.loads(value), stored_at, expires_at))
+            except ValueError:
+                continue
+        return entries
+
+    def delete(self, namespace: str, keys: Iterable[str]):
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    [(namespace, key) for key in keys]
+                )
+
+    def count(self, namespace: str = None) -> int:
+        with self._lock:
+            if namespace is None:
+                return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    def size_bytes(self) -> int:
+        if self.path == ':memory:':
+            return 0
+        return sum(
+            os.path.getsize(p) for p in (self.path, f"{self.path}-wal") if os.path.exists(p)
+        )
+
+    def compact(self, max_entries: dict[str, int] = None, vacuum: bool = True) -> dict:
+        """
+        Drop expired entries, trim namespaces to their size limit and reclaim space
+
+        Args:
+            max_entries: Namespace -> entries to keep (most recently stored)
+            vacuum: Rewrite the file afterwards so freed pages go back to the OS
+
+        Returns:
+            {'expired': n, 'trimmed': n, 'size_bytes': n}
+        """
+        with self._lock:
+            with self._conn:
+                expired = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (time.time(),)
+                ).rowcount
+                trimmed = 0
+                for namespace, limit in (max_entries or {}).items():
+                    trimmed += self._conn.execute(
+                        """
+                        DELETE FROM cache_entries WHERE namespace = ? AND key NOT IN (
+                            SELECT key FROM cache_entries WHERE namespace = ?
+                            ORDER BY stored_at DESC LIMIT ?
+                        )
+                        """,
+                        (namespace, namespace, limit)
+                    ).rowcount
+            if vacuum and (expired or trimmed):
+                # VACUUM goes through the WAL; checkpoint so the file shrinks
+                self._conn.execute("VACUUM")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {'expired': expired, 'trimmed': trimmed, 'size_bytes': self.size_bytes()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Persistable(Protocol):
+    """An in-memory cache that can be saved to and restored from a PersistentCache"""
+    namespace: str
+    max_rows: int  # Rows worth keeping on disk (and restoring)
+
+    def dirty_rows(self) -> list[Row]:
+        """Entries changed since the last call"""
+        ...
+
+    def restore(self, rows: list[Row]) -> int:
+        """Load persisted entries; returns the number restored"""
+        ...
+
+
+class CachePersister:
+    """
+    Keeps in-memory caches and a PersistentCache in sync
+
+    warm() restores every registered cache at startup. While running, a
+    background task writes changed entries every flush_interval seconds
+    (off the event loop) and compacts the file every compact_interval
+    seconds; stop() does a final flush.
+    """
+
+    def __init__(
+        self,
+        store: PersistentCache,
+        caches: list[Persistable],
+        flush_interval: float = None,
+        compact_interval: float = None
+    ):
+        self.store = store
+        self.caches = caches
+        self.flush_interval = flush_interval or settings.persistent_cache_flush_seconds
+        self.compact_interval = compact_interval or settings.persistent_cache_compact_minutes * 60
+        self._task: Optional[asyncio.Task] = None
+        self._last_compact = time.monotonic()
+
+        self.restored = 0
+        self.written = 0
+        self.last_compaction: Optional[dict] = None
+
+    def warm(self) -> int:
+        """Restore every cache from disk; returns the number of entries restored"""
+        start = time.perf_counter()
+        restored = 0
+        for cache in self.caches:
+            try:
+                restored += cache.restore(self.store.load(cache.namespace, limit=cache.max_rows))
+            except Exception as e:
+                logger.warning(f"Failed to restore {cache.namespace} cache: {e}")
+        self.restored += restored
+        logger.info(
+            f"Restored {restored} cache entries from {self.store.path} "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return restored
+
+    def flush(self) -> int:
+        """Write changed entries of every cache; returns the number written"""
+        written = 0
+        for cache in self.caches:
+            try:
+                written += self.store.put_many(cache.namespace, cache.dirty_rows())
+            except Exception as e:
+                logger.warning(f"Failed to persist {cache.namespace} cache: {e}")
+        self.written += written
+        return written
+
+    def compact(self) -> dict:
+        self.last_compaction = self.store.compact(
+            max_entries={cache.namespace: cache.max_rows for cache in self.caches}
+        )
+        self._last_compact = time.monotonic()
+        logger.info(f"Compacted persistent cache: {self.last_compaction}")
+        return self.last_compaction
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flush/compaction task on the running loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and write what is left"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+                if time.monotonic() - self._last_compact >= self.compact_interval:
+                    await asyncio.to_thread(self.compact)
+            except Exception as e:
+                logger.error(f"Persistent cache maintenance error: {e}")
+
+    def stats(self) -> dict:
+        return {
+            'path': self.store.path,
+            'entries': self.store.count(),
+            'size_bytes': self.store.size_bytes(),
+            'restored': self.restored,
+            'written': self.written,
+            'last_compaction': self.last_compaction,
+        }
+
+
+# Global instance
+_cache_persister: Optional[CachePersister] = None
+
+
+def get_cache_persister() -> CachePersister:
+    """Get global persister for the metadata, rug-check and price history caches"""
+    global _cache_persister
+    if _cache_persister is None:
+        from alphapulse.services.metadata_cache import get_metadata_cache
+        from alphapulse.services.price_history import get_price_history
+        from alphapulse.services.rug_detector import get_rug_result_cache
+        _cache_persister = CachePersister(
+            PersistentCache(),
+            [get_metadata_cache(), get_rug_result_cache(), get_price_history()]
+        )
+    return _cache_persister
@@ -7,12 +7,14 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
 from alphapulse.db.models import SmartWallet, Token
 from alphapulse.config import settings
 from alphapulse.utils.logger import get_logger
+from alphapulse.utils.http_clients import get_http_client
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.token_metadata import TokenMetadataService
 
 logger = get_logger(__name__)
 
@@ -80,10 +82,16 @@ class PositionTracker:
     Uses Helius DAS API to fetch token balances
     """
 
-    def __init__(self, session: Session, helius_api_key: str = None):
+    def __init__(
+        self,
+        session: Session,
+        helius_api_key: str = None,
+        token_service: TokenMetadataService = None
+    ):
         self.session = session
         self.helius_api_key = helius_api_key or settings.helius_api_key
         self.helius_url = f"https://mainnet.helius-rpc.com/?api-key={self.helius_api_key}"
+        self.token_service = token_service or TokenMetadataService()
 
     async def get_wallet_portfolio(self, wallet_address: str) -> WalletPortfolio:
         """
@@ -101,50 +109,11 @@ class PositionTracker:
         # Fetch SOL balance
         sol_balance = await self._fetch_sol_balance(wallet_address)
 
-        # Build positions
-        positions = []
-        total_value = 0.0
-
-        for account in token_accounts:
-            mint = account.get('mint')
-            amount = float(account.get('amount', 0))
-            decimals = account.get('decimals', 9)
-
-            if amount == 0:
-                continue
-
-            # Get token info
-            token_info = await self._get_token_info(mint)
-            balance = amount / (10 ** decimals)
-            current_price = token_info.get('price_usd', 0)
-            current_value = balance * current_price
-
-            # Get entry info from our trade history
-            entry_info = self._get_entry_info(wallet_address, mint)
-
-            position = TokenPosition(
-                token_address=mint,
-                token_symbol=token_info.get('symbol'),
-                token_name=token_info.get('name'),
-                balance=balance,
-                balance_usd=current_value,
-                avg_entry_price=entry_info.get('avg_price', current_price),
-                total_cost_usd=entry_info.get('total_cost', current_value),
-                current_price=current_price,
-                current_value_usd=current_value,
-                unrealized_pnl_usd=current_value - entry_info.get('total_cost', current_value),
-                unrealized_pnl_pct=self._calc_pnl_pct(
-                    entry_info.get('total_cost', current_value),
-                    current_value
-                ),
-                first_buy_at=entry_info.get('first_buy'),
-                last_activity_at=entry_info.get('last_activity')
-            )
-            positions.append(position)
-            total_value += current_value
+        # One batched price lookup for every held mint
+        prices = await self.token_service.get_prices(a.get('mint') for a in token_accounts)
 
-        # Sort by value descending
-        positions.sort(key=lambda p: p.current_value_usd, reverse=True)
+        positions = self._build_positions(wallet_address, token_accounts, prices)
+        total_value = sum(p.current_value_usd for p in positions)
 
         # Get wallet tag from DB
         wallet = self.session.query(SmartWallet).filter(
@@ -172,42 +141,41 @@ class PositionTracker:
     async def _fetch_token_accounts(self, wallet: str) -> list[dict]:
         """Fetch all token accounts for a wallet using Helius DAS"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.helius_url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": "alphapulse",
-                        "method": "getAssetsByOwner",
-                        "params": {
-                            "ownerAddress": wallet,
-                            "page": 1,
-                            "limit": 100,
-                            "displayOptions": {
-                                "showFungible": True,
-                                "showNativeBalance": True
-                            }
+            client = get_http_client('helius')
+            response = await client.post(
+                self.helius_url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getAssetsByOwner",
+                    "params": {
+                        "ownerAddress": wallet,
+                        "page": 1,
+                        "limit": 100,
+                        "displayOptions": {
+                            "showFungible": True,
+                            "showNativeBalance": True
                         }
-                    },
-                    timeout=15
-                )
-                data = response.json()
-                items = data.get('result', {}).get('items', [])
-
-                # Filter for fungible tokens only
-                token_accounts = []
-                for item in items:
-                    if item.get('interface') == 'FungibleToken':
-                        token_info = item.get('token_info', {})
-                        token_accounts.append({
-                            'mint': item.get('id'),
-                            'amount': token_info.get('balance', 0),
-                            'decimals': token_info.get('decimals', 9),
-                            'symbol': token_info.get('symbol'),
-                            'price_info': token_info.get('price_info', {})
-                        })
-
-                return token_accounts
+                    }
+                }
+            )
+            data = response.json()
+            items = data.get('result', {}).get('items', [])
+
+            # Filter for fungible tokens only
+            token_accounts = []
+            for item in items:
+                if item.get('interface') == 'FungibleToken':
+                    token_info = item.get('token_info', {})
+                    token_accounts.append({
+                        'mint': item.get('id'),
+                        'amount': token_info.get('balance', 0),
+                        'decimals': token_info.get('decimals', 9),
+                        'symbol': token_info.get('symbol'),
+                        'price_info': token_info.get('price_info', {})
+                    })
+
+            return token_accounts
         except Exception as e:
             logger.warning(f"Failed to fetch token accounts: {e}")
             return []
@@ -215,44 +183,73 @@ class PositionTracker:
     async def _fetch_sol_balance(self, wallet: str) -> float:
         """Fetch native SOL balance"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.helius_url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": "alphapulse",
-                        "method": "getBalance",
-                        "params": [wallet]
-                    },
-                    timeout=10
-                )
-                data = response.json()
-                lamports = data.get('result', {}).get('value', 0)
-                return lamports / 1e9
+            client = get_http_client('helius')
+            response = await client.post(
+                self.helius_url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getBalance",
+                    "params": [wallet]
+                }
+            )
+            data = response.json()
+            lamports = data.get('result', {}).get('value', 0)
+            return lamports / 1e9
         except Exception as e:
             logger.warning(f"Failed to fetch SOL balance: {e}")
             return 0.0
 
-    async def _get_token_info(self, mint: str) -> dict:
-        """Get basic token info with price"""
-        try:
-            async with httpx.AsyncClient() as client:
-                # Jupiter price API
-                response = await client.get(
-                    "https://price.jup.ag/v6/price",
-                    params={"ids": mint},
-                    timeout=5
-                )
-                data = response.json()
-                price_data = data.get('data', {}).get(mint, {})
-
-                return {
-                    'symbol': price_data.get('symbol', '???'),
-                    'name': price_data.get('symbol', 'Unknown'),
-                    'price_usd': price_data.get('price', 0)
-                }
-        except Exception:
-            return {'symbol': '???', 'name': 'Unknown', 'price_usd': 0}
+    def _build_positions(
+        self,
+        wallet_address: str,
+        token_accounts: list[dict],
+        prices: dict[str, dict]
+    ) -> list[TokenPosition]:
+        """Build positions, sorted by value descending, from token accounts and batch prices"""
+        positions = []
+
+        for account in token_accounts:
+            mint = account.get('mint')
+            amount = float(account.get('amount', 0))
+            decimals = account.get('decimals', 9)
+
+            if amount == 0:
+                continue
+
+            # Get token info
+            price_data = prices.get(mint, {})
+            symbol = price_data.get('symbol') or account.get('symbol')
+            balance = amount / (10 ** decimals)
+            current_price = price_data.get('price_usd', 0)
+            current_value = balance * current_price
+
+            # Get entry info from our trade history
+            entry_info = self._get_entry_info(wallet_address, mint)
+
+            position = TokenPosition(
+                token_address=mint,
+                token_symbol=symbol or '???',
+                token_name=symbol or 'Unknown',
+                balance=balance,
+                balance_usd=current_value,
+                avg_entry_price=entry_info.get('avg_price', current_price),
+                total_cost_usd=entry_info.get('total_cost', current_value),
+                current_price=current_price,
+                current_value_usd=current_value,
+                unrealized_pnl_usd=current_value - entry_info.get('total_cost', current_value),
+                unrealized_pnl_pct=self._calc_pnl_pct(
+                    entry_info.get('total_cost', current_value),
+                    current_value
+                ),
+                first_buy_at=entry_info.get('first_buy'),
+                last_activity_at=entry_info.get('last_activity')
+            )
+            positions.append(position)
+
+        # Sort by value descending
+        positions.sort(key=lambda p: p.current_value_usd, reverse=True)
+        return positions
 
     def _get_entry_info(self, wallet_address: str, token_mint: str) -> dict:
         """Get entry info from our trade history"""
@@ -306,20 +303,8 @@ class PositionTracker:
         }
 
     async def _get_sol_price(self) -> float:
-        """Get current SOL price in USD"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://price.jup.ag/v6/price",
-                    params={"ids": "So11111111111111111111111111111111111111112"},
-                    timeout=5
-                )
-                data = response.json()
-                return data.get('data', {}).get(
-                    'So11111111111111111111111111111111111111112', {}
-                ).get('price', 150)
-        except Exception:
-            return 150
+        """Get current SOL price in USD (from the shared ticker)"""
+        return await get_sol_price_ticker().get_price()
 
     @staticmethod
     def _calc_pnl_pct(cost: float, value: float) -> float:
@@ -340,13 +325,25 @@ class PositionTracker:
             SmartWallet.is_active == True
         ).all()
 
+        # Fetch holdings first so prices for the union of mints come from
+        # one batched lookup instead of one request per position
+        holdings = []
+        for wallet in wallets[:50]:  # Limit for API rate limits
+            token_accounts = await self._fetch_token_accounts(wallet.address)
+            if token_accounts:
+                holdings.append((wallet, token_accounts))
+
+        prices = await self.token_service.get_prices(
+            a.get('mint') for _, accounts in holdings for a in accounts
+        )
+
         # Track token holdings across wallets
         token_holders = {}
 
-        for wallet in wallets[:50]:  # Limit for API rate limits
+        for wallet, token_accounts in holdings:
             try:
-                portfolio = await self.get_wallet_portfolio(wallet.address)
-                for pos in portfolio.positions:
+                positions = self._build_positions(wallet.address, token_accounts, prices)
+                for pos in positions:
                     if pos.token_address not in token_holders:
                         token_holders[pos.token_address] = {
                             'symbol': pos.token_symbol,
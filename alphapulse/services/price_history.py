@@ -0,0 +1,341 @@
+"""
+AlphaPulse Price History
+Compact per-token USD price series for ATH, drawdown and time-to-ATH
+"""
+
+import asyncio
+import base64
+import operator
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import accumulate
+from typing import Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_seconds(value: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime (as stored in the database)"""
+    return (value - _EPOCH).total_seconds()
+
+
+@dataclass
+class PriceSummary:
+    """Price path of a token over a time range"""
+    samples: int
+    first_price: float
+    last_price: float
+    ath: float
+    ath_ts: float  # Epoch seconds
+    low: float
+    max_drawdown_pct: float  # Worst fall from a running peak, <= 0
+
+
+class _Series:
+    """Parallel append-only arrays of epoch seconds and USD prices"""
+
+    __slots__ = ('ts', 'price')
+
+    def __init__(self, ts: array = None, price: array = None):
+        self.ts = ts if ts is not None else array('d')
+        self.price = price if price is not None else array('d')
+
+    def add(self, ts: float, price: float):
+        if not self.ts or ts >= self.ts[-1]:
+            self.ts.append(ts)
+            self.price.append(price)
+        else:
+            # Late sample (e.g. an out-of-order swap): keep time order
+            i = bisect_right(self.ts, ts)
+            self.ts.insert(i, ts)
+            self.price.insert(i, price)
+
+    def trim(self, max_samples: int, oldest: float):
+        """Drop samples older than `oldest`, then the oldest beyond max_samples"""
+        cut = max(bisect_left(self.ts, oldest), len(self.ts) - max_samples)
+        if cut > 0:
+            del self.ts[:cut]
+            del self.price[:cut]
+
+
+class PriceHistory:
+    """
+    Per-token USD price samples
+
+    Each token keeps two array('d') columns (8 bytes per value), fed by
+    observed swaps, the periodic sampler for watched tokens (those with
+    open alerts) and outcome checks. Summaries scan a time slice with
+    C-level builtins (max/min/index, itertools.accumulate) rather than
+    Python loops. Bounded by max_tokens (LRU) x max_samples and a
+    retention window; persisted through the CachePersister.
+    Thread-safe (swaps are recorded on the webhook thread pool).
+    """
+
+    # PersistentCache namespace
+    namespace = 'price_history'
+
+    def __init__(
+        self,
+        max_tokens: int = None,
+        max_samples: int = None,
+        retention_seconds: float = None,
+        sample_interval: float = None
+    ):
+        """
+        Initialize store
+
+        Args:
+            max_tokens: Max tokens with a series (least recently sampled evicted)
+            max_samples: Max samples kept per token (oldest dropped)
+            retention_seconds: Samples older than this are dropped
+            sample_interval: Seconds between sampler passes over watched tokens
+        """
+        self.max_tokens = max_tokens or settings.price_history_max_tokens
+        self.max_samples = max_samples or settings.price_history_max_samples
+        self.retention = retention_seconds or settings.price_history_retention_hours * 3600
+        self.sample_interval = sample_interval or settings.price_sample_interval_seconds
+
+        self._series: OrderedDict[str, _Series] = OrderedDict()
+        self._watched: dict[str, float] = {}  # mint -> watch until (epoch seconds)
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        self.samples_recorded = 0
+        self.sampler_passes = 0
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def record(self, mint: str, price: float, ts: float = None):
+        """
+        Add a price sample
+
+        Args:
+            mint: Token mint address
+            price: Price in USD (non-positive prices are ignored)
+            ts: Epoch seconds (defaults to now)
+        """
+        if not mint or not price or price <= 0:
+            return
+        ts = ts if ts is not None else time.time()
+        with self._lock:
+            series = self._series.get(mint)
+            if series is None:
+                series = self._series[mint] = _Series()
+            series.add(ts, float(price))
+            if len(series.ts) > self.max_samples:
+                series.trim(self.max_samples, ts - self.retention)
+            self._series.move_to_end(mint)
+            while len(self._series) > self.max_tokens:
+                evicted, _ = self._series.popitem(last=False)
+                self._dirty.discard(evicted)
+            self._dirty.add(mint)
+            self.samples_recorded += 1
+
+    def summary(self, mint: str, since: float, until: float = None) -> Optional[PriceSummary]:
+        """
+        ATH, low and max drawdown over [since, until]
+
+        Args:
+            mint: Token mint address
+            since: Start of the range (epoch seconds)
+            until: End of the range (defaults to the last sample)
+
+        Returns:
+            PriceSummary, or None without samples in the range
+        """
+        with self._lock:
+            series = self._series.get(mint)
+            if series is None:
+                return None
+            lo = bisect_left(series.ts, since)
+            hi = len(series.ts) if until is None else bisect_right(series.ts, until)
+            if lo >= hi:
+                return None
+            prices = series.price[lo:hi]
+            times = series.ts[lo:hi]
+
+        ath = max(prices)
+        peaks = accumulate(prices, max)
+        drawdown = min(map(operator.truediv, prices, peaks))
+        return PriceSummary(
+            samples=len(prices),
+            first_price=prices[0],
+            last_price=prices[-1],
+            ath=ath,
+            ath_ts=times[prices.index(ath)],
+            low=min(prices),
+            max_drawdown_pct=(drawdown - 1) * 100
+        )
+
+    def series(self, mint: str) -> tuple[array, array]:
+        """Copy of a token's (timestamps, prices)"""
+        with self._lock:
+            series = self._series.get(mint)
+            if series is None:
+                return array('d'), array('d')
+            return array('d', series.ts), array('d', series.price)
+
+    def watch(self, mint: str, until: float):
+        """Sample a token's price every sample_interval until `until` (epoch seconds)"""
+        with self._lock:
+            self._watched[mint] = max(until, self._watched.get(mint, 0.0))
+
+    def watched(self) -> list[str]:
+        """Tokens currently watched (expired watches are dropped)"""
+        now = time.time()
+        with self._lock:
+            for mint in [m for m, until in self._watched.items() if until < now]:
+                del self._watched[mint]
+            return list(self._watched)
+
+    async def sample(self, token_service) -> int:
+        """
+        Record current prices of watched tokens, in one batched lookup
+
+        Args:
+            token_service: TokenMetadataService used for get_prices
+
+        Returns:
+            Number of samples recorded
+        """
+        mints = self.watched()
+        if not mints:
+            return 0
+        prices = await token_service.get_prices(mints, max_age=self.sample_interval / 2)
+        now = time.time()
+        for mint, price in prices.items():
+            self.record(mint, price.get('price_usd'), now)
+        self.sampler_passes += 1
+        return len(prices)
+
+    def prune(self) -> int:
+        """Drop samples past retention and tokens left empty; returns tokens dropped"""
+        oldest = time.time() - self.retention
+        with self._lock:
+            empty = []
+            for mint, series in self._series.items():
+                series.trim(self.max_samples, oldest)
+                if not series.ts:
+                    empty.append(mint)
+            for mint in empty:
+                del self._series[mint]
+                self._dirty.discard(mint)
+        return len(empty)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, token_service):
+        """Start the background sampler on the running loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run(token_service))
+            logger.info(f"Price sampler started (every {self.sample_interval}s)")
+
+    async def stop(self):
+        """Stop the background sampler"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, token_service):
+        while True:
+            try:
+                await self.sample(token_service)
+                self.prune()
+            except Exception as e:
+                logger.warning(f"Price sampling failed: {e}")
+            await asyncio.sleep(self.sample_interval)
+
+    @property
+    def max_rows(self) -> int:
+        return self.max_tokens
+
+    def dirty_rows(self) -> list[tuple]:
+        """Series changed since the last call, as PersistentCache rows"""
+        rows = []
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for mint in dirty:
+                series = self._series.get(mint)
+                if series is None or not series.ts:
+                    continue
+                value = {
+                    'ts': base64.b64encode(series.ts.tobytes()).decode(),
+                    'price': base64.b64encode(series.price.tobytes()).decode(),
+                }
+                last = series.ts[-1]
+                rows.append((mint, value, last, last + self.retention))
+        return rows
+
+    def restore(self, rows: list[tuple]) -> int:
+        """Load persisted series, merging with anything recorded since startup"""
+        oldest = time.time() - self.retention
+        restored = 0
+        with self._lock:
+            for mint, value, _, _ in rows:
+                try:
+                    ts, price = array('d'), array('d')
+                    ts.frombytes(base64.b64decode(value['ts']))
+                    price.frombytes(base64.b64decode(value['price']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if len(ts) != len(price):
+                    continue
+                series = _Series(ts, price)
+                current = self._series.get(mint)
+                if current is not None:
+                    for sample in zip(current.ts, current.price):
+                        series.add(*sample)
+                series.trim(self.max_samples, oldest)
+                if series.ts:
+                    self._series[mint] = series
+                    self._series.move_to_end(mint)
+                    restored += 1
+            while len(self._series) > self.max_tokens:
+                self._series.popitem(last=False)
+        return restored
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sum(len(s.ts) for s in self._series.values())
+            watched = len(self._watched)
+        return {
+            'tokens': len(self._series),
+            'samples': samples,
+            'memory_kib': round(samples * 16 / 1024, 1),
+            'watched': watched,
+            'recorded': self.samples_recorded,
+            'sampler_passes': self.sampler_passes,
+        }
+
+
+# Global instance
+_price_history: Optional[PriceHistory] = None
+_price_history_lock = threading.Lock()
+
+
+def get_price_history() -> PriceHistory:
+    """Get global price history"""
+    global _price_history
+    if _price_history is None:
+        with _price_history_lock:
+            if _price_history is None:
+                _price_history = PriceHistory()
+    return _price_history
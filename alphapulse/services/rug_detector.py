@@ -3,16 +3,20 @@ AlphaPulse Rug Pull Detection
 Identifies potential scam tokens before alerting
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import AsyncIterator, Iterable, Optional
 from datetime import datetime, timedelta
 from enum import Enum
 
-import httpx
-
 from alphapulse.services.token_metadata import TokenMetadataService, TokenMetadata
 from alphapulse.config import settings
 from alphapulse.utils.logger import get_logger
+from alphapulse.services.goplus import GoPlusSecurity, get_goplus_security
+from alphapulse.services.copycat_index import CopycatIndex, get_copycat_index
 
 logger = get_logger(__name__)
 
@@ -52,6 +56,185 @@ class RugCheckResult:
         if self.details is None:
             self.details = {}
 
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['risk_level'] = self.risk_level.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RugCheckResult":
+        data = dict(data)
+        data['risk_level'] = RiskLevel(data['risk_level'])
+        return cls(**data)
+
+
+class RugResultCache:
+    """
+    Process-wide LRU of recent rug-check results with a TTL
+
+    Shared by every RugDetector so a token checked by enrichment, the bot
+    or the API is not re-checked within the TTL. Persistable: the
+    CachePersister saves it to disk and restores it at startup.
+    """
+
+    # PersistentCache namespace
+    namespace = 'rug_check'
+
+    def __init__(self, max_size: int = None, ttl: float = None):
+        self.max_size = max_size or settings.rug_check_cache_size
+        self.ttl = ttl or settings.rug_check_cache_ttl_seconds
+        self._entries: OrderedDict[str, tuple[RugCheckResult, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, contract_address: str) -> Optional[RugCheckResult]:
+        with self._lock:
+            cached = self._entries.get(contract_address)
+            if cached is None or time.monotonic() - cached[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(contract_address)
+            self.hits += 1
+            return cached[0]
+
+    def put(self, result: RugCheckResult):
+        with self._lock:
+            self._entries[result.contract_address] = (result, time.monotonic())
+            self._entries.move_to_end(result.contract_address)
+            self._dirty.add(result.contract_address)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, contract_address: str):
+        with self._lock:
+            self._entries.pop(contract_address, None)
+
+    @property
+    def max_rows(self) -> int:
+        return self.max_size
+
+    def dirty_rows(self) -> list[tuple]:
+        """Results stored since the last call, as PersistentCache rows"""
+        now_mono, now_wall = time.monotonic(), time.time()
+        rows = []
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for contract_address in dirty:
+                cached = self._entries.get(contract_address)
+                if cached is None:
+                    continue
+                result, checked_at = cached
+                stored_at = now_wall - (now_mono - checked_at)
+                rows.append((contract_address, result.to_dict(), stored_at, stored_at + self.ttl))
+        return rows
+
+    def restore(self, rows: list[tuple]) -> int:
+        """Load persisted results, keeping their original age"""
+        now_mono, now_wall = time.monotonic(), time.time()
+        restored = 0
+        with self._lock:
+            for contract_address, data, stored_at, _ in rows:
+                try:
+                    result = RugCheckResult.from_dict(data)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                age = max(0.0, now_wall - stored_at)
+                self._entries[contract_address] = (result, now_mono - age)
+                self._entries.move_to_end(contract_address)
+                restored += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return restored
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global instance
+_rug_result_cache: Optional[RugResultCache] = None
+_rug_result_cache_lock = threading.Lock()
+
+
+def get_rug_result_cache() -> RugResultCache:
+    """Get global rug-check result cache"""
+    global _rug_result_cache
+    if _rug_result_cache is None:
+        with _rug_result_cache_lock:
+            if _rug_result_cache is None:
+                _rug_result_cache = RugResultCache()
+    return _rug_result_cache
+
+
+@dataclass
+class _Findings:
+    """Risk factors accumulated while a rug check runs"""
+    risk_score: int = 0
+    flags: dict = field(default_factory=dict)  # RugCheckResult flag fields set to True
+    warnings: list = field(default_factory=list)
+    details: dict = field(default_factory=dict)
+    tier_ms: dict = field(default_factory=dict)
+    skipped: list = field(default_factory=list)  # Checks not needed for the verdict
+    timed_out: list = field(default_factory=list)  # Checks that missed the deadline
+
+    def flag(self, name: str, points: int, warning: str):
+        self.flags[name] = True
+        self.risk_score += points
+        self.warnings.append(warning)
+
+
+class RugCheckTimings:
+    """Process-wide per-tier latency of rug checks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: dict[str, list[float]] = {}  # tier -> [count, total_ms, max_ms]
+        self.checks = 0
+        self.short_circuited = 0
+        self.timed_out = 0
+
+    def record(self, findings: _Findings):
+        with self._lock:
+            self.checks += 1
+            self.short_circuited += bool(findings.skipped)
+            self.timed_out += bool(findings.timed_out)
+            for tier, ms in findings.tier_ms.items():
+                totals = self._tiers.setdefault(tier, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += ms
+                totals[2] = max(totals[2], ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'checks': self.checks,
+                'short_circuited': self.short_circuited,
+                'timed_out': self.timed_out,
+                'tiers': {
+                    tier: {
+                        'runs': count,
+                        'mean_ms': round(total / count, 1),
+                        'max_ms': round(peak, 1),
+                    }
+                    for tier, (count, total, peak) in self._tiers.items()
+                },
+            }
+
+
+_rug_check_timings = RugCheckTimings()
+
+
+def get_rug_check_timings() -> RugCheckTimings:
+    """Get global rug-check tier timings"""
+    return _rug_check_timings
+
 
 class RugDetector:
     """
@@ -71,80 +254,156 @@ class RugDetector:
     MIN_LIQUIDITY_USD = 5000  # Minimum liquidity to consider safe
     MAX_TOP10_CONCENTRATION = 50  # Max % top 10 can hold
     MIN_LP_LOCK_DAYS = 30  # Minimum days LP should be locked
-
-    # Known scam patterns (token names to avoid)
-    COPYCAT_PATTERNS = [
-        "BONK", "WIF", "PEPE", "DOGE", "SHIB",  # Popular memes
-        "SOL", "ETH", "BTC",  # Major coins
-        "USDC", "USDT",  # Stablecoins
-    ]
-
-    def __init__(self, token_service: TokenMetadataService = None):
+    FAIL_SCORE = 50  # HIGH risk: the check fails whatever the remaining tiers find
+
+    def __init__(
+        self,
+        token_service: TokenMetadataService = None,
+        result_cache: Optional[RugResultCache] = None,
+        use_cache: bool = True,
+        security: GoPlusSecurity = None,
+        copycat_index: CopycatIndex = None
+    ):
         self.token_service = token_service or TokenMetadataService()
-
-    async def check_token(self, contract_address: str) -> RugCheckResult:
+        self.security = security or get_goplus_security()
+        self.copycat_index = copycat_index or get_copycat_index()
+        # Process-wide result cache shared by every detector unless overridden
+        self.result_cache = (result_cache or get_rug_result_cache()) if use_cache else None
+
+    async def check_token(
+        self,
+        contract_address: str,
+        metadata: Optional[TokenMetadata] = None,
+        deadline: float = None
+    ) -> RugCheckResult:
         """
         Perform comprehensive rug pull risk analysis
 
+        Checks run in cost-ordered tiers: first everything derivable from
+        metadata and cached data (authorities, liquidity, copycat, a cached
+        GoPlus report), then the remote lookups (holder distribution and
+        GoPlus) concurrently - only if the verdict is still undecided.
+        Scores only grow, so once the score reaches FAIL_SCORE the check
+        fails without the remote tier. Checks that miss the deadline count
+        as not flagged and are listed in details['timed_out'].
+
+        Results are reused from the result cache for rug_check_cache_ttl_seconds
+        (except ones cut short by the deadline).
+
         Args:
             contract_address: Token mint address
+            metadata: Already-fetched metadata for the token (fetched if omitted)
+            deadline: Seconds for the whole check (defaults to settings)
 
         Returns:
-            RugCheckResult with risk assessment
+            RugCheckResult with risk assessment; details['tier_ms'] holds
+            the time spent per tier
         """
-        warnings = []
-        details = {}
-        risk_score = 0
+        if self.result_cache is not None:
+            cached = self.result_cache.get(contract_address)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + (deadline or settings.rug_check_deadline_seconds)
+        findings = _Findings()
+
+        # Tier 1: metadata and cached data
+        started = time.perf_counter()
+        if metadata is None:
+            try:
+                metadata = await asyncio.wait_for(
+                    self.token_service.get_token_metadata(contract_address),
+                    max(0.0, expires_at - loop.time())
+                )
+            except asyncio.TimeoutError:
+                findings.timed_out += ['mint_authority', 'freeze_authority', 'liquidity', 'copycat']
+        if metadata is not None:
+            self._metadata_checks(metadata, findings)
+
+        security_report = self.security.cached(contract_address)
+        if security_report is not None:
+            self._security_checks(security_report, findings)
+        findings.tier_ms['local'] = (time.perf_counter() - started) * 1000
+
+        # Tier 2: remote lookups, only while the verdict is open
+        remote = ['holder_concentration']
+        if security_report is None:
+            remote += ['lp_lock', 'honeypot']
+        if findings.risk_score >= self.FAIL_SCORE:
+            findings.skipped = remote
+        else:
+            started = time.perf_counter()
+            jobs = [self.token_service.get_holder_distribution(contract_address)]
+            if security_report is None:
+                jobs.append(self.security.get_report(contract_address))
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(*jobs),
+                    max(0.0, expires_at - loop.time())
+                )
+            except asyncio.TimeoutError:
+                findings.timed_out += remote
+            else:
+                self._holder_checks(results[0], findings)
+                if security_report is None:
+                    self._security_checks(results[1], findings)
+            findings.tier_ms['remote'] = (time.perf_counter() - started) * 1000
 
-        # Fetch token metadata
-        metadata = await self.token_service.get_token_metadata(contract_address)
-        holder_dist = await self.token_service.get_holder_distribution(contract_address)
+        result = self._verdict(contract_address, findings)
+        get_rug_check_timings().record(findings)
+
+        logger.info(
+            f"Rug check for {contract_address[:8]}...: "
+            f"risk={result.risk_level.value} score={result.risk_score} passed={result.passed}"
+            + (" (short-circuited)" if findings.skipped else "")
+            + (f" (timed out: {', '.join(findings.timed_out)})" if findings.timed_out else "")
+        )
+
+        if self.result_cache is not None and not findings.timed_out:
+            self.result_cache.put(result)
+        return result
 
+    def _metadata_checks(self, metadata: TokenMetadata, findings: "_Findings"):
+        """Checks derived from token metadata (no network)"""
         # Check 1: Mint Authority
-        mintable = metadata.is_mintable
-        if mintable:
-            risk_score += 25
-            warnings.append("Token is MINTABLE - supply can be inflated")
+        if metadata.is_mintable:
+            findings.flag('mintable', 25, "Token is MINTABLE - supply can be inflated")
 
         # Check 2: Freeze Authority
-        freezable = metadata.is_freezable
-        if freezable:
-            risk_score += 30
-            warnings.append("Token has FREEZE authority - honeypot risk")
-
-        # Check 3: LP Lock (would need GoPlus or similar API)
-        lp_unlocked = await self._check_lp_unlocked(contract_address)
-        if lp_unlocked:
-            risk_score += 20
-            warnings.append("Liquidity is NOT locked - rug pull risk")
+        if metadata.is_freezable:
+            findings.flag('freezable', 30, "Token has FREEZE authority - honeypot risk")
 
         # Check 4: Low Liquidity
-        low_liquidity = metadata.liquidity_usd < self.MIN_LIQUIDITY_USD
-        if low_liquidity:
-            risk_score += 10
-            warnings.append(f"Low liquidity: ${metadata.liquidity_usd:.0f}")
-        details['liquidity_usd'] = metadata.liquidity_usd
-
-        # Check 5: Holder Concentration
-        top10_pct = holder_dist.get('top_n_concentration', 0)
-        high_concentration = top10_pct > self.MAX_TOP10_CONCENTRATION
-        if high_concentration:
-            risk_score += 15
-            warnings.append(f"High concentration: Top 10 hold {top10_pct:.1f}%")
-        details['top10_concentration'] = top10_pct
-
-        # Check 6: Honeypot Test
-        honeypot_risk = await self._check_honeypot(contract_address)
-        if honeypot_risk:
-            risk_score += 40
-            warnings.append("HONEYPOT detected - token cannot be sold")
+        if metadata.liquidity_usd < self.MIN_LIQUIDITY_USD:
+            findings.flag('low_liquidity', 10, f"Low liquidity: ${metadata.liquidity_usd:.0f}")
+        findings.details['liquidity_usd'] = metadata.liquidity_usd
 
         # Check 7: Copycat Detection
         copycat = self._check_copycat(metadata.symbol, metadata.name)
         if copycat:
-            risk_score += 10
-            warnings.append(f"Possible copycat of known token: {copycat}")
-        details['copycat_of'] = copycat
+            findings.flag('copycat_name', 10, f"Possible copycat of known token: {copycat}")
+        findings.details['copycat_of'] = copycat
+
+    def _security_checks(self, report: Optional[dict], findings: "_Findings"):
+        """Checks parsed from the GoPlus security report"""
+        # Check 3: LP Lock
+        if self._check_lp_unlocked(report):
+            findings.flag('lp_unlocked', 20, "Liquidity is NOT locked - rug pull risk")
+
+        # Check 6: Honeypot Test
+        if self._check_honeypot(report):
+            findings.flag('honeypot_risk', 40, "HONEYPOT detected - token cannot be sold")
+
+    def _holder_checks(self, holder_dist: dict, findings: "_Findings"):
+        # Check 5: Holder Concentration
+        top10_pct = holder_dist.get('top_n_concentration', 0)
+        if top10_pct > self.MAX_TOP10_CONCENTRATION:
+            findings.flag('high_concentration', 15, f"High concentration: Top 10 hold {top10_pct:.1f}%")
+        findings.details['top10_concentration'] = top10_pct
+
+    def _verdict(self, contract_address: str, findings: "_Findings") -> RugCheckResult:
+        risk_score = findings.risk_score
 
         # Determine risk level
         if risk_score >= 70:
@@ -159,84 +418,53 @@ class RugDetector:
         # Passed = safe to alert (not critical risk)
         passed = risk_level not in [RiskLevel.CRITICAL, RiskLevel.HIGH]
 
-        result = RugCheckResult(
+        details = findings.details
+        details['tier_ms'] = {tier: round(ms, 1) for tier, ms in findings.tier_ms.items()}
+        if findings.skipped:
+            details['skipped'] = findings.skipped
+        if findings.timed_out:
+            details['timed_out'] = findings.timed_out
+
+        return RugCheckResult(
             contract_address=contract_address,
             risk_level=risk_level,
             risk_score=risk_score,
             passed=passed,
-            mintable=mintable,
-            freezable=freezable,
-            lp_unlocked=lp_unlocked,
-            low_liquidity=low_liquidity,
-            high_concentration=high_concentration,
-            honeypot_risk=honeypot_risk,
-            copycat_name=copycat is not None,
-            warnings=warnings,
-            details=details
+            warnings=findings.warnings,
+            details=details,
+            **findings.flags
         )
 
-        logger.info(
-            f"Rug check for {contract_address[:8]}...: "
-            f"risk={risk_level.value} score={risk_score} passed={passed}"
-        )
-
-        return result
-
-    async def _check_lp_unlocked(self, mint: str) -> bool:
+    @staticmethod
+    def _check_lp_unlocked(report: Optional[dict]) -> bool:
         """
         Check if liquidity pool is unlocked
 
-        Note: This would ideally use GoPlus or RugCheck API
-        For now, returns False (assume locked)
+        Args:
+            report: GoPlus security report (None if unavailable - assume locked)
         """
-        # TODO: Integrate with GoPlus API or similar
         # https://docs.gopluslabs.io/reference/token-security-api
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.gopluslabs.io/api/v1/token_security/solana",
-                    params={"contract_addresses": mint},
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    result = data.get('result', {}).get(mint.lower(), {})
-                    # Check if LP is locked
-                    lp_holders = result.get('lp_holders', [])
-                    for holder in lp_holders:
-                        if holder.get('is_locked') == 0:
-                            return True  # Found unlocked LP
-                    return False
-        except Exception as e:
-            logger.debug(f"LP lock check failed: {e}")
-        return False  # Assume locked if check fails
-
-    async def _check_honeypot(self, mint: str) -> bool:
+        for holder in (report or {}).get('lp_holders') or []:
+            if holder.get('is_locked') == 0:
+                return True  # Found unlocked LP
+        return False
+
+    @staticmethod
+    def _check_honeypot(report: Optional[dict]) -> bool:
         """
         Check if token is a honeypot (can't be sold)
 
-        Note: Would use simulation or GoPlus API
+        Args:
+            report: GoPlus security report (None if unavailable)
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.gopluslabs.io/api/v1/token_security/solana",
-                    params={"contract_addresses": mint},
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    result = data.get('result', {}).get(mint.lower(), {})
-                    # Check honeypot indicators
-                    if result.get('is_honeypot') == 1:
-                        return True
-                    if result.get('cannot_sell_all') == 1:
-                        return True
-                    if result.get('transfer_pausable') == 1:
-                        return True
-        except Exception as e:
-            logger.debug(f"Honeypot check failed: {e}")
-        return False
+        if not report:
+            return False
+        # Check honeypot indicators
+        return (
+            report.get('is_honeypot') == 1
+            or report.get('cannot_sell_all') == 1
+            or report.get('transfer_pausable') == 1
+        )
 
     def _check_copycat(self, symbol: str, name: str) -> Optional[str]:
         """
@@ -247,28 +475,61 @@ class RugDetector:
         """
         if not symbol and not name:
             return None
+        return self.copycat_index.match(symbol, name)
 
-        symbol_upper = (symbol or "").upper()
-        name_upper = (name or "").upper()
-
-        for known in self.COPYCAT_PATTERNS:
-            # Exact match
-            if symbol_upper == known:
-                return known
+    async def check_tokens(
+        self,
+        contract_addresses: Iterable[str],
+        deadline: float = None
+    ) -> AsyncIterator[RugCheckResult]:
+        """
+        Rug check many tokens, yielding results as they complete
 
-            # Contains known name with modifications
-            if known in name_upper and name_upper != known:
-                return known
+        Cached results come first. Metadata for the rest is fetched in
+        one bulk lookup (DAS getAssetBatch, batched prices and supply),
+        then checks run concurrently - at most rug_check_batch_concurrency
+        at a time - so their GoPlus lookups are batched together and
+        shared provider calls are coalesced.
 
-            # Common copycat patterns
-            copycat_variants = [
-                f"{known}2", f"{known}2.0", f"BABY{known}",
-                f"MINI{known}", f"{known}INU", f"{known}MOON"
-            ]
-            if symbol_upper in copycat_variants:
-                return known
+        Args:
+            contract_addresses: Token mint addresses (duplicates are ignored)
+            deadline: Seconds per check (defaults to settings)
+        """
+        pending = []
+        for contract_address in dict.fromkeys(contract_addresses):
+            cached = self.result_cache.get(contract_address) if self.result_cache else None
+            if cached is not None:
+                yield cached
+            else:
+                pending.append(contract_address)
+        if not pending:
+            return
+
+        deadline = deadline or settings.rug_check_deadline_seconds
+        try:
+            metadata = await asyncio.wait_for(
+                self.token_service.get_token_metadata_many(pending), deadline
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Bulk metadata for {len(pending)} tokens timed out; checking individually")
+            metadata = {}
+
+        semaphore = asyncio.Semaphore(settings.rug_check_batch_concurrency)
+
+        async def check(contract_address: str) -> RugCheckResult:
+            async with semaphore:
+                return await self.check_token(
+                    contract_address, metadata=metadata.get(contract_address), deadline=deadline
+                )
 
-        return None
+        tasks = [asyncio.ensure_future(check(ca)) for ca in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer went away (e.g. client disconnected): stop the rest
+            for task in tasks:
+                task.cancel()
 
     async def should_alert(self, contract_address: str) -> tuple[bool, RugCheckResult]:
         """
@@ -279,3 +540,15 @@ class RugDetector:
         """
         result = await self.check_token(contract_address)
         return result.passed, result
+
+
+# Global instance
+_rug_detector: Optional[RugDetector] = None
+
+
+def get_rug_detector() -> RugDetector:
+    """Get the shared rug detector (and its token metadata service)"""
+    global _rug_detector
+    if _rug_detector is None:
+        _rug_detector = RugDetector()
+    return _rug_detector
@@ -0,0 +1,156 @@
+"""
+AlphaPulse SOL Price Ticker
+Background-refreshed SOL/USD price shared by every service
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.http_clients import get_http_client
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+# Used until the first successful fetch
+FALLBACK_SOL_PRICE_USD = 150.0
+
+
+class SolPriceTicker:
+    """
+    Keeps the SOL/USD price in memory
+
+    When started, a background task refreshes it every refresh_interval
+    seconds, and reads are a constant-time attribute lookup. Consumers
+    can check age_seconds / is_stale / is_fallback to decide how much to
+    trust the value.
+    """
+
+    JUPITER_PRICE_API = "https://price.jup.ag/v6/price"
+
+    def __init__(self, refresh_interval: float = None, max_age: float = None):
+        """
+        Initialize ticker
+
+        Args:
+            refresh_interval: Seconds between background refreshes
+            max_age: Age in seconds after which the price counts as stale
+        """
+        self.refresh_interval = refresh_interval or settings.sol_price_refresh_seconds
+        self.max_age = max_age or settings.sol_price_max_age_seconds
+        self.price: float = FALLBACK_SOL_PRICE_USD
+        self.updated_at: Optional[float] = None  # time.monotonic() of last successful fetch
+        self._last_attempt: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_fallback(self) -> bool:
+        """True until a price has been fetched successfully"""
+        return self.updated_at is None
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self.updated_at is None or self.age_seconds > self.max_age
+
+    async def get_price(self) -> float:
+        """
+        Current SOL/USD price
+
+        Served from memory; refreshed inline only when the price is stale
+        and no background task is keeping it fresh (e.g. in CLI runs), at
+        most once per refresh_interval. Concurrent callers share one fetch.
+        """
+        if self.is_stale and not self.running:
+            recently = (
+                self._last_attempt is not None
+                and time.monotonic() - self._last_attempt < self.refresh_interval
+            )
+            if not recently or self._refresh_task is not None:
+                await self.refresh()
+        return self.price
+
+    async def refresh(self) -> bool:
+        """Fetch the price now (joining an in-flight fetch); returns True on success"""
+        task = self._refresh_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refresh_task = asyncio.ensure_future(self._fetch())
+            task.add_done_callback(self._clear_refresh)
+        return await asyncio.shield(task)
+
+    def _clear_refresh(self, task: asyncio.Task):
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+    async def _fetch(self) -> bool:
+        self._last_attempt = time.monotonic()
+        try:
+            client = get_http_client('jupiter')
+            response = await client.get(self.JUPITER_PRICE_API, params={"ids": SOL_MINT})
+            price = response.json().get('data', {}).get(SOL_MINT, {}).get('price')
+        except Exception as e:
+            logger.warning(f"SOL price fetch failed: {e}")
+            return False
+
+        if not price or price <= 0:
+            logger.warning("SOL price fetch returned no price")
+            return False
+
+        self.price = float(price)
+        self.updated_at = time.monotonic()
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background refresh task on the running loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"SOL price ticker started (every {self.refresh_interval}s)")
+
+    async def stop(self):
+        """Stop the background refresh task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def stats(self) -> dict:
+        age = self.age_seconds
+        return {
+            'price_usd': self.price,
+            'age_seconds': round(age, 1) if age is not None else None,
+            'stale': self.is_stale,
+            'fallback': self.is_fallback,
+        }
+
+
+# Global instance
+_sol_price_ticker: Optional[SolPriceTicker] = None
+
+
+def get_sol_price_ticker() -> SolPriceTicker:
+    """Get global SOL price ticker instance"""
+    global _sol_price_ticker
+    if _sol_price_ticker is None:
+        _sol_price_ticker = SolPriceTicker()
+    return _sol_price_ticker
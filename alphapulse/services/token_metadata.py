@@ -8,12 +8,15 @@ from typing import Optional
 from dataclasses import dataclass
 from datetime import datetime
 
-import httpx
-from solana.rpc.async_api import AsyncClient
-from solders.pubkey import Pubkey
-
 from alphapulse.config import settings
 from alphapulse.utils.logger import get_logger
+from alphapulse.utils.http_clients import get_http_client
+from alphapulse.utils.single_flight import coalesce
+from alphapulse.services.sol_price import get_sol_price_ticker
+from alphapulse.services.metadata_cache import (
+    MetadataCache, get_metadata_cache,
+    FIELD_GROUPS, IDENTITY, AUTHORITIES, SUPPLY, MARKET
+)
 
 logger = get_logger(__name__)
 
@@ -71,59 +74,416 @@ class TokenMetadataService:
     HELIUS_DAS_URL = "https://mainnet.helius-rpc.com/?api-key="
     BIRDEYE_API = "https://public-api.birdeye.so"
 
-    def __init__(self, helius_api_key: str = None, birdeye_api_key: str = None):
+    # Mints per Jupiter price request (ids are comma-separated in the URL)
+    JUPITER_BATCH_SIZE = 100
+    # Mints per getAssetBatch / JSON-RPC batch request (DAS allows up to 1000)
+    HELIUS_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        helius_api_key: str = None,
+        birdeye_api_key: str = None,
+        cache: Optional[MetadataCache] = None,
+        use_cache: bool = True
+    ):
         self.helius_api_key = helius_api_key or settings.helius_api_key
         self.birdeye_api_key = birdeye_api_key
         self.rpc_url = f"{settings.helius_rpc_url}/?api-key={self.helius_api_key}"
-
-    async def get_token_metadata(self, contract_address: str) -> TokenMetadata:
+        # Process-wide cache shared by every service instance unless overridden
+        self.cache = (cache or get_metadata_cache()) if use_cache else None
+        self.batch_concurrency = settings.metadata_batch_concurrency
+
+    async def get_token_metadata(
+        self,
+        contract_address: str,
+        max_age: Optional[dict[str, float]] = None,
+        groups: tuple = FIELD_GROUPS
+    ) -> TokenMetadata:
         """
         Fetch complete token metadata from all available sources
 
+        Served from the metadata cache where possible: only field groups
+        that are missing or too old are fetched, and stale groups are
+        returned immediately while they refresh in the background.
+
         Args:
             contract_address: Solana token mint address
+            max_age: Optional per-field-group freshness override in seconds,
+                     e.g. {'market': 0} to force a fresh price
+            groups: Field groups to populate (others keep their defaults),
+                    e.g. (SUPPLY,) when the price comes from get_prices
 
         Returns:
             TokenMetadata with all available fields populated
         """
-        metadata = TokenMetadata(contract_address=contract_address)
+        sol_price = await self._get_sol_price()
+
+        if self.cache is None:
+            data = await self._fetch_groups(contract_address, set(groups))
+            return self._compose(contract_address, data, sol_price)
+
+        data, missing, stale = self.cache.lookup(contract_address, groups, max_age=max_age)
+        if missing:
+            fetched = await self._fetch_groups(contract_address, missing)
+            self.cache.store(contract_address, fetched)
+            data.update(fetched)
+        if stale:
+            self.cache.revalidate(contract_address, stale, self._fetch_groups)
+
+        return self._compose(contract_address, data, sol_price)
+
+    async def get_token_metadata_many(
+        self,
+        mints,
+        max_age: Optional[dict[str, float]] = None,
+        groups: tuple = FIELD_GROUPS
+    ) -> dict[str, TokenMetadata]:
+        """
+        Fetch metadata for many tokens with batched provider calls
+
+        Like get_token_metadata, but whatever is missing from the cache is
+        fetched for all mints together: DAS getAssetBatch for identity and
+        authorities, one JSON-RPC batch per chunk for supply and Jupiter
+        multi-id requests for prices, with at most
+        metadata_batch_concurrency requests in flight.
+
+        Args:
+            mints: Token mint addresses (duplicates are ignored)
+            max_age: Optional per-field-group freshness override in seconds
+            groups: Field groups to populate
+
+        Returns:
+            Mint -> TokenMetadata, for every requested mint
+        """
+        mints = list(dict.fromkeys(m for m in mints if m))
+        sol_price = await self._get_sol_price()
+        data: dict[str, dict] = {}
+        wanted: dict[str, set[str]] = {}
+        stale_by_group: dict[str, list[str]] = {}
+
+        for mint in mints:
+            if self.cache is None:
+                data[mint], wanted[mint] = {}, set(groups)
+                continue
+            data[mint], missing, stale = self.cache.lookup(mint, groups, max_age=max_age)
+            if missing:
+                wanted[mint] = missing
+            for group in stale:
+                stale_by_group.setdefault(group, []).append(mint)
+
+        if wanted:
+            fetched = await self._fetch_groups_many(wanted)
+            for mint, values in fetched.items():
+                if self.cache is not None:
+                    self.cache.store(mint, values)
+                data[mint].update(values)
+        for group, stale_mints in stale_by_group.items():
+            self._revalidate_many(stale_mints, group)
+
+        return {mint: self._compose(mint, data[mint], sol_price) for mint in mints}
+
+    async def get_prices(
+        self,
+        mints,
+        max_age: Optional[float] = None
+    ) -> dict[str, dict]:
+        """
+        Fetch Jupiter prices for many mints at once
+
+        Cached market data is used where fresh (stale entries are served
+        and refreshed in the background as one batch); the rest is fetched
+        with comma-separated ids, JUPITER_BATCH_SIZE mints per request,
+        requests running concurrently. Fetched prices feed the cache.
+
+        Args:
+            mints: Token mint addresses (duplicates are ignored)
+            max_age: Optional market-data freshness override in seconds
 
-        # Fetch from multiple sources in parallel
-        tasks = [
-            self._fetch_helius_asset(contract_address),
-            self._fetch_jupiter_price(contract_address),
-            self._fetch_supply_info(contract_address),
-        ]
+        Returns:
+            Mint -> {'price_usd', 'price_sol', 'symbol'} for mints with a
+            known price; unknown mints are left out
+        """
+        mints = list(dict.fromkeys(m for m in mints if m))
+        prices, missing, stale = {}, [], []
+
+        if self.cache is None:
+            missing = mints
+        else:
+            override = {MARKET: max_age} if max_age is not None else None
+            for mint in mints:
+                data, need, old = self.cache.lookup(mint, (MARKET,), max_age=override)
+                jupiter = (data.get(MARKET) or {}).get('jupiter')
+                if need:
+                    missing.append(mint)
+                elif jupiter:
+                    prices[mint] = jupiter
+                    if old:
+                        stale.append(mint)
+
+        if missing:
+            fetched = await self._fetch_jupiter_prices(missing)
+            prices.update(fetched)
+            self._store_prices(fetched)
+        if stale:
+            self._revalidate_many(stale, MARKET)
+
+        return prices
+
+    def _store_prices(self, prices: dict[str, dict]):
+        """Feed batch-fetched prices to the metadata cache"""
+        # With Birdeye configured the market group also carries Birdeye
+        # analytics, which a Jupiter-only batch must not overwrite
+        if self.cache is None or self.birdeye_api_key:
+            return
+        for mint, price in prices.items():
+            self.cache.store(mint, {MARKET: {'jupiter': price, 'birdeye': {}}})
+
+    def _revalidate_many(self, mints: list[str], group: str):
+        """Refresh one stale group for many mints as a single background batch"""
+        async def fetch(batch: list[str]) -> dict[str, dict]:
+            fetched = await self._fetch_groups_many({mint: {group} for mint in batch})
+            return {mint: values[group] for mint, values in fetched.items() if group in values}
+
+        self.cache.revalidate_many(mints, group, fetch)
+
+    async def _fetch_jupiter_prices(self, mints: list[str]) -> dict[str, dict]:
+        """Fetch prices for many mints, JUPITER_BATCH_SIZE per request"""
+        size = self.JUPITER_BATCH_SIZE
+        chunks = [mints[i:i + size] for i in range(0, len(mints), size)]
+        sol_price = await self._get_sol_price()
+
+        async def fetch_chunk(chunk: list[str]) -> dict:
+            client = get_http_client('jupiter')
+            response = await client.get(
+                self.JUPITER_PRICE_API,
+                params={"ids": ",".join(chunk)}
+            )
+            return response.json().get('data', {})
+
+        results = await self._gather_bounded(fetch_chunk(c) for c in chunks)
+        prices = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Jupiter batch price fetch failed ({len(chunk)} mints): {result}")
+                continue
+            for mint in chunk:
+                price_data = result.get(mint)
+                if not price_data or not price_data.get('price'):
+                    continue
+                price = price_data['price']
+                prices[mint] = {
+                    'price_usd': price,
+                    'price_sol': price / sol_price if sol_price > 0 else 0,
+                    'symbol': price_data.get('mintSymbol'),
+                }
+        return prices
+
+    async def _gather_bounded(self, coros) -> list:
+        """Run coroutines with at most metadata_batch_concurrency at a time (exceptions returned)"""
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(bounded(c) for c in coros), return_exceptions=True)
+
+    async def _fetch_groups_many(self, wanted: dict[str, set[str]]) -> dict[str, dict[str, dict]]:
+        """
+        Batched counterpart of _fetch_groups
+
+        Args:
+            wanted: Mint -> field groups to fetch
+
+        Returns:
+            Mint -> data per field group; mints or groups whose source
+            failed are left out
+        """
+        asset_mints = [m for m, g in wanted.items() if IDENTITY in g or AUTHORITIES in g]
+        supply_mints = [m for m, g in wanted.items() if SUPPLY in g]
+        market_mints = [m for m, g in wanted.items() if MARKET in g]
+
+        assets, supplies, markets = await asyncio.gather(
+            self._fetch_helius_assets(asset_mints),
+            self._fetch_supplies(supply_mints),
+            self._fetch_markets(market_mints)
+        )
+
+        fetched: dict[str, dict[str, dict]] = {}
+        for mint, helius_data in assets.items():
+            fetched.setdefault(mint, {}).update(self._asset_groups(helius_data))
+        for mint, supply_data in supplies.items():
+            fetched.setdefault(mint, {})[SUPPLY] = supply_data
+        for mint, market in markets.items():
+            fetched.setdefault(mint, {})[MARKET] = market
+        return fetched
+
+    async def _fetch_helius_assets(self, mints: list[str]) -> dict[str, dict]:
+        """Fetch token info for many mints via DAS getAssetBatch"""
+        if not mints:
+            return {}
+        size = self.HELIUS_BATCH_SIZE
+
+        async def fetch_chunk(chunk: list[str]) -> list:
+            client = get_http_client('helius')
+            response = await client.post(
+                f"{self.HELIUS_DAS_URL}{self.helius_api_key}",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getAssetBatch",
+                    "params": {"ids": chunk}
+                }
+            )
+            return response.json().get('result') or []
+
+        chunks = [mints[i:i + size] for i in range(0, len(mints), size)]
+        assets = {}
+        for chunk, result in zip(chunks, await self._gather_bounded(fetch_chunk(c) for c in chunks)):
+            if isinstance(result, Exception):
+                logger.warning(f"Helius DAS batch fetch failed ({len(chunk)} mints): {result}")
+                continue
+            for asset in result:
+                # Unknown ids come back as null entries
+                if asset and asset.get('id'):
+                    assets[asset['id']] = self._parse_das_asset(asset)
+        return assets
+
+    async def _fetch_supplies(self, mints: list[str]) -> dict[str, dict]:
+        """Fetch supply for many mints, one JSON-RPC batch request per chunk"""
+        if not mints:
+            return {}
+        size = self.HELIUS_BATCH_SIZE
+
+        async def fetch_chunk(chunk: list[str]) -> list:
+            client = get_http_client('helius')
+            response = await client.post(
+                self.rpc_url,
+                json=[
+                    {"jsonrpc": "2.0", "id": i, "method": "getTokenSupply", "params": [mint]}
+                    for i, mint in enumerate(chunk)
+                ]
+            )
+            return response.json()
+
+        chunks = [mints[i:i + size] for i in range(0, len(mints), size)]
+        supplies = {}
+        for chunk, result in zip(chunks, await self._gather_bounded(fetch_chunk(c) for c in chunks)):
+            if isinstance(result, Exception) or not isinstance(result, list):
+                logger.warning(f"Supply batch fetch failed ({len(chunk)} mints): {result}")
+                continue
+            for item in result:
+                value = (item.get('result') or {}).get('value')
+                index = item.get('id')
+                if value and isinstance(index, int) and 0 <= index < len(chunk):
+                    total_supply = float(value['amount']) / (10 ** value['decimals'])
+                    supplies[chunk[index]] = {
+                        'total_supply': total_supply,
+                        'circulating_supply': total_supply  # Approximate
+                    }
+        return supplies
 
+    async def _fetch_markets(self, mints: list[str]) -> dict[str, dict]:
+        """Fetch market data for many mints (batched Jupiter, per-mint Birdeye if configured)"""
+        if not mints:
+            return {}
+        prices = await self._fetch_jupiter_prices(mints)
+        birdeye = {}
         if self.birdeye_api_key:
-            tasks.append(self._fetch_birdeye_data(contract_address))
+            results = await self._gather_bounded(self._fetch_birdeye_data(m) for m in mints)
+            birdeye = {m: r for m, r in zip(mints, results) if isinstance(r, dict) and r}
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        markets = {}
+        for mint in mints:
+            jupiter_data, birdeye_data = prices.get(mint, {}), birdeye.get(mint, {})
+            if jupiter_data or birdeye_data:
+                markets[mint] = {'jupiter': jupiter_data, 'birdeye': birdeye_data}
+        return markets
 
-        # Merge results
-        helius_data, jupiter_data, supply_data = results[:3]
-        birdeye_data = results[3] if len(results) > 3 else None
+    async def _fetch_groups(self, mint: str, groups: set[str]) -> dict[str, dict]:
+        """
+        Fetch the sources behind the requested field groups in parallel
 
-        # Apply Helius DAS data
-        if isinstance(helius_data, dict):
-            metadata.name = helius_data.get('name')
-            metadata.symbol = helius_data.get('symbol')
-            metadata.decimals = helius_data.get('decimals', 9)
-            metadata.is_mintable = helius_data.get('is_mintable', False)
-            metadata.is_freezable = helius_data.get('is_freezable', False)
+        Returns:
+            Data per field group; groups whose source failed are left out
+        """
+        jobs = {}
+        if IDENTITY in groups or AUTHORITIES in groups:
+            jobs['helius'] = self._fetch_helius_asset(mint)
+        if SUPPLY in groups:
+            jobs['supply'] = self._fetch_supply_info(mint)
+        if MARKET in groups:
+            jobs['jupiter'] = self._fetch_jupiter_price(mint)
+            if self.birdeye_api_key:
+                jobs['birdeye'] = self._fetch_birdeye_data(mint)
+
+        results = dict(zip(jobs, await asyncio.gather(*jobs.values(), return_exceptions=True)))
+        fetched = {}
+
+        helius_data = results.get('helius')
+        if isinstance(helius_data, dict) and helius_data:
+            fetched.update(self._asset_groups(helius_data))
+
+        supply_data = results.get('supply')
+        if isinstance(supply_data, dict) and supply_data:
+            fetched[SUPPLY] = supply_data
+
+        jupiter_data = results.get('jupiter')
+        birdeye_data = results.get('birdeye')
+        jupiter_data = jupiter_data if isinstance(jupiter_data, dict) else {}
+        birdeye_data = birdeye_data if isinstance(birdeye_data, dict) else {}
+        if jupiter_data or birdeye_data:
+            fetched[MARKET] = {'jupiter': jupiter_data, 'birdeye': birdeye_data}
+
+        return fetched
+
+    @staticmethod
+    def _asset_groups(helius_data: dict) -> dict[str, dict]:
+        """Split parsed DAS asset data into its field groups"""
+        return {
+            IDENTITY: {
+                'name': helius_data.get('name'),
+                'symbol': helius_data.get('symbol'),
+                'decimals': helius_data.get('decimals', 9),
+            },
+            AUTHORITIES: {
+                'is_mintable': helius_data.get('is_mintable', False),
+                'is_freezable': helius_data.get('is_freezable', False),
+            },
+        }
+
+    def _compose(self, contract_address: str, groups: dict[str, dict], sol_price: float) -> TokenMetadata:
+        """Build TokenMetadata from field-group data"""
+        metadata = TokenMetadata(contract_address=contract_address)
 
-        # Apply Jupiter price data
-        if isinstance(jupiter_data, dict):
-            metadata.price_usd = jupiter_data.get('price_usd', 0)
-            metadata.price_sol = jupiter_data.get('price_sol', 0)
+        # Apply Helius DAS data
+        identity = groups.get(IDENTITY)
+        if identity:
+            metadata.name = identity.get('name')
+            metadata.symbol = identity.get('symbol')
+            metadata.decimals = identity.get('decimals', 9)
+        authorities = groups.get(AUTHORITIES)
+        if authorities:
+            metadata.is_mintable = authorities.get('is_mintable', False)
+            metadata.is_freezable = authorities.get('is_freezable', False)
 
         # Apply supply data
-        if isinstance(supply_data, dict):
+        supply_data = groups.get(SUPPLY)
+        if supply_data:
             metadata.total_supply = supply_data.get('total_supply', 0)
             metadata.circulating_supply = supply_data.get('circulating_supply', 0)
 
+        market = groups.get(MARKET) or {}
+
+        # Apply Jupiter price data
+        jupiter_data = market.get('jupiter')
+        if jupiter_data:
+            metadata.price_usd = jupiter_data.get('price_usd', 0)
+            metadata.price_sol = jupiter_data.get('price_sol', 0)
+
         # Apply Birdeye data (most comprehensive)
-        if isinstance(birdeye_data, dict):
+        birdeye_data = market.get('birdeye')
+        if birdeye_data:
             metadata.market_cap_usd = birdeye_data.get('mc', 0)
             metadata.liquidity_usd = birdeye_data.get('liquidity', 0)
             metadata.holder_count = birdeye_data.get('holder', 0)
@@ -135,7 +495,6 @@ class TokenMetadataService:
             metadata.fdv_usd = metadata.price_usd * metadata.total_supply
 
         # Convert USD to SOL (approximate using SOL price)
-        sol_price = await self._get_sol_price()
         if sol_price > 0:
             metadata.market_cap_sol = metadata.market_cap_usd / sol_price
             metadata.liquidity_sol = metadata.liquidity_usd / sol_price
@@ -143,112 +502,115 @@ class TokenMetadataService:
         logger.debug(f"Fetched metadata for {contract_address[:8]}...: mcap=${metadata.market_cap_usd:.0f}")
         return metadata
 
+    @coalesce('helius', 'getAsset')
     async def _fetch_helius_asset(self, mint: str) -> dict:
         """Fetch token info from Helius DAS API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.HELIUS_DAS_URL}{self.helius_api_key}",
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": "alphapulse",
-                        "method": "getAsset",
-                        "params": {"id": mint}
-                    },
-                    timeout=10
-                )
-                data = response.json()
-                result = data.get('result', {})
-
-                # Extract from DAS format
-                content = result.get('content', {})
-                metadata = content.get('metadata', {})
-                token_info = result.get('token_info', {})
-
-                return {
-                    'name': metadata.get('name'),
-                    'symbol': metadata.get('symbol'),
-                    'decimals': token_info.get('decimals', 9),
-                    'is_mintable': result.get('mutable', False),
-                    'is_freezable': token_info.get('freeze_authority') is not None
+            client = get_http_client('helius')
+            response = await client.post(
+                f"{self.HELIUS_DAS_URL}{self.helius_api_key}",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getAsset",
+                    "params": {"id": mint}
                 }
+            )
+            data = response.json()
+            return self._parse_das_asset(data.get('result', {}))
         except Exception as e:
             logger.warning(f"Helius DAS fetch failed: {e}")
             return {}
 
+    @staticmethod
+    def _parse_das_asset(result: dict) -> dict:
+        """Extract token info from a DAS asset"""
+        content = result.get('content', {})
+        metadata = content.get('metadata', {})
+        token_info = result.get('token_info', {})
+
+        return {
+            'name': metadata.get('name'),
+            'symbol': metadata.get('symbol'),
+            'decimals': token_info.get('decimals', 9),
+            'is_mintable': result.get('mutable', False),
+            'is_freezable': token_info.get('freeze_authority') is not None
+        }
+
+    @coalesce('jupiter', 'price')
     async def _fetch_jupiter_price(self, mint: str) -> dict:
         """Fetch current price from Jupiter"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.JUPITER_PRICE_API,
-                    params={"ids": mint},
-                    timeout=10
-                )
-                data = response.json()
-                price_data = data.get('data', {}).get(mint, {})
-
-                return {
-                    'price_usd': price_data.get('price', 0),
-                    'price_sol': price_data.get('price', 0) / await self._get_sol_price()
-                }
+            client = get_http_client('jupiter')
+            response = await client.get(
+                self.JUPITER_PRICE_API,
+                params={"ids": mint}
+            )
+            data = response.json()
+            price_data = data.get('data', {}).get(mint, {})
+
+            return {
+                'price_usd': price_data.get('price', 0),
+                'price_sol': price_data.get('price', 0) / await self._get_sol_price()
+            }
         except Exception as e:
             logger.warning(f"Jupiter price fetch failed: {e}")
             return {}
 
+    @coalesce('helius', 'getTokenSupply')
     async def _fetch_supply_info(self, mint: str) -> dict:
         """Fetch supply info directly from RPC"""
         try:
-            async with AsyncClient(self.rpc_url) as client:
-                # Get token supply
-                supply_resp = await client.get_token_supply(Pubkey.from_string(mint))
+            # Plain JSON-RPC on the shared Helius pool (no per-call RPC client)
+            client = get_http_client('helius')
+            response = await client.post(
+                self.rpc_url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getTokenSupply",
+                    "params": [mint]
+                }
+            )
+            value = response.json().get('result', {}).get('value')
 
-                if supply_resp.value:
-                    amount = float(supply_resp.value.amount)
-                    decimals = supply_resp.value.decimals
-                    total_supply = amount / (10 ** decimals)
+            if value:
+                amount = float(value['amount'])
+                decimals = value['decimals']
+                total_supply = amount / (10 ** decimals)
 
-                    return {
-                        'total_supply': total_supply,
-                        'circulating_supply': total_supply  # Approximate
-                    }
+                return {
+                    'total_supply': total_supply,
+                    'circulating_supply': total_supply  # Approximate
+                }
         except Exception as e:
             logger.warning(f"Supply fetch failed: {e}")
         return {}
 
+    @coalesce('birdeye', 'token_overview')
     async def _fetch_birdeye_data(self, mint: str) -> dict:
         """Fetch detailed analytics from Birdeye (requires API key)"""
         if not self.birdeye_api_key:
             return {}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BIRDEYE_API}/defi/token_overview",
-                    params={"address": mint},
-                    headers={"X-API-KEY": self.birdeye_api_key},
-                    timeout=10
-                )
-                data = response.json()
-                return data.get('data', {})
+            client = get_http_client('birdeye')
+            response = await client.get(
+                f"{self.BIRDEYE_API}/defi/token_overview",
+                params={"address": mint},
+                headers={"X-API-KEY": self.birdeye_api_key}
+            )
+            data = response.json()
+            return data.get('data', {})
         except Exception as e:
             logger.warning(f"Birdeye fetch failed: {e}")
             return {}
 
     async def _get_sol_price(self) -> float:
-        """Get current SOL price in USD"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.JUPITER_PRICE_API,
-                    params={"ids": "So11111111111111111111111111111111111111112"},
-                    timeout=5
-                )
-                data = response.json()
-                return data.get('data', {}).get('So11111111111111111111111111111111111111112', {}).get('price', 150)
-        except Exception:
-            return 150  # Fallback SOL price
+        """Get current SOL price in USD (from the shared ticker, no request when warm)"""
+        return await get_sol_price_ticker().get_price()
 
+    @coalesce('helius', 'getTokenLargestAccounts')
     async def get_holder_distribution(self, mint: str, top_n: int = 10) -> dict:
         """
         Get top holder distribution for conviction analysis
@@ -257,30 +619,29 @@ class TokenMetadataService:
             Dict with top holders and concentration metrics
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.HELIUS_DAS_URL}{self.helius_api_key}",
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": "alphapulse",
-                        "method": "getTokenLargestAccounts",
-                        "params": [mint]
-                    },
-                    timeout=15
-                )
-                data = response.json()
-                accounts = data.get('result', {}).get('value', [])
-
-                total_held = sum(float(a.get('amount', 0)) for a in accounts)
-                top_n_held = sum(float(a.get('amount', 0)) for a in accounts[:top_n])
-
-                top_n_pct = (top_n_held / total_held * 100) if total_held > 0 else 0
-
-                return {
-                    'top_holders': accounts[:top_n],
-                    'top_n_concentration': top_n_pct,
-                    'total_accounts': len(accounts)
+            client = get_http_client('helius')
+            response = await client.post(
+                f"{self.HELIUS_DAS_URL}{self.helius_api_key}",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": "alphapulse",
+                    "method": "getTokenLargestAccounts",
+                    "params": [mint]
                 }
+            )
+            data = response.json()
+            accounts = data.get('result', {}).get('value', [])
+
+            total_held = sum(float(a.get('amount', 0)) for a in accounts)
+            top_n_held = sum(float(a.get('amount', 0)) for a in accounts[:top_n])
+
+            top_n_pct = (top_n_held / total_held * 100) if total_held > 0 else 0
+
+            return {
+                'top_holders': accounts[:top_n],
+                'top_n_concentration': top_n_pct,
+                'total_accounts': len(accounts)
+            }
         except Exception as e:
             logger.warning(f"Holder distribution fetch failed: {e}")
             return {}
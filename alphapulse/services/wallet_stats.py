@@ -0,0 +1,473 @@
+"""
+AlphaPulse Wallet Stats
+Incremental per-wallet conviction metrics, updated as trades are recorded
+"""
+
+import json
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from alphapulse.db.models import SmartWallet, Token, Trade, WalletStats, WalletTokenStats
+from alphapulse.services.conviction_calculator import ConvictionCalculator, TradeAggregates
+from alphapulse.services.price_history import epoch_seconds
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_stats = WalletStats.__table__
+_positions = WalletTokenStats.__table__
+_tokens = Token.__table__
+_STATS_COLUMNS = [c.name for c in _stats.columns if c.name != 'wallet_id']
+
+# Ingest-path statements, built once and bound per call. Stats are read
+# for every wallet of a payload at once, positions and rug flags for
+# every (wallet, token) pair of it in a second query.
+_LOAD_STATS = select(_stats).where(
+    _stats.c.wallet_id.in_(bindparam('wallet_ids', expanding=True))
+).with_for_update()
+_LOAD_POSITIONS = select(
+    _tokens.c.id,
+    _tokens.c.is_rugged,
+    _positions.c.wallet_id,
+    _positions.c.net_sol,
+    _positions.c.bought
+).select_from(
+    _tokens.outerjoin(_positions, and_(
+        _positions.c.token_id == _tokens.c.id,
+        _positions.c.wallet_id.in_(bindparam('wallet_ids', expanding=True))
+    ))
+).where(
+    _tokens.c.id.in_(bindparam('token_ids', expanding=True))
+)
+_INSERT_STATS = insert(_stats)
+_UPDATE_STATS = update(_stats).where(_stats.c.wallet_id == bindparam('b_wallet_id'))
+_INSERT_POSITION = insert(_positions)
+_UPDATE_POSITION = update(_positions).where(
+    _positions.c.wallet_id == bindparam('b_wallet_id'),
+    _positions.c.token_id == bindparam('b_token_id')
+)
+
+
+class WalletStatsTracker:
+    """
+    Keeps WalletStats rows current as trades are recorded
+
+    Each trade updates its wallet's entry counts, the wallet's net
+    position in the token (WalletTokenStats) and a Welford running
+    mean / variance of per-token net PnL, so a conviction score is one
+    row read instead of a scan of the wallet's trades. Trade times are
+    kept per UTC day: whole days of a 7d / 30d window are counted from
+    the day lists and the day the window starts in by bisecting its
+    list, so counts match ConvictionCalculator.aggregate_trades exactly.
+
+    Trades are folded into stats held in memory and written by flush()
+    with one executemany per table, so a payload costs one read and one
+    write however many trades it has. Writes go through the caller's
+    session, so they commit or roll back together with the trades.
+    """
+
+    WINDOW_DAYS = (7, 30)
+    RETENTION_DAYS = 30
+
+    # Largest conviction score difference from ConvictionCalculator's SQL
+    # path accepted (checked by benchmarks.conviction_scores). Window
+    # counts are exact, leaving floating-point drift in the running PnL
+    # variance and entry mcap average.
+    SCORE_TOLERANCE = 0.01
+
+    def __init__(self, session: Session):
+        self.session = session
+        # Stats and positions loaded for the current batch; None = no row yet
+        self._stats: dict[int, Optional[SimpleNamespace]] = {}
+        self._positions: dict[tuple[int, int], Optional[SimpleNamespace]] = {}
+        self._rugged: dict[int, bool] = {}
+        self._stored_stats: set[int] = set()
+        self._stored_positions: set[tuple[int, int]] = set()
+        self._dirty: set[int] = set()
+        self._dirty_positions: set[tuple[int, int]] = set()
+        self._new_tokens: set[int] = set()
+        self._undo: dict[str, tuple] = {}  # tx_signature -> state before the trade
+
+    def prefetch(self, wallet_ids: Iterable[int], token_ids: Iterable[int] = ()):
+        """
+        Load stats for wallets and their positions in tokens, in two queries
+
+        Pairs already loaded are skipped. Tokens created in the current
+        transaction can be left out (see new_token()).
+
+        Args:
+            wallet_ids: Wallets about to trade
+            token_ids: Tokens they trade
+        """
+        wallet_ids = set(wallet_ids)
+        missing = wallet_ids - self._stats.keys()
+        if missing:
+            for row in self.session.execute(_LOAD_STATS, {'wallet_ids': list(missing)}):
+                stats = SimpleNamespace(**{c: getattr(row, c) for c in _STATS_COLUMNS})
+                stats.wallet_id = row.wallet_id
+                stats.trade_buckets = self._load_buckets(stats.trade_buckets)
+                self._stats[row.wallet_id] = stats
+                self._stored_stats.add(row.wallet_id)
+            for wallet_id in missing - self._stored_stats:
+                self._stats[wallet_id] = None
+
+        token_ids = set(token_ids)
+        pairs = {(w, t) for w in wallet_ids for t in token_ids} - self._positions.keys()
+        if not pairs:
+            return
+        rows = self.session.execute(_LOAD_POSITIONS, {
+            'wallet_ids': list({w for w, _ in pairs}),
+            'token_ids': list({t for _, t in pairs}),
+        })
+        for token_id, is_rugged, wallet_id, net_sol, bought in rows:
+            self._rugged[token_id] = bool(is_rugged)
+            if wallet_id is not None and (wallet_id, token_id) in pairs:
+                key = (wallet_id, token_id)
+                self._positions[key] = SimpleNamespace(net_sol=net_sol, bought=bool(bought))
+                self._stored_positions.add(key)
+        for key in pairs:
+            self._positions.setdefault(key, None)
+
+    def new_token(self, token_id: int):
+        """Note a token created in the current transaction (no positions, not rugged)"""
+        self._new_tokens.add(token_id)
+        self._rugged[token_id] = False
+
+    def record_trade(
+        self,
+        wallet_id: int,
+        token_id: int,
+        trade_type: str,
+        sol_amount: float,
+        block_time: datetime,
+        mcap: Optional[float] = None,
+        launched_at: Optional[datetime] = None,
+        tx_signature: Optional[str] = None
+    ):
+        """
+        Fold one trade into its wallet's stats (written by flush())
+
+        No query when the wallet and token were prefetched.
+
+        Args:
+            wallet_id: Trading wallet
+            token_id: Traded token
+            trade_type: BUY or SELL
+            sol_amount: SOL spent or received
+            block_time: Trade time (naive UTC)
+            mcap: Market cap at the trade (optional)
+            launched_at: Token launch time (optional)
+            tx_signature: Trade signature, to discard() the trade later
+        """
+        key = (wallet_id, token_id)
+        if key not in self._positions and token_id in self._new_tokens:
+            self._positions[key] = None
+        if wallet_id not in self._stats or key not in self._positions:
+            self.prefetch([wallet_id], [token_id])
+        stats = self._stats[wallet_id]
+        position = self._positions[key]
+
+        day = self._bucket(block_time)
+        if tx_signature:
+            self._undo[tx_signature] = (
+                wallet_id, key,
+                None if stats is None else self._snapshot(stats, day),
+                None if position is None else SimpleNamespace(**vars(position))
+            )
+        if stats is None:
+            stats = self._stats[wallet_id] = self._new_stats(wallet_id)
+
+        is_buy = trade_type == 'BUY'
+        if position is None:
+            position = self._positions[key] = SimpleNamespace(net_sol=None, bought=False)
+        if position.net_sol is None:
+            self._add_pnl(stats, 0.0)
+        old_pnl = position.net_sol or 0.0
+        position.net_sol = old_pnl + (-sol_amount if is_buy else sol_amount)
+        self._replace_pnl(stats, old_pnl, position.net_sol)
+
+        if is_buy:
+            stats.buys += 1
+            if launched_at and (block_time - launched_at).total_seconds() / 60 <= ConvictionCalculator.EARLY_ENTRY_MINS:
+                stats.early_buys += 1
+            if mcap and mcap > 0:
+                stats.entry_mcap_buys += 1
+                stats.avg_entry_mcap += (mcap - stats.avg_entry_mcap) / stats.entry_mcap_buys
+            if not position.bought:
+                position.bought = True
+                stats.tokens_bought += 1
+                if self._rugged.get(token_id):
+                    stats.rugged_tokens += 1
+
+        insort(stats.trade_buckets.setdefault(day, []), self._time_of_day(block_time, day))
+        self._dirty.add(wallet_id)
+        self._dirty_positions.add(key)
+
+    def discard(self, tx_signature: str):
+        """Undo a record_trade() whose trade was rolled back (latest first)"""
+        undo = self._undo.pop(tx_signature, None)
+        if undo is None:
+            return
+        wallet_id, key, snapshot, position = undo
+        self._positions[key] = position
+        if snapshot is None:
+            self._stats[wallet_id] = None
+            return
+        values, day, times = snapshot
+        stats = self._stats[wallet_id]
+        for column, value in values.items():
+            setattr(stats, column, value)
+        if times is None:
+            stats.trade_buckets.pop(day, None)
+        else:
+            stats.trade_buckets[day] = times
+
+    def clear(self):
+        """Forget everything loaded or recorded since the last flush()"""
+        self._stats.clear()
+        self._positions.clear()
+        self._rugged.clear()
+        self._stored_stats.clear()
+        self._stored_positions.clear()
+        self._dirty.clear()
+        self._dirty_positions.clear()
+        self._new_tokens.clear()
+        self._undo.clear()
+
+    def flush(self, now: Optional[datetime] = None) -> dict[int, TradeAggregates]:
+        """
+        Write recorded trades' stats and positions, then forget them
+
+        New rows go in one INSERT per table and changed rows in one
+        UPDATE per table with their final values.
+
+        Args:
+            now: End of the 7d / 30d windows (defaults to the current time)
+
+        Returns:
+            Wallet id -> updated TradeAggregates, for wallets that traded
+        """
+        now = now or datetime.utcnow()
+        oldest = self._bucket(now - timedelta(days=self.RETENTION_DAYS))
+        aggregates = {}
+        inserts, updates = [], []
+        for wallet_id in self._dirty:
+            stats = self._stats[wallet_id]
+            if stats is None:
+                continue  # Only trade was discarded
+            stats.trade_buckets = {d: t for d, t in stats.trade_buckets.items() if d >= oldest}
+            aggregates[wallet_id] = self.aggregates(stats, now)
+            values = {c: getattr(stats, c) for c in _STATS_COLUMNS}
+            values['trade_buckets'] = json.dumps(stats.trade_buckets)
+            values['updated_at'] = now
+            if wallet_id in self._stored_stats:
+                updates.append({'b_wallet_id': wallet_id, **values})
+            else:
+                inserts.append({'wallet_id': wallet_id, **values})
+        if inserts:
+            self.session.execute(_INSERT_STATS, inserts)
+        if updates:
+            self.session.execute(_UPDATE_STATS, updates)
+
+        inserts, updates = [], []
+        for wallet_id, token_id in self._dirty_positions:
+            position = self._positions[(wallet_id, token_id)]
+            if position is None:
+                continue
+            values = {'net_sol': position.net_sol, 'bought': position.bought}
+            if (wallet_id, token_id) in self._stored_positions:
+                updates.append({'b_wallet_id': wallet_id, 'b_token_id': token_id, **values})
+            else:
+                inserts.append({'wallet_id': wallet_id, 'token_id': token_id, **values})
+        if inserts:
+            self.session.execute(_INSERT_POSITION, inserts)
+        if updates:
+            self.session.execute(_UPDATE_POSITION, updates)
+
+        self.clear()
+        return aggregates
+
+    def mark_rugged(self, token_id: int) -> int:
+        """
+        Count a newly rugged token against every wallet that bought it
+
+        Call once, when the token is first flagged.
+
+        Returns:
+            Number of wallets updated
+        """
+        holders = select(WalletTokenStats.wallet_id).where(
+            WalletTokenStats.token_id == token_id,
+            WalletTokenStats.bought == True
+        )
+        result = self.session.execute(
+            update(WalletStats).where(WalletStats.wallet_id.in_(holders)).values(
+                rugged_tokens=WalletStats.rugged_tokens + 1
+            ),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
+
+    def aggregates(self, stats: WalletStats, now: Optional[datetime] = None) -> TradeAggregates:
+        """
+        TradeAggregates for ConvictionCalculator from a WalletStats row (or its values)
+
+        Args:
+            stats: WalletStats row or its values
+            now: End of the 7d / 30d windows (defaults to the current time)
+        """
+        now = now or datetime.utcnow()
+        buckets = stats.trade_buckets
+        if not isinstance(buckets, dict):
+            buckets = self._load_buckets(buckets)
+        n, mean = stats.pnl_tokens, stats.pnl_mean
+        return TradeAggregates(
+            trades_7d=self._window_count(buckets, now, 7),
+            trades_30d=self._window_count(buckets, now, 30),
+            buys=stats.buys,
+            early_buys=stats.early_buys,
+            entry_mcap_buys=stats.entry_mcap_buys,
+            avg_entry_mcap=stats.avg_entry_mcap,
+            tokens_bought=stats.tokens_bought,
+            rugged_tokens=stats.rugged_tokens,
+            pnl_tokens=n,
+            pnl_sum=mean * n,
+            pnl_sum_sq=stats.pnl_m2 + n * mean * mean
+        )
+
+    def load_aggregates(self, now: Optional[datetime] = None) -> dict[int, TradeAggregates]:
+        """Wallet id -> TradeAggregates for all active wallets with stats"""
+        now = now or datetime.utcnow()
+        active = select(SmartWallet.id).where(SmartWallet.is_active == True)
+        rows = self.session.execute(select(_stats).where(_stats.c.wallet_id.in_(active)))
+        return {stats.wallet_id: self.aggregates(stats, now) for stats in rows}
+
+    def backfill(self, rebuild: bool = False) -> int:
+        """
+        Create stats for wallets that have none, from their recorded trades
+
+        Args:
+            rebuild: Drop all stats and recompute them (e.g. after running
+                     with WALLET_STATS_ENABLED=false)
+
+        Returns:
+            Number of wallets backfilled
+        """
+        if rebuild:
+            self.session.execute(delete(_positions))
+            self.session.execute(delete(_stats))
+
+        missing = select(SmartWallet.id).where(SmartWallet.id.notin_(select(WalletStats.wallet_id)))
+        wallet_ids = self.session.scalars(missing).all()
+        if not wallet_ids:
+            return 0
+
+        aggregates = ConvictionCalculator(self.session).aggregate_trades(missing)
+
+        # Net position per (wallet, token), written by the database directly
+        is_buy = Trade.trade_type == 'BUY'
+        positions = select(
+            Trade.wallet_id,
+            Trade.token_id,
+            func.sum(case((is_buy, -Trade.sol_amount), else_=Trade.sol_amount)),
+            func.max(case((is_buy, 1), else_=0)) > 0
+        ).where(Trade.wallet_id.in_(missing)).group_by(Trade.wallet_id, Trade.token_id)
+        self.session.execute(insert(_positions).from_select(
+            ['wallet_id', 'token_id', 'net_sol', 'bought'], positions
+        ))
+
+        # Trade times per day over the retention window
+        buckets: dict[int, dict[int, list[float]]] = {}
+        oldest = self._bucket(datetime.utcnow() - timedelta(days=self.RETENTION_DAYS))
+        recent = self.session.query(Trade.wallet_id, Trade.block_time).filter(
+            Trade.wallet_id.in_(missing),
+            Trade.block_time >= _EPOCH + timedelta(days=oldest)
+        ).order_by(Trade.block_time)
+        for wallet_id, block_time in recent:
+            day = self._bucket(block_time)
+            buckets.setdefault(wallet_id, {}).setdefault(day, []).append(self._time_of_day(block_time, day))
+
+        rows = []
+        for wallet_id in wallet_ids:
+            agg = aggregates.get(wallet_id, TradeAggregates())
+            n = agg.pnl_tokens
+            mean = agg.pnl_sum / n if n else 0.0
+            rows.append({
+                'wallet_id': wallet_id,
+                'buys': agg.buys,
+                'early_buys': agg.early_buys,
+                'entry_mcap_buys': agg.entry_mcap_buys,
+                'avg_entry_mcap': agg.avg_entry_mcap,
+                'tokens_bought': agg.tokens_bought,
+                'rugged_tokens': agg.rugged_tokens,
+                'pnl_tokens': n,
+                'pnl_mean': mean,
+                'pnl_m2': max(0.0, agg.pnl_sum_sq - n * mean * mean),
+                'trade_buckets': json.dumps(buckets.get(wallet_id, {})),
+            })
+
+        self.session.execute(insert(_stats), rows)
+        self.session.commit()
+        logger.info(f"Backfilled wallet stats for {len(rows)} wallets")
+        return len(rows)
+
+    @staticmethod
+    def _new_stats(wallet_id: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            wallet_id=wallet_id, buys=0, early_buys=0, entry_mcap_buys=0,
+            avg_entry_mcap=0.0, tokens_bought=0, rugged_tokens=0,
+            pnl_tokens=0, pnl_mean=0.0, pnl_m2=0.0, trade_buckets={}, updated_at=None
+        )
+
+    @staticmethod
+    def _snapshot(stats: SimpleNamespace, day: int) -> tuple[dict, int, Optional[list]]:
+        """Scalar stats and the one day list a trade on `day` changes"""
+        values = {c: v for c, v in vars(stats).items() if c != 'trade_buckets'}
+        times = stats.trade_buckets.get(day)
+        return values, day, None if times is None else list(times)
+
+    @staticmethod
+    def _add_pnl(stats, value: float):
+        """Welford update: one more per-token PnL value"""
+        stats.pnl_tokens += 1
+        delta = value - stats.pnl_mean
+        stats.pnl_mean += delta / stats.pnl_tokens
+        stats.pnl_m2 += delta * (value - stats.pnl_mean)
+
+    @staticmethod
+    def _replace_pnl(stats, old: float, new: float):
+        """Welford update: one per-token PnL value changed from old to new"""
+        old_mean = stats.pnl_mean
+        stats.pnl_mean += (new - old) / stats.pnl_tokens
+        stats.pnl_m2 = max(0.0, stats.pnl_m2 + (new - old) * (new - stats.pnl_mean + old - old_mean))
+
+    @staticmethod
+    def _bucket(value: datetime) -> int:
+        """UTC day number of a naive UTC datetime"""
+        return int(epoch_seconds(value) // 86400)
+
+    @staticmethod
+    def _time_of_day(value: datetime, day: int) -> float:
+        """Seconds from the start of UTC day `day` to a naive UTC datetime"""
+        return (value - _EPOCH - timedelta(days=day)).total_seconds()
+
+    @staticmethod
+    def _load_buckets(value: Optional[str]) -> dict[int, list[float]]:
+        """Day number -> sorted trade times from the stored JSON"""
+        return {int(day): times for day, times in json.loads(value or '{}').items()}
+
+    def _window_count(self, buckets: dict[int, list[float]], now: datetime, days: int) -> int:
+        """Trades in the last `days`: whole days by length, the first day by bisecting its times"""
+        start = now - timedelta(days=days)
+        first = self._bucket(start)
+        edge = buckets.get(first, ())
+        return (
+            len(edge) - bisect_left(edge, self._time_of_day(start, first))
+            + sum(len(times) for day, times in buckets.items() if day > first)
+        )
@@ -0,0 +1,44 @@
+"""
+Shared fixtures: a file-backed SQLite database per test and fresh
+process-wide caches
+"""
+
+import pytest
+
+from alphapulse.db.identity_cache import get_identity_cache
+from alphapulse.db.models import SmartWallet, get_session, init_db
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = init_db(f"sqlite:///{tmp_path / 'alphapulse.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = get_session(engine)
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def identity_cache():
+    cache = get_identity_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def wallets(session) -> list[str]:
+    """Addresses of four active tracked wallets"""
+    addresses = [f"Wallet{i}".ljust(44, '1') for i in range(4)]
+    session.add_all([
+        SmartWallet(address=a, source='test', win_rate=70.0, trades_7d=20,
+                    conviction_score=60.0, is_active=True)
+        for a in addresses
+    ])
+    session.commit()
+    return addresses
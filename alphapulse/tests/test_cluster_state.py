@@ -0,0 +1,132 @@
+"""
+Tests for ClusterStateMachine hysteresis
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from alphapulse.processors.cluster_state import ClusterPhase, ClusterStateMachine, ClusterTransition
+
+TOKEN_ID = 1
+
+
+def buys(*wallets: str) -> tuple[list, list[str]]:
+    """(trades, addresses) for one 1 SOL buy per wallet"""
+    now = datetime.utcnow()
+    trades = [
+        SimpleNamespace(tx_signature=f"sig-{w}", sol_amount=1.0, block_time=now)
+        for w in wallets
+    ]
+    return trades, list(wallets)
+
+
+@pytest.fixture
+def machine() -> ClusterStateMachine:
+    return ClusterStateMachine(cooldown_mins=15, escalation_wallets=2)
+
+
+def expire_cooldown(machine: ClusterStateMachine):
+    """Age the token's episode past the cooldown"""
+    state = machine._states[TOKEN_ID]
+    state.last_seen -= machine.cooldown + timedelta(seconds=1)
+
+
+def test_first_cluster_fires(machine):
+    transition, state, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+
+    assert transition == ClusterTransition.FIRE
+    assert state.alerted_wallet_count == 2
+    assert state.total_sol == 2.0
+    assert machine.phase(TOKEN_ID) == ClusterPhase.FIRED
+
+
+def test_same_cluster_does_not_fire_again(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+
+    transition, _, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+
+    assert transition == ClusterTransition.NONE
+
+
+def test_joining_wallet_updates_until_escalation(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+
+    transition, state, _ = machine.observe(TOKEN_ID, *buys('a', 'b', 'c'))
+    assert transition == ClusterTransition.UPDATE
+    assert state.alerted_wallet_count == 2
+
+    transition, state, _ = machine.observe(TOKEN_ID, *buys('a', 'b', 'c', 'd'))
+    assert transition == ClusterTransition.ESCALATE
+    assert state.alerted_wallet_count == 4
+
+
+def test_reforming_during_cooldown_continues_episode(machine):
+    _, state, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+    machine.set_event_id(TOKEN_ID, 7)
+
+    machine.cool_down(TOKEN_ID)
+    assert machine.phase(TOKEN_ID) == ClusterPhase.COOLDOWN
+
+    transition, state, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+    assert transition == ClusterTransition.NONE
+    assert state.event_id == 7
+    assert machine.phase(TOKEN_ID) == ClusterPhase.FIRED
+
+
+def test_episode_resets_after_cooldown(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+    machine.set_event_id(TOKEN_ID, 7)
+    machine.cool_down(TOKEN_ID)
+
+    expire_cooldown(machine)
+    assert machine.phase(TOKEN_ID) == ClusterPhase.ARMED
+
+    transition, state, _ = machine.observe(TOKEN_ID, *buys('c', 'd'))
+    assert transition == ClusterTransition.FIRE
+    assert state.event_id is None
+    assert state.addresses == ['c', 'd']
+
+
+def test_prune_drops_expired_episodes(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+    expire_cooldown(machine)
+
+    assert machine.prune() == 1
+    assert machine.token_count == 0
+
+
+def test_restore_undoes_fire(machine):
+    _, _, undo = machine.observe(TOKEN_ID, *buys('a', 'b'))
+
+    machine.restore(TOKEN_ID, undo)
+
+    assert machine.token_count == 0
+    transition, _, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+    assert transition == ClusterTransition.FIRE
+
+
+def test_restore_undoes_escalation(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+    _, state, undo = machine.observe(TOKEN_ID, *buys('a', 'b', 'c', 'd'))
+
+    machine.restore(TOKEN_ID, undo)
+
+    assert state.addresses == ['a', 'b']
+    assert state.alerted_wallet_count == 2
+    assert state.total_sol == 2.0
+    transition, _, _ = machine.observe(TOKEN_ID, *buys('a', 'b', 'c', 'd'))
+    assert transition == ClusterTransition.ESCALATE
+
+
+def test_rearm_ends_the_alerted_episode(machine):
+    machine.observe(TOKEN_ID, *buys('a', 'b'))
+    machine.set_event_id(TOKEN_ID, 7)
+
+    assert not machine.rearm(TOKEN_ID, 8)
+    assert machine.phase(TOKEN_ID) == ClusterPhase.FIRED
+
+    assert machine.rearm(TOKEN_ID, 7)
+    transition, _, _ = machine.observe(TOKEN_ID, *buys('a', 'b'))
+    assert transition == ClusterTransition.FIRE
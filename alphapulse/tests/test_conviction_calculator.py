@@ -0,0 +1,92 @@
+"""
+Tests for ConvictionCalculator's grouped trade aggregates
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from alphapulse.config import settings
+from alphapulse.db.models import SmartWallet, Token, Trade
+from alphapulse.services.conviction_calculator import ConvictionCalculator, TradeAggregates
+from alphapulse.services.wallet_stats import WalletStatsTracker
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def wallet_ids(session, wallets) -> list[int]:
+    rows = session.query(SmartWallet).filter(SmartWallet.address.in_(wallets)).order_by(SmartWallet.id)
+    return [w.id for w in rows]
+
+
+@pytest.fixture
+def trades(session, wallet_ids):
+    """Wallet 0 trades three tokens (one rugged), wallet 1 one token, wallet 2 none"""
+    launch = NOW - timedelta(days=25)
+    tokens = [
+        Token(contract_address=f"Mint{i}".ljust(44, '1'), platform='pump_fun',
+              launched_at=launch, is_rugged=(i == 2))
+        for i in range(3)
+    ]
+    session.add_all(tokens)
+    session.flush()
+    a, b, c = (t.id for t in tokens)
+    w0, w1 = wallet_ids[:2]
+    rows = [
+        # wallet, token, type, sol, mcap, block time
+        (w0, a, 'BUY', 1.0, 10_000.0, launch + timedelta(minutes=5)),
+        (w0, a, 'SELL', 3.0, None, NOW - timedelta(days=1)),
+        (w0, b, 'BUY', 2.0, 30_000.0, NOW - timedelta(days=2)),
+        (w0, b, 'BUY', 1.0, None, NOW - timedelta(days=8)),
+        (w0, c, 'BUY', 0.5, None, NOW - timedelta(days=20)),
+        (w1, a, 'BUY', 4.0, 20_000.0, NOW - timedelta(days=40)),
+    ]
+    session.add_all([
+        Trade(wallet_id=w, token_id=t, tx_signature=f"sig-{i}", trade_type=kind, sol_amount=sol,
+              token_amount=1.0, mcap_at_trade=mcap, block_time=at)
+        for i, (w, t, kind, sol, mcap, at) in enumerate(rows)
+    ])
+    session.commit()
+
+
+def test_grouped_aggregates_per_wallet(session, wallet_ids, trades):
+    aggregates = ConvictionCalculator(session).aggregate_trades(now=NOW)
+
+    assert set(aggregates) == set(wallet_ids[:2])
+    w0 = aggregates[wallet_ids[0]]
+    assert (w0.trades_7d, w0.trades_30d) == (2, 5)
+    assert (w0.buys, w0.early_buys, w0.entry_mcap_buys) == (4, 1, 2)
+    assert w0.avg_entry_mcap == pytest.approx(20_000.0)
+    assert (w0.tokens_bought, w0.rugged_tokens) == (3, 1)
+    # Net SOL per token: +2.0, -3.0, -0.5
+    assert w0.pnl_tokens == 3
+    assert w0.pnl_sum == pytest.approx(-1.5)
+    assert w0.pnl_sum_sq == pytest.approx(4.0 + 9.0 + 0.25)
+
+    w1 = aggregates[wallet_ids[1]]
+    assert (w1.trades_7d, w1.trades_30d, w1.buys, w1.pnl_tokens) == (0, 0, 1, 1)
+
+
+def test_inactive_wallets_are_left_out_by_default(session, wallet_ids, trades):
+    session.query(SmartWallet).filter(SmartWallet.id == wallet_ids[1]).update({'is_active': False})
+    session.commit()
+    calculator = ConvictionCalculator(session)
+
+    assert set(calculator.aggregate_trades(now=NOW)) == {wallet_ids[0]}
+    assert set(calculator.aggregate_trades([wallet_ids[1]], now=NOW)) == {wallet_ids[1]}
+
+
+@pytest.mark.parametrize("wallet_stats_enabled", [False, True])
+def test_update_all_scores_matches_per_wallet_scores(session, wallet_ids, trades, monkeypatch, wallet_stats_enabled):
+    monkeypatch.setattr(settings, 'wallet_stats_enabled', wallet_stats_enabled)
+    calculator = ConvictionCalculator(session)
+    aggregates = calculator.aggregate_trades()
+    wallets = session.query(SmartWallet).order_by(SmartWallet.id).all()
+    expected = [calculator.calculate_score(w, aggregates.get(w.id, TradeAggregates())) for w in wallets]
+
+    assert calculator.update_all_scores() == len(wallets)
+
+    session.expire_all()
+    scores = [w.conviction_score for w in session.query(SmartWallet).order_by(SmartWallet.id)]
+    assert scores == pytest.approx(expected, abs=WalletStatsTracker.SCORE_TOLERANCE)
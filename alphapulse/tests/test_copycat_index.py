@@ -0,0 +1,67 @@
+"""
+Tests for the CopycatIndex ticker matcher
+"""
+
+import pytest
+
+from alphapulse.services.copycat_index import DEFAULT_KNOWN_TOKENS, CopycatIndex, normalize
+
+
+@pytest.fixture
+def index() -> CopycatIndex:
+    return CopycatIndex(DEFAULT_KNOWN_TOKENS + ["AI"])
+
+
+@pytest.mark.parametrize("symbol, ticker", [
+    ("B0NK", "BONK"),
+    ("\u0412\u041eNK", "BONK"),  # Cyrillic VE and O
+    ("\u03a1\u0395\u03a1\u0395", "PEPE"),  # Greek RHO and EPSILON
+    ("\uff22\uff2f\uff2e\uff2b", "BONK"),  # Fullwidth, folded by NFKC
+    ("$HIB", "SHIB"),
+    ("PEP3", "PEPE"),
+])
+def test_homoglyph_symbols_match(index, symbol, ticker):
+    assert index.match(symbol, None) == ticker
+
+
+@pytest.mark.parametrize("symbol, ticker", [
+    ("BABYDOGE", "DOGE"), ("PEPE2.0", "PEPE"), ("WIFINU", "WIF"), ("BABYWIFINU", "WIF"), ("MINIB0NK", "BONK"),
+])
+def test_affix_variants_match(index, symbol, ticker):
+    assert index.match(symbol, None) == ticker
+
+
+@pytest.mark.parametrize("name, ticker", [
+    ("Baby Doge Coin", "DOGE"),
+    ("Solana Cat", "SOL"),
+    ("BabyDoge", "DOGE"),
+    ("dogwifhat wif", "WIF"),
+    ("Pepe-Killer", "PEPE"),
+])
+def test_ticker_at_a_word_start_in_the_name_matches(index, name, ticker):
+    assert index.match("XYZ", name) == ticker
+
+
+@pytest.mark.parametrize("name", [
+    "Console",  # SOL inside a word
+    "Hotdoge",  # DOGE inside a word (no camelCase hump)
+    "Swift",  # WIF inside a word
+    "Paint",  # AI is shorter than min_substring_len: exact matches only
+    "DOGE",  # The name is exactly the ticker
+])
+def test_ticker_inside_a_word_does_not_match(index, name):
+    # The legacy check flagged any substring ("Console" as SOL); matches
+    # in names must now start a word
+    assert index.match("XYZ", name) is None
+
+
+def test_short_tickers_match_exactly(index):
+    assert index.match("AI", None) == "AI"
+    assert index.match("AIINU", None) == "AI"
+    assert index.find_in(normalize("AI Agent")) is None
+
+
+def test_longest_ticker_wins():
+    index = CopycatIndex(["SOL", "SOLANA"])
+
+    assert index.match(None, "Solana Summer") == "SOLANA"
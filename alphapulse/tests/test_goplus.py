@@ -0,0 +1,68 @@
+"""
+Tests for batched, cached GoPlus security reports
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from alphapulse.services import goplus as module
+from alphapulse.services.goplus import GoPlusSecurity
+
+
+class FakeGoPlusClient:
+    """Answers token_security requests, recording the mints of each"""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.batches: list[list[str]] = []
+
+    async def get(self, url, params=None):
+        mints = params['contract_addresses'].split(',')
+        self.batches.append(mints)
+        await asyncio.sleep(0)
+        result = {m: {'mint': m} for m in mints if m != 'unknown'}
+        return SimpleNamespace(status_code=self.status_code, json=lambda: {'result': result})
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeGoPlusClient:
+    client = FakeGoPlusClient()
+    monkeypatch.setattr(module, 'get_http_client', lambda name: client)
+    return client
+
+
+@pytest.fixture
+def goplus(client) -> GoPlusSecurity:
+    return GoPlusSecurity(ttl=60, max_size=100, batch_window=0.01)
+
+
+async def test_lookups_in_the_batch_window_share_requests(goplus, client):
+    goplus.BATCH_SIZE = 2
+    reports = await asyncio.gather(
+        goplus.get_report('a'), goplus.get_report('b'), goplus.get_reports(['c', 'a', 'unknown'])
+    )
+
+    assert client.batches == [['a', 'b'], ['c', 'unknown']]
+    assert reports[0] == {'mint': 'a'}
+    assert reports[2] == {'c': {'mint': 'c'}, 'a': {'mint': 'a'}, 'unknown': {}}
+
+
+async def test_reports_are_cached_for_the_ttl(goplus, client):
+    await goplus.get_report('a')
+    assert await goplus.get_report('a') == {'mint': 'a'}
+    assert len(client.batches) == 1
+
+    goplus.ttl = 0
+    await asyncio.sleep(0.001)
+    await goplus.get_report('a')
+    assert len(client.batches) == 2
+    assert goplus.stats()['hits'] == 1
+
+
+async def test_failed_request_is_not_cached(goplus, client):
+    client.status_code = 500
+
+    assert await goplus.get_report('a') is None
+    assert goplus.cached('a') is None
@@ -0,0 +1,154 @@
+"""
+Tests for batched webhook persistence in HeliusWebhookHandler
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import insert
+
+from alphapulse.db.models import Alert, ClusterEvent, Token, Trade, WalletStats
+from alphapulse.processors.cluster_state import ClusterPhase, ClusterStateMachine
+from alphapulse.processors.helius_handler import HeliusWebhookHandler
+from alphapulse.processors.signal_enricher import Enrichment
+from alphapulse.processors.signal_windows import SignalWindows
+from alphapulse.services.rug_detector import RiskLevel, RugCheckResult
+
+MINT = "Mint".ljust(44, '1')
+PUMP_FUN_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+
+
+def swap(wallet: str, signature: str, sol: float = 1.0) -> dict:
+    """Helius enhanced SWAP transaction for a buy of MINT"""
+    return {
+        'type': 'SWAP',
+        'signature': signature,
+        'timestamp': int(time.time()),
+        'feePayer': wallet,
+        'nativeTransfers': [{'fromUserAccount': wallet, 'toUserAccount': MINT, 'amount': int(sol * 1e9)}],
+        'tokenTransfers': [{'fromUserAccount': MINT, 'toUserAccount': wallet, 'mint': MINT, 'tokenAmount': 1e6}],
+        'instructions': [{'programId': PUMP_FUN_PROGRAM}],
+    }
+
+
+@pytest.fixture
+def handler(session, wallets):
+    handler = HeliusWebhookHandler(session, batch_commit=True)
+    # Private windows and cluster states instead of the process-wide ones
+    handler.signal_processor.windows = SignalWindows()
+    handler.signal_processor.cluster_states = ClusterStateMachine()
+    return handler
+
+
+def fail_cluster_check_for(handler, signature: str):
+    """Make the cluster check raise for one swap, after it has run"""
+    processor = handler.signal_processor
+    check = processor._check_cluster_buying
+
+    def failing(token, tx_signature=None):
+        result = check(token, tx_signature)
+        if tx_signature == signature:
+            raise RuntimeError("boom")
+        return result
+
+    processor._check_cluster_buying = failing
+
+
+def test_failed_swap_rolls_back_alone(handler, session, wallets):
+    fail_cluster_check_for(handler, 'bad')
+
+    handler.handle_webhook([swap(wallets[0], 'ok-1'), swap(wallets[1], 'bad')])
+
+    assert [t.tx_signature for t in session.query(Trade)] == ['ok-1']
+    stats = {s.wallet_id: s.buys for s in session.query(WalletStats)}
+    bad_wallet = handler.wallet_repo.get_ref(wallets[1])
+    assert stats.get(bad_wallet.id, 0) == 0
+
+
+def test_failed_swap_is_discarded_from_windows_and_cluster_state(handler, session, wallets):
+    fail_cluster_check_for(handler, 'bad')
+    processor = handler.signal_processor
+
+    # The second buy completes a cluster, then fails
+    handler.handle_webhook([swap(wallets[0], 'ok-1', sol=1.0), swap(wallets[1], 'bad', sol=2.0)])
+
+    token = session.query(Token).filter(Token.contract_address == MINT).one()
+    assert processor.windows.check_cluster(token.id, 2) is None
+    assert processor.windows.volume(token.id) == pytest.approx(1.0)
+    assert processor.cluster_states.phase(token.id) == ClusterPhase.ARMED
+    assert session.query(ClusterEvent).count() == 0
+    assert session.query(Alert).count() == 0
+
+    # A later buy forms the cluster from the surviving buys only
+    alerts = handler.handle_webhook([swap(wallets[2], 'ok-2', sol=1.0)])
+
+    event = session.query(ClusterEvent).one()
+    assert sorted(json.loads(event.wallet_addresses)) == sorted([wallets[0], wallets[2]])
+    assert event.total_sol == pytest.approx(2.0)
+    assert [a['type'] for a in alerts] == ['cluster_buy']
+    alert = session.get(Alert, alerts[0]['alert_id'])
+    assert json.loads(alert.trigger_data)['details']['cluster_event_id'] == event.id
+
+
+def test_payload_writes_every_good_swap(handler, session, wallets):
+    handler.handle_webhook([swap(w, f"sig-{i}") for i, w in enumerate(wallets)])
+
+    assert session.query(Trade).count() == len(wallets)
+    assert session.query(ClusterEvent).count() == 1
+    event = session.query(ClusterEvent).one()
+    assert event.wallet_count == len(wallets)
+
+
+def test_failed_payload_alerts_are_retried_per_swap(handler, session, wallets):
+    def failing(signals, skip_rug_failed=True):
+        session.add(Alert(token_id=None, alert_type='cluster_buy'))
+        session.flush()  # NOT NULL token_id: fails the payload's flush
+
+    handler.signal_processor.create_alerts = failing
+
+    alerts = handler.handle_webhook([swap(wallets[0], 'sig-0'), swap(wallets[1], 'sig-1')])
+
+    assert [a['type'] for a in alerts] == ['cluster_buy']
+    assert session.query(Alert).count() == 1
+    assert session.query(Trade).count() == 2
+
+
+def test_rug_failed_cluster_alert_is_undone(handler, session, wallets):
+    processor = handler.signal_processor
+    unscheduled = []
+    processor.outcome_scheduler = SimpleNamespace(
+        schedule=lambda *args, **kwargs: None, unschedule=unscheduled.append
+    )
+    alerts = handler.handle_webhook([swap(wallets[0], 'sig-0'), swap(wallets[1], 'sig-1')])
+    alert = session.get(Alert, alerts[0]['alert_id'])
+    token_id = alert.token_id
+
+    rug_result = RugCheckResult(MINT, RiskLevel.CRITICAL, risk_score=90, passed=False)
+    assert processor.apply_enrichment(alert, Enrichment(MINT, rug_result=rug_result)) is None
+
+    assert unscheduled == [alerts[0]['alert_id']]
+    assert session.query(Alert).count() == 0
+    assert session.query(ClusterEvent).count() == 0
+    assert processor.cluster_states.phase(token_id) == ClusterPhase.ARMED
+
+
+def test_mint_created_concurrently_is_reused(session, wallets):
+    handler = HeliusWebhookHandler(session)
+    processor = handler.signal_processor
+    load_token = processor._load_token
+
+    def created_elsewhere(contract_address):
+        # Another writer inserts the mint between our lookup and our insert
+        session.execute(insert(Token).values(contract_address=contract_address, platform='pump_fun'))
+        processor._load_token = load_token
+        return None
+
+    processor._load_token = created_elsewhere
+
+    handler.handle_webhook([swap(wallets[0], 'sig-0')])
+
+    token = session.query(Token).one()
+    assert token.platform == 'pump_fun'
+    assert [t.token_id for t in session.query(Trade)] == [token.id]
@@ -0,0 +1,99 @@
+"""
+Tests for the MetadataCache freshness policies
+"""
+
+import asyncio
+
+import pytest
+
+from alphapulse.services import metadata_cache as module
+from alphapulse.services.metadata_cache import AUTHORITIES, IDENTITY, MARKET, SUPPLY, MetadataCache
+
+
+class FakeClock:
+    """Stands in for the time module inside metadata_cache"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return 1_700_000_000.0 + self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(module, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(clock) -> MetadataCache:
+    return MetadataCache(max_size=2, authorities_ttl=100, supply_ttl=100, market_ttl=10)
+
+
+def test_groups_are_fresh_then_stale_then_missing(cache, clock):
+    cache.store('a', {MARKET: {'price_usd': 1.0}, IDENTITY: {'symbol': 'A'}})
+
+    clock.now += 10
+    assert cache.lookup('a', (MARKET,)) == ({MARKET: {'price_usd': 1.0}}, set(), set())
+
+    clock.now += 20  # Past the ttl, within max_stale (4x ttl)
+    data, missing, stale = cache.lookup('a', (MARKET, IDENTITY))
+    assert data == {MARKET: {'price_usd': 1.0}, IDENTITY: {'symbol': 'A'}}
+    assert (missing, stale) == (set(), {MARKET})
+
+    clock.now += 20  # Past max_stale; identity never expires
+    data, missing, stale = cache.lookup('a', (MARKET, IDENTITY, SUPPLY))
+    assert data == {IDENTITY: {'symbol': 'A'}}
+    assert (missing, stale) == ({MARKET, SUPPLY}, set())
+
+
+def test_max_age_override_is_never_served_stale(cache, clock):
+    cache.store('a', {AUTHORITIES: {'mint_authority': None}})
+    clock.now += 50
+
+    assert cache.lookup('a', (AUTHORITIES,))[1] == set()
+    assert cache.lookup('a', (AUTHORITIES,), max_age={AUTHORITIES: 30})[1] == {AUTHORITIES}
+
+
+def test_least_recently_used_mint_is_evicted(cache):
+    cache.store('a', {IDENTITY: {}})
+    cache.store('b', {IDENTITY: {}})
+    cache.lookup('a', (IDENTITY,))
+    cache.store('c', {IDENTITY: {}})
+
+    assert cache.lookup('b', (IDENTITY,))[1] == {IDENTITY}
+    assert cache.lookup('a', (IDENTITY,))[1] == set()
+
+
+async def test_stale_group_is_refreshed_once_in_the_background(cache, clock):
+    cache.store('a', {MARKET: {'price_usd': 1.0}})
+    clock.now += 20
+    calls = []
+
+    async def fetch(mint, groups):
+        calls.append((mint, groups))
+        await asyncio.sleep(0)
+        return {MARKET: {'price_usd': 2.0}}
+
+    cache.revalidate('a', {MARKET}, fetch)
+    cache.revalidate('a', {MARKET}, fetch)  # Already refreshing
+    await asyncio.gather(*cache._tasks)
+
+    assert calls == [('a', {MARKET})]
+    assert cache.lookup('a', (MARKET,)) == ({MARKET: {'price_usd': 2.0}}, set(), set())
+
+
+def test_restore_keeps_the_persisted_age(cache, clock):
+    cache.store('a', {MARKET: {'price_usd': 1.0}})
+    clock.now += 20
+    rows = cache.dirty_rows()
+
+    restored = MetadataCache(max_size=2, market_ttl=10)
+    assert restored.restore(rows) == 1
+    assert restored.lookup('a', (MARKET,))[2] == {MARKET}
+    assert cache.dirty_rows() == []
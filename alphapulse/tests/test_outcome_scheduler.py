@@ -0,0 +1,105 @@
+"""
+Tests for the OutcomeScheduler due-time queue
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from alphapulse.db.models import Alert, AlertOutcomeCheck, SmartWallet, Token, Trade
+from alphapulse.services.outcome_scheduler import OutcomeScheduler
+from alphapulse.services.outcome_tracker import OutcomeStatus
+from alphapulse.services.price_history import PriceHistory
+from alphapulse.services.token_metadata import TokenMetadata
+
+MINT = "Mint".ljust(44, '1')
+SUPPLY = 1e9
+
+
+class FakeTokenService:
+    """Prices every token at a fixed USD price"""
+
+    def __init__(self, price_usd: float):
+        self.price_usd = price_usd
+
+    def metadata(self, mint: str) -> TokenMetadata:
+        return TokenMetadata(contract_address=mint, total_supply=SUPPLY, price_usd=self.price_usd)
+
+    async def get_token_metadata(self, mint, groups=None, max_age=None):
+        return self.metadata(mint)
+
+    async def get_token_metadata_many(self, mints, groups=None, max_age=None):
+        return {mint: self.metadata(mint) for mint in mints}
+
+
+@pytest.fixture
+def alert(session, wallets) -> Alert:
+    """A cluster alert created six minutes ago, triggered at a price of 1.0"""
+    created_at = datetime.utcnow() - timedelta(minutes=6)
+    wallet = session.query(SmartWallet).filter(SmartWallet.address == wallets[0]).one()
+    token = Token(contract_address=MINT, platform='pump_fun')
+    session.add(token)
+    session.flush()
+    session.add(Trade(
+        wallet_id=wallet.id, token_id=token.id, tx_signature='sig-0', trade_type='BUY',
+        sol_amount=1.0, token_amount=1e6, mcap_at_trade=SUPPLY * 1.0, block_time=created_at
+    ))
+    alert = Alert(token_id=token.id, alert_type='cluster_buy', created_at=created_at)
+    session.add(alert)
+    session.commit()
+    return alert
+
+
+def scheduler(price_usd: float) -> OutcomeScheduler:
+    return OutcomeScheduler(
+        windows=[5, 30],
+        token_service=FakeTokenService(price_usd),
+        retry_seconds=60,
+        price_history=PriceHistory()
+    )
+
+
+async def test_five_minute_check_is_classified(session, alert):
+    outcomes = scheduler(price_usd=2.0)
+    outcomes.schedule(alert.id, alert.created_at, mint=MINT)
+
+    assert await outcomes.run_due(session) == 1
+
+    check = session.query(AlertOutcomeCheck).one()
+    assert check.window_mins == 5
+    assert check.status == OutcomeStatus.WINNER.value
+    assert check.return_pct == pytest.approx(100.0)
+    # The 30 minute window is still queued
+    assert len(outcomes) == 1
+    assert 0 < outcomes.next_due_in() <= 24 * 60
+
+
+async def test_unscheduled_alert_is_not_checked(session, alert):
+    outcomes = scheduler(price_usd=2.0)
+    outcomes.schedule(alert.id, alert.created_at, mint=MINT)
+
+    assert outcomes.unschedule(alert.id) == 2
+
+    assert len(outcomes) == 0
+    assert await outcomes.run_due(session) == 0
+
+
+async def test_deleted_alert_is_dropped(session, alert):
+    outcomes = scheduler(price_usd=2.0)
+    outcomes.schedule(alert.id, alert.created_at, mint=MINT)
+    session.delete(alert)
+    session.commit()
+
+    assert await outcomes.run_due(session) == 0
+
+    assert outcomes.dropped == 1
+    assert session.query(AlertOutcomeCheck).count() == 0
+
+
+async def test_warm_requeues_unrecorded_windows(session, alert):
+    outcomes = scheduler(price_usd=0.5)
+    session.add(AlertOutcomeCheck(alert_id=alert.id, window_mins=5, status='loser'))
+    session.commit()
+
+    assert outcomes.warm(session) == 1
+    assert len(outcomes) == 1
@@ -0,0 +1,91 @@
+"""
+Tests for OutcomeTracker's grouped, concurrent outcome checks
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from alphapulse.config import settings
+from alphapulse.db.models import Alert, Token
+from alphapulse.services.outcome_tracker import OutcomeBatchLimit, OutcomeTracker
+from alphapulse.services.price_history import PriceHistory
+from alphapulse.services.token_metadata import TokenMetadata
+
+
+class FakeTokenService:
+    """
+    Prices tokens from a table, recording every request
+
+    Mints in `unbatched` are left out of bulk lookups; mints in `slow`
+    never answer a single lookup.
+    """
+
+    def __init__(self, prices: dict[str, float], unbatched=(), slow=()):
+        self.prices = prices
+        self.unbatched, self.slow = set(unbatched), set(slow)
+        self.bulk_calls: list[list[str]] = []
+        self.single_calls: list[str] = []
+
+    def metadata(self, mint: str) -> TokenMetadata:
+        return TokenMetadata(contract_address=mint, total_supply=1e9, price_usd=self.prices[mint])
+
+    async def get_token_metadata_many(self, mints, groups=None, max_age=None):
+        self.bulk_calls.append(list(mints))
+        return {m: self.metadata(m) for m in mints if m not in self.unbatched}
+
+    async def get_token_metadata(self, mint, groups=None, max_age=None):
+        self.single_calls.append(mint)
+        if mint in self.slow:
+            await asyncio.sleep(10)
+        return self.metadata(mint)
+
+
+@pytest.fixture
+def alerts(session) -> dict[str, list[int]]:
+    """Two alerts on mint A, one each on B and C, all an hour old"""
+    created_at = datetime.utcnow() - timedelta(hours=1)
+    ids = {}
+    for name, count in (('A', 2), ('B', 1), ('C', 1)):
+        token = Token(contract_address=name.ljust(44, '1'), platform='pump_fun')
+        session.add(token)
+        session.flush()
+        group = [Alert(token_id=token.id, alert_type='cluster_buy', created_at=created_at) for _ in range(count)]
+        session.add_all(group)
+        session.flush()
+        ids[token.contract_address] = [a.id for a in group]
+    session.commit()
+    return ids
+
+
+def tracker(session, service) -> OutcomeTracker:
+    return OutcomeTracker(
+        session, token_service=service, batch_limit=OutcomeBatchLimit(), price_history=PriceHistory()
+    )
+
+
+async def test_each_token_is_priced_once(session, alerts):
+    service = FakeTokenService({mint: 1.0 for mint in alerts}, unbatched=['B'.ljust(44, '1')])
+
+    outcomes = await tracker(session, service).check_pending_alerts(limit=10)
+
+    assert sorted(o.alert_id for o in outcomes) == sorted(i for ids in alerts.values() for i in ids)
+    assert len(service.bulk_calls) == 1
+    assert sorted(service.bulk_calls[0]) == sorted(alerts)
+    assert service.single_calls == ['B'.ljust(44, '1')]
+    assert session.query(Alert).filter(Alert.outcome_checked_at.is_(None)).count() == 0
+
+
+async def test_slow_token_only_delays_its_own_alerts(session, alerts, monkeypatch):
+    monkeypatch.setattr(settings, 'outcome_check_timeout_seconds', 0.05)
+    slow = 'C'.ljust(44, '1')
+    service = FakeTokenService({mint: 1.0 for mint in alerts}, unbatched=[slow], slow=[slow])
+    outcomes_tracker = tracker(session, service)
+
+    outcomes = await outcomes_tracker.check_pending_alerts(limit=10)
+
+    assert slow not in {o.token_ca for o in outcomes}
+    assert len(outcomes) == 3
+    # The slow token's alert stays due for the next pass
+    assert outcomes_tracker.backlog == 1
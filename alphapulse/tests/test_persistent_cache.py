@@ -0,0 +1,77 @@
+"""
+Tests for PersistentCache and CachePersister
+"""
+
+import time
+
+import pytest
+
+from alphapulse.services.metadata_cache import IDENTITY, MARKET, MetadataCache
+from alphapulse.services.persistent_cache import CachePersister, PersistentCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PersistentCache(str(tmp_path / 'cache.db'))
+    yield store
+    store.close()
+
+
+def test_load_skips_expired_entries_and_keeps_the_newest(store):
+    now = time.time()
+    store.put_many('ns', [
+        ('old', {'v': 1}, now - 30, None),
+        ('expired', {'v': 2}, now - 20, now - 1),
+        ('new', {'v': 3}, now - 10, now + 60),
+    ])
+
+    assert [key for key, *_ in store.load('ns')] == ['old', 'new']
+    assert store.load('ns', limit=1) == [('new', {'v': 3}, now - 10, now + 60)]
+    assert store.load('other') == []
+
+
+def test_put_replaces_an_entry(store):
+    store.put_many('ns', [('a', {'v': 1}, 1.0, None)])
+    store.put_many('ns', [('a', {'v': 2}, 2.0, None)])
+
+    assert store.load('ns') == [('a', {'v': 2}, 2.0, None)]
+
+
+def test_compact_drops_expired_and_trims_namespaces(store):
+    now = time.time()
+    store.put_many('ns', [(f"k{i}", {}, now - 10 + i, None) for i in range(5)])
+    store.put_many('ns', [('expired', {}, now, now - 1)])
+    store.put_many('other', [('x', {}, now, None)])
+
+    result = store.compact(max_entries={'ns': 2})
+
+    assert (result['expired'], result['trimmed']) == (1, 3)
+    assert [key for key, *_ in store.load('ns')] == ['k3', 'k4']
+    assert store.count('other') == 1
+
+
+def test_persister_round_trips_a_cache(store):
+    cache = MetadataCache(max_size=10, market_ttl=60)
+    cache.store('mint-a', {IDENTITY: {'symbol': 'A'}, MARKET: {'price_usd': 1.5}})
+    persister = CachePersister(store, [cache])
+
+    assert persister.flush() == 2
+    assert persister.flush() == 0  # Nothing changed since
+
+    restored = MetadataCache(max_size=10, market_ttl=60)
+    assert CachePersister(store, [restored]).warm() == 2
+    data, missing, stale = restored.lookup('mint-a', (IDENTITY, MARKET))
+    assert data == {IDENTITY: {'symbol': 'A'}, MARKET: {'price_usd': 1.5}}
+    assert missing == set()
+
+
+async def test_stop_writes_what_is_left(store):
+    cache = MetadataCache(max_size=10)
+    persister = CachePersister(store, [cache], flush_interval=3600)
+    persister.start()
+    cache.store('mint-a', {IDENTITY: {'symbol': 'A'}})
+
+    await persister.stop()
+
+    assert not persister.running
+    assert store.count(MetadataCache.namespace) == 1
@@ -0,0 +1,104 @@
+"""
+Tests for the PriceHistory series store
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from alphapulse.processors.cluster_state import ClusterStateMachine
+from alphapulse.processors.helius_handler import HeliusWebhookHandler
+from alphapulse.processors.signal_windows import SignalWindows
+from alphapulse.services.price_history import PriceHistory
+from alphapulse.tests.test_helius_handler import MINT, fail_cluster_check_for, swap
+
+
+@pytest.fixture
+def history() -> PriceHistory:
+    return PriceHistory(max_tokens=2, max_samples=100, retention_seconds=3600, sample_interval=10)
+
+
+def test_summary_tracks_ath_and_drawdown(history):
+    for ts, price in enumerate([1.0, 3.0, 1.5, 2.0]):
+        history.record('a', price, ts=1000 + ts)
+
+    summary = history.summary('a', since=1000)
+
+    assert summary.samples == 4
+    assert summary.first_price == 1.0
+    assert summary.last_price == 2.0
+    assert summary.ath == 3.0
+    assert summary.ath_ts == 1001
+    assert summary.low == 1.0
+    assert summary.max_drawdown_pct == pytest.approx(-50.0)
+    assert history.summary('a', since=1002).ath == 2.0
+    assert history.summary('a', since=2000) is None
+
+
+def test_late_samples_keep_time_order(history):
+    history.record('a', 1.0, ts=10)
+    history.record('a', 3.0, ts=30)
+    history.record('a', 2.0, ts=20)
+
+    ts, prices = history.series('a')
+
+    assert list(ts) == [10, 20, 30]
+    assert list(prices) == [1.0, 2.0, 3.0]
+
+
+def test_non_positive_prices_are_ignored(history):
+    history.record('a', 0.0)
+    history.record('a', -1.0)
+    history.record('a', None)
+
+    assert len(history) == 0
+
+
+def test_least_recently_sampled_token_is_evicted(history):
+    history.record('a', 1.0)
+    history.record('b', 1.0)
+    history.record('a', 1.1)
+    history.record('c', 1.0)
+
+    assert history.summary('b', since=0) is None
+    assert history.summary('a', since=0).samples == 2
+    assert len(history) == 2
+
+
+def test_prune_drops_expired_series(history):
+    history.record('a', 1.0, ts=time.time() - 7200)
+    history.record('b', 1.0)
+
+    assert history.prune() == 1
+    assert history.summary('a', since=0) is None
+
+
+def test_dirty_rows_round_trip(history):
+    now = time.time()
+    history.record('a', 1.0, ts=now - 2)
+    history.record('a', 2.0, ts=now - 1)
+    rows = history.dirty_rows()
+
+    restored = PriceHistory(max_tokens=2, max_samples=100, retention_seconds=3600)
+    restored.record('a', 3.0, ts=now)
+
+    assert history.dirty_rows() == []
+    assert restored.restore(rows) == 1
+    assert list(restored.series('a')[1]) == [1.0, 2.0, 3.0]
+
+
+def test_rolled_back_swap_leaves_no_price(session, wallets):
+    handler = HeliusWebhookHandler(session, batch_commit=True)
+    processor = handler.signal_processor
+    processor.windows = SignalWindows()
+    processor.cluster_states = ClusterStateMachine()
+    processor.price_history = PriceHistory()
+    processor.sol_price = SimpleNamespace(price=100.0, is_fallback=False)
+    fail_cluster_check_for(handler, 'bad')
+
+    handler.handle_webhook([swap(wallets[0], 'ok-1', sol=1.0), swap(wallets[1], 'bad', sol=5.0)])
+
+    summary = processor.price_history.summary(MINT, since=0)
+    assert summary.samples == 1
+    assert summary.ath == pytest.approx(1.0 / 1e6 * 100.0)
@@ -0,0 +1,119 @@
+"""
+Tests for the in-memory SignalWindows
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from alphapulse.processors.signal_windows import (
+    ClusterWindow,
+    RollingVolume,
+    SignalWindows,
+    WindowEntry,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def entry(wallet_id: int, block_time: datetime, signature: str = None) -> WindowEntry:
+    return WindowEntry(
+        block_time=block_time, wallet_id=wallet_id, wallet_address=f"w{wallet_id}",
+        sol_amount=1.0, supply_percentage=0.0, tx_signature=signature or f"{wallet_id}-{block_time}"
+    )
+
+
+@pytest.fixture
+def windows() -> SignalWindows:
+    return SignalWindows(cluster_window_mins=5, cluster_min_sol=0.5, new_token_max_age_mins=60)
+
+
+def test_cluster_window_keeps_time_order_and_distinct_wallets():
+    window = ClusterWindow()
+    window.add(entry(1, T0 + timedelta(seconds=30)))
+    window.add(entry(2, T0))
+    window.add(entry(1, T0 + timedelta(seconds=10)))
+
+    assert [e.block_time for e in window.entries] == [
+        T0, T0 + timedelta(seconds=10), T0 + timedelta(seconds=30)
+    ]
+    assert window.wallet_count == 2
+
+
+def test_cluster_window_evicts_expired_entries():
+    window = ClusterWindow()
+    window.add(entry(1, T0))
+    window.add(entry(2, T0 + timedelta(minutes=1)))
+    window.add(entry(2, T0 + timedelta(minutes=3)))
+
+    window.evict(T0 + timedelta(minutes=2))
+
+    assert len(window.entries) == 1
+    assert window.wallet_count == 1
+    window.evict(T0 + timedelta(minutes=4))
+    assert window.wallet_count == 0
+
+
+def test_cluster_needs_distinct_qualifying_wallets(windows):
+    now = datetime.utcnow()
+    windows.record_buy(1, 10, 'a', 1.0, 0.1, 'sig-a1', now - timedelta(minutes=2))
+    windows.record_buy(1, 10, 'a', 1.0, 0.1, 'sig-a2', now - timedelta(minutes=1))
+    windows.record_buy(1, 11, 'b', 0.1, 0.1, 'sig-b', now)  # Below cluster_min_sol
+    windows.record_buy(1, 12, 'c', 1.0, 0.1, 'sig-c', now - timedelta(minutes=6))  # Already expired
+
+    assert windows.check_cluster(1, 2) is None
+
+    windows.record_buy(1, 13, 'd', 1.0, 0.1, 'sig-d', now)
+    cluster = windows.check_cluster(1, 2)
+    assert [e.tx_signature for e in cluster] == ['sig-a1', 'sig-a2', 'sig-d']
+
+
+def test_discarded_buy_leaves_the_cluster(windows):
+    now = datetime.utcnow()
+    windows.record_buy(1, 10, 'a', 1.0, 0.1, 'sig-a', now)
+    windows.record_buy(1, 11, 'b', 1.0, 0.1, 'sig-b', now)
+
+    windows.discard_buy(1, 'sig-b', now, 1.0)
+
+    assert windows.check_cluster(1, 2) is None
+    assert windows.check_cluster(1, 1) is not None
+
+
+def test_rolling_volume_drops_buckets_past_the_window():
+    volume = RollingVolume(window_seconds=300, launched_at=None)
+    volume.add(T0, 1.0, now=T0)
+    volume.add(T0 + timedelta(seconds=150), 2.0, now=T0 + timedelta(seconds=150))
+
+    assert volume.volume(T0 + timedelta(seconds=290)) == pytest.approx(3.0)
+    assert volume.volume(T0 + timedelta(seconds=300)) == pytest.approx(2.0)
+    assert volume.volume(T0 + timedelta(seconds=450)) == 0.0
+
+
+def test_rolling_volume_reuses_a_ring_slot_for_a_newer_bucket():
+    volume = RollingVolume(window_seconds=300, launched_at=None)
+    volume.add(T0, 1.0, now=T0)
+    later = T0 + timedelta(seconds=300)  # Same slot, one lap later
+
+    volume.add(later, 4.0, now=later)
+    volume.add(T0, 8.0, now=later)  # Out of the window: ignored
+
+    assert volume.volume(later) == pytest.approx(4.0)
+
+
+def test_rolling_volume_remove_undoes_a_live_add():
+    volume = RollingVolume(window_seconds=300, launched_at=None)
+    volume.add(T0, 1.0, now=T0)
+    volume.add(T0 + timedelta(seconds=20), 2.0, now=T0 + timedelta(seconds=20))
+
+    volume.remove(T0 + timedelta(seconds=20), 2.0)
+
+    assert volume.volume(T0 + timedelta(seconds=30)) == pytest.approx(1.0)
+
+
+def test_volume_is_only_kept_for_new_tokens(windows):
+    now = datetime.utcnow()
+    windows.record_buy(1, 10, 'a', 1.0, 0.1, 'sig-1', now, launched_at=now - timedelta(minutes=10))
+    windows.record_buy(2, 10, 'a', 1.0, 0.1, 'sig-2', now, launched_at=now - timedelta(hours=2))
+
+    assert windows.volume(1) == pytest.approx(1.0)
+    assert windows.volume(2) == 0.0
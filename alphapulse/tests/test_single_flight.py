@@ -0,0 +1,88 @@
+"""
+Tests for SingleFlight request coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from alphapulse.utils.single_flight import SingleFlight
+
+
+class SlowLookup:
+    """Counts calls; each call waits until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, mint: str) -> dict:
+        self.calls += 1
+        await self.release.wait()
+        if mint == 'bad':
+            raise ValueError("lookup failed")
+        return {'mint': mint}
+
+
+async def test_concurrent_identical_calls_share_one_execution():
+    flight, lookup = SingleFlight(enabled=True), SlowLookup()
+    waiters = [asyncio.ensure_future(flight.do(('p', 'meta', 'a'), lookup, 'a')) for _ in range(5)]
+    other = asyncio.ensure_future(flight.do(('p', 'meta', 'b'), lookup, 'b'))
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    results = await asyncio.gather(*waiters, other)
+
+    assert lookup.calls == 2
+    assert results[0] is results[4]
+    assert flight.in_flight == 0
+    stats = flight.stats()['by_method']['p.meta']
+    assert (stats['calls'], stats['executions']) == (6, 2)
+
+
+async def test_finished_call_is_not_cached():
+    flight, lookup = SingleFlight(enabled=True), SlowLookup()
+    lookup.release.set()
+
+    await flight.do(('p', 'meta', 'a'), lookup, 'a')
+    await flight.do(('p', 'meta', 'a'), lookup, 'a')
+
+    assert lookup.calls == 2
+
+
+async def test_error_reaches_every_waiter():
+    flight, lookup = SingleFlight(enabled=True), SlowLookup()
+    waiters = [asyncio.ensure_future(flight.do(('p', 'meta', 'bad'), lookup, 'bad')) for _ in range(3)]
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert lookup.calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+async def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    flight, lookup = SingleFlight(enabled=True), SlowLookup()
+    first = asyncio.ensure_future(flight.do(('p', 'meta', 'a'), lookup, 'a'))
+    second = asyncio.ensure_future(flight.do(('p', 'meta', 'a'), lookup, 'a'))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    lookup.release.set()
+
+    assert await second == {'mint': 'a'}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_disabled_runs_every_call():
+    flight, lookup = SingleFlight(enabled=False), SlowLookup()
+    waiters = [asyncio.ensure_future(flight.do(('p', 'meta', 'a'), lookup, 'a')) for _ in range(3)]
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    await asyncio.gather(*waiters)
+
+    assert lookup.calls == 3
+    assert flight.stats()['dedup_ratio'] == 0.0
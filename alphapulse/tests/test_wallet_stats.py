@@ -0,0 +1,96 @@
+"""
+Tests for the WalletStatsTracker incremental stats
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from alphapulse.db.models import SmartWallet, Token, Trade
+from alphapulse.services.conviction_calculator import ConvictionCalculator
+from alphapulse.services.wallet_stats import WalletStatsTracker
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def wallet_id(session, wallets) -> int:
+    return session.query(SmartWallet.id).filter(SmartWallet.address == wallets[0]).scalar()
+
+
+@pytest.fixture
+def token_ids(session) -> list[int]:
+    tokens = [Token(contract_address=f"Mint{i}".ljust(44, '1'), platform='pump_fun') for i in range(3)]
+    session.add_all(tokens)
+    session.commit()
+    return [t.id for t in tokens]
+
+
+def record(session, tracker, wallet_id, token_id, trade_type, sol, block_time, tx_signature=None):
+    """Record a trade both as a Trade row and in the tracker"""
+    session.add(Trade(
+        wallet_id=wallet_id, token_id=token_id, tx_signature=tx_signature or f"sig-{token_id}-{block_time}",
+        trade_type=trade_type, sol_amount=sol, token_amount=1.0, block_time=block_time
+    ))
+    session.flush()
+    tracker.record_trade(wallet_id, token_id, trade_type, sol, block_time, tx_signature=tx_signature)
+
+
+def test_running_pnl_matches_per_token_sums(session, wallet_id, token_ids):
+    tracker = WalletStatsTracker(session)
+    trades = [
+        (token_ids[0], 'BUY', 1.0), (token_ids[1], 'BUY', 2.0), (token_ids[0], 'SELL', 3.5),
+        (token_ids[2], 'BUY', 0.5), (token_ids[1], 'SELL', 0.25), (token_ids[2], 'SELL', 0.1),
+    ]
+    for i, (token_id, trade_type, sol) in enumerate(trades):
+        record(session, tracker, wallet_id, token_id, trade_type, sol, NOW - timedelta(hours=i))
+
+    aggregates = tracker.flush(now=NOW)[wallet_id]
+
+    pnl = [2.5, -1.75, -0.4]
+    assert aggregates.pnl_tokens == 3
+    assert aggregates.pnl_sum == pytest.approx(sum(pnl))
+    assert aggregates.pnl_sum_sq == pytest.approx(sum(p * p for p in pnl))
+    assert aggregates.buys == 3
+    assert aggregates.tokens_bought == 3
+
+
+def test_window_counts_match_sql_at_the_edge_day(session, wallet_id, token_ids):
+    tracker = WalletStatsTracker(session)
+    # Either side of the exact 7d / 30d cutoffs, which fall mid-day
+    offsets = [
+        timedelta(days=7, seconds=-1), timedelta(days=7, seconds=1),
+        timedelta(days=7, hours=3), timedelta(days=6, hours=20),
+        timedelta(days=30, seconds=-1), timedelta(days=30, seconds=1),
+        timedelta(days=29, hours=23), timedelta(hours=1),
+    ]
+    for i, offset in enumerate(offsets):
+        record(session, tracker, wallet_id, token_ids[i % 3], 'BUY', 1.0, NOW - offset)
+    tracker.flush(now=NOW)
+    session.commit()
+
+    expected = ConvictionCalculator(session).aggregate_trades([wallet_id], now=NOW)[wallet_id]
+    aggregates = WalletStatsTracker(session).load_aggregates(now=NOW)[wallet_id]
+
+    assert (aggregates.trades_7d, aggregates.trades_30d) == (3, 7)
+    assert (aggregates.trades_7d, aggregates.trades_30d) == (expected.trades_7d, expected.trades_30d)
+    # Later windows drop the day buckets' older trades without a rescan
+    later = WalletStatsTracker(session).load_aggregates(now=NOW + timedelta(hours=2))[wallet_id]
+    assert (later.trades_7d, later.trades_30d) == (2, 5)
+
+
+def test_discarded_trade_is_not_written(session, wallet_id, token_ids):
+    tracker = WalletStatsTracker(session)
+    record(session, tracker, wallet_id, token_ids[0], 'BUY', 1.0, NOW, tx_signature='kept')
+    tracker.record_trade(wallet_id, token_ids[0], 'BUY', 5.0, NOW, tx_signature='dropped')
+    tracker.record_trade(wallet_id, token_ids[1], 'BUY', 2.0, NOW, tx_signature='dropped-new-token')
+
+    tracker.discard('dropped-new-token')
+    tracker.discard('dropped')
+    aggregates = tracker.flush(now=NOW)[wallet_id]
+
+    assert aggregates.buys == 1
+    assert aggregates.tokens_bought == 1
+    assert aggregates.trades_7d == 1
+    assert aggregates.pnl_sum == pytest.approx(-1.0)
+    assert aggregates.pnl_sum_sq == pytest.approx(1.0)
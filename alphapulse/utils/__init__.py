@@ -1,5 +1,23 @@
 """AlphaPulse Utils Package"""
 
 from alphapulse.utils.logger import get_logger, setup_logging, AlertFormatter
+from alphapulse.utils.http_clients import (
+    HttpClientRegistry,
+    ProviderConfig,
+    get_http_client,
+    close_http_clients
+)
+from alphapulse.utils.single_flight import SingleFlight, get_single_flight, coalesce
 
-__all__ = ['get_logger', 'setup_logging', 'AlertFormatter']
+__all__ = [
+    'get_logger',
+    'setup_logging',
+    'AlertFormatter',
+    'HttpClientRegistry',
+    'ProviderConfig',
+    'get_http_client',
+    'close_http_clients',
+    'SingleFlight',
+    'get_single_flight',
+    'coalesce'
+]
@@ -0,0 +1,124 @@
+"""
+AlphaPulse HTTP Clients
+Application-scoped, pooled httpx clients for outbound provider calls
+"""
+
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); hosts without h2
+# support negotiate HTTP/1.1 via ALPN either way
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Connection settings for one upstream provider"""
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+# Per-provider defaults; anything else uses "default"
+PROVIDERS: dict[str, ProviderConfig] = {
+    'helius': ProviderConfig(timeout=15.0, max_connections=50, max_keepalive_connections=20),
+    'jupiter': ProviderConfig(timeout=5.0, max_connections=20),
+    'birdeye': ProviderConfig(timeout=10.0, max_connections=10),
+    'goplus': ProviderConfig(timeout=10.0, max_connections=10),
+    'dexscreener': ProviderConfig(timeout=30.0, max_connections=5, max_keepalive_connections=5),
+    'default': ProviderConfig(),
+}
+
+
+class HttpClientRegistry:
+    """
+    One keep-alive httpx.AsyncClient per provider
+
+    Clients are created lazily on first use and belong to the event loop
+    that created them; if a different loop asks (e.g. a CLI run via
+    asyncio.run after another), fresh clients are built for it.
+    """
+
+    def __init__(self, providers: dict[str, ProviderConfig] = None, **client_kwargs):
+        """
+        Initialize registry
+
+        Args:
+            providers: Provider name -> ProviderConfig (defaults to PROVIDERS)
+            **client_kwargs: Extra httpx.AsyncClient arguments (e.g. verify)
+        """
+        self.providers = providers or PROVIDERS
+        self.client_kwargs = client_kwargs
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Get the shared client for a provider"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Clients from another (probably closed) loop can't be reused
+            self._clients = {}
+            self._loop = loop
+
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._clients[provider] = self._build(provider)
+        return client
+
+    def _build(self, provider: str) -> httpx.AsyncClient:
+        config = self.providers.get(provider) or self.providers['default']
+        return httpx.AsyncClient(
+            http2=config.http2 and HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            **self.client_kwargs
+        )
+
+    async def aclose(self):
+        """Close every client (call from the application's shutdown hook)"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+        if clients:
+            logger.info(f"Closed {len(clients)} HTTP client pools")
+
+
+# Global instance
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_registry() -> HttpClientRegistry:
+    """Get global HTTP client registry"""
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Shortcut for get_http_registry().get(provider)"""
+    return get_http_registry().get(provider)
+
+
+async def close_http_clients():
+    """Close all shared HTTP clients"""
+    if _registry is not None:
+        await _registry.aclose()
@@ -0,0 +1,137 @@
+"""
+AlphaPulse Single-Flight
+Coalesces concurrent identical provider lookups into one request
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+from alphapulse.config import settings
+from alphapulse.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers with the same key
+
+    Keys are tuples starting with (provider, method, ...), typically
+    (provider, method, mint). The first caller starts the call as a task;
+    callers arriving while it runs await the same task, and the entry is
+    dropped as soon as it finishes, so nothing is cached beyond the
+    request's lifetime. Waiters are shielded: a caller timing out or
+    being cancelled does not cancel the shared call for the others.
+
+    Results are shared objects - callers must treat them as read-only.
+    """
+
+    def __init__(self, enabled: bool = None):
+        """
+        Initialize single-flight group
+
+        Args:
+            enabled: Coalesce calls (defaults to settings); when False every
+                     call runs on its own but is still counted
+        """
+        self.enabled = settings.request_coalescing_enabled if enabled is None else enabled
+        # (loop, key) -> task; tasks belong to the loop that created them
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        # (provider, method) -> [calls, executions]
+        self._counts: dict[tuple[str, str], list[int]] = {}
+
+    async def do(self, key: tuple, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or join the in-flight call for key
+
+        Args:
+            key: (provider, method, ...) identifying identical calls
+            fn: Coroutine function performing the lookup
+        """
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        with self._lock:
+            counts = self._counts.setdefault(key[:2], [0, 0])
+            counts[0] += 1
+            task = self._inflight.get(slot) if self.enabled else None
+            if task is None:
+                counts[1] += 1
+                task = loop.create_task(fn(*args, **kwargs))
+                if self.enabled:
+                    self._inflight[slot] = task
+                    task.add_done_callback(functools.partial(self._done, slot))
+        return await asyncio.shield(task)
+
+    def _done(self, slot: tuple, task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(slot) is task:
+                del self._inflight[slot]
+        # Mark the outcome retrieved even if every waiter gave up
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        """Calls, executions and deduplication ratio per (provider, method)"""
+        with self._lock:
+            counts = {k: tuple(v) for k, v in self._counts.items()}
+        by_method = {}
+        total_calls = total_executions = 0
+        for (provider, method), (calls, executions) in sorted(counts.items()):
+            by_method[f"{provider}.{method}"] = {
+                'calls': calls,
+                'executions': executions,
+                'dedup_ratio': round(1 - executions / calls, 3) if calls else 0.0,
+            }
+            total_calls += calls
+            total_executions += executions
+        return {
+            'calls': total_calls,
+            'executions': total_executions,
+            'dedup_ratio': round(1 - total_executions / total_calls, 3) if total_calls else 0.0,
+            'in_flight': self.in_flight,
+            'by_method': by_method,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts.clear()
+
+
+# Global instance
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get global single-flight group"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
+
+
+def coalesce(provider: str, method: str = None):
+    """
+    Decorate an async method taking a mint so concurrent identical calls share one request
+
+    The key is (provider, method, mint, *other args), so calls differing
+    in any argument still run separately.
+    """
+    def decorator(fn):
+        name = method or fn.__name__.lstrip('_')
+
+        @functools.wraps(fn)
+        async def wrapper(self, mint: str, *args, **kwargs):
+            key = (provider, name, mint, *args, *sorted(kwargs.items()))
+            return await get_single_flight().do(key, fn, self, mint, *args, **kwargs)
+        return wrapper
+    return decorator